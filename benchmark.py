@@ -0,0 +1,306 @@
+"""
+Headless benchmark of the recording path: capture -> convert -> encode -> finalize.
+
+Synthetic frames stand in for the screen and a null audio source for the microphone,
+so it runs without a display or sound card (e.g. on a Linux CI box). Each case runs
+in a fresh process and reports achieved fps, per-stage latency percentiles, CPU use,
+peak RSS and the cost of the final merge as JSON.
+
+    py benchmark.py
+    py benchmark.py --resolutions 1080p,4k --content scrolling --seconds 10 --output bench.json
+    py benchmark.py --baseline bench.json    (exit code 1 if a case got slower)
+
+With --startup it measures start-up instead: time to import the module, time until the
+GUI window is on screen, and time from launching `screen_recorder.py --cli` to its first
+recorded frame, each the median of --repeat fresh processes.
+
+    py benchmark.py --startup --output startup.json
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import cv2
+
+import meetingrecorder as mr
+from meetingrecorder.pipeline import StageStats
+from meetingrecorder.sources import bgra_view, convert_bgra_frame
+
+try:
+    import resource
+except ImportError:
+    # Windows: CPU falls back to this process only and peak RSS is not reported
+    resource = None
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+CONTENT_TYPES = mr.SyntheticFrameSource.CONTENT_TYPES
+PERCENTILES = (50, 90, 99)
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screen_recorder.py")
+
+# Child programs for --startup; each prints the marker line when it reaches its milestone
+STARTUP_IMPORT = """
+import sys
+sys.path.insert(0, {folder!r})
+import meetingrecorder
+print("imported", flush=True)
+"""
+STARTUP_WINDOW = """
+import sys, tkinter as tk
+sys.path.insert(0, {folder!r})
+from meetingrecorder.gui import ScreenRecorderGUI
+root = tk.Tk()
+app = ScreenRecorderGUI(root)
+root.wait_visibility(root)
+print("window shown", flush=True)
+app.inventory.stop()
+root.destroy()
+"""
+
+
+def _usage():
+    """(CPU seconds of this process and its finished children, peak RSS in MB or None)."""
+    if resource is None:
+        return time.process_time(), None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return cpu, max(own.ru_maxrss, children.ru_maxrss) / scale
+
+
+def _stage_report(stats: StageStats) -> dict:
+    report = {"frames": stats.frames, "fps": round(stats.fps, 2), "mean_ms": round(stats.ms_per_frame, 3)}
+    for p in PERCENTILES:
+        report[f"p{p}_ms"] = round(stats.percentile(p), 3)
+    report["max_ms"] = round(1000.0 * max(stats.samples), 3) if stats.samples else 0.0
+    return report
+
+
+def run_case(resolution: str, content: str, seconds: float = 5.0, fps: float = None,
+             encoder: str = "auto", finalize: str = "auto", workdir: str = None, profile: str = None) -> dict:
+    """Record seconds of synthetic content at resolution and finalize it; return the measurements."""
+    width, height = RESOLUTIONS[resolution]
+    source = mr.SyntheticFrameSource({'left': 0, 'top': 0, 'width': width, 'height': height}, content)
+    workdir = workdir or tempfile.mkdtemp(prefix="meetingrecorder-bench-")
+    base = os.path.join(workdir, f"{content}_{resolution}")
+    video_path, audio_path, final_mp4_path = base + ".avi", base + ".wav", base + ".mp4"
+
+    cpu_start, _ = _usage()
+    wall_start = time.monotonic()
+    stop_event = threading.Event()
+    profile = mr.encoder_profile(profile)
+    fps = fps or profile.fps
+    out, encoded_path, finalize_mode = mr.open_video_writer(video_path, fps, (width, height), encoder, finalize,
+                                                            accept_bgra=True, profile=profile)
+    passthrough = getattr(out, "pixel_format", None) == "bgra"
+    audio_thread = threading.Thread(
+        target=mr.record_audio,
+        args=(stop_event, audio_path),
+        kwargs={"sources": [mr.AudioSource("null", channels=1)]},
+        daemon=True,
+    )
+    pipeline = mr.CapturePipeline(source.grabber, bgra_view if passthrough else convert_bgra_frame,
+                                  out.write, stop_event, fps=fps, pool_frames=not passthrough,
+                                  detect_changes=not passthrough)
+    timer = threading.Timer(seconds, stop_event.set)
+
+    audio_thread.start()
+    timer.start()
+    capture_start = time.monotonic()
+    pipeline.run()
+    capture_seconds = time.monotonic() - capture_start
+    audio_thread.join()
+
+    release_start = time.monotonic()
+    out.release()
+    release_seconds = time.monotonic() - release_start
+
+    finalize_start = time.monotonic()
+    if finalize_mode == "remux":
+        job = {"mode": "remux", "video_path": encoded_path, "audio_paths": [audio_path],
+               "final_mp4_path": final_mp4_path, "duration": pipeline.encode_stats.frames / fps}
+    else:
+        job = {"mode": "transcode", "video_path": encoded_path, "audio_paths": [audio_path],
+               "final_mp4_path": final_mp4_path, "profile": profile}
+    mr.finalize_recording(job)
+    finalize_seconds = time.monotonic() - finalize_start
+
+    wall_seconds = time.monotonic() - wall_start
+    cpu_end, peak_rss = _usage()
+    return {
+        "resolution": resolution,
+        "width": width,
+        "height": height,
+        "content": content,
+        "target_fps": fps,
+        "seconds": round(capture_seconds, 3),
+        "achieved_fps": round(pipeline.capture_stats.frames / capture_seconds, 2),
+        "encoded_frames": pipeline.encode_stats.frames,
+        "duplicated_frames": pipeline.duplicated,
+        "unchanged_frames": pipeline.unchanged,
+        "dropped_frames": {ring.name: ring.dropped for ring in (pipeline.raw_ring, pipeline.frame_ring)},
+        "stages": {stats.name: _stage_report(stats)
+                   for stats in (pipeline.capture_stats, pipeline.convert_stats, pipeline.encode_stats)},
+        "encoder_release_seconds": round(release_seconds, 3),
+        "finalize_mode": finalize_mode,
+        "finalize_seconds": round(finalize_seconds, 3),
+        "output_bytes": os.path.getsize(final_mp4_path),
+        # Includes ffmpeg and the other child processes
+        "cpu_percent": round(100.0 * (cpu_end - cpu_start) / wall_seconds, 1),
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+    }
+
+
+def time_to_marker(cmd, marker: str, cwd: str = None, timeout: float = 60.0) -> float:
+    """Seconds from launching cmd until it prints a line containing marker; the process is then killed."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=cwd)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    output = []
+    try:
+        for line in proc.stdout:
+            if marker in line:
+                return time.perf_counter() - started
+            output.append(line.rstrip())
+        raise RuntimeError("\n".join(output[-5:]) or f"exited with code {proc.wait()}")
+    finally:
+        timer.cancel()
+        proc.kill()
+        proc.wait()
+
+
+def run_startup(repeat: int = 5, frame_source: str = "auto", workdir: str = None) -> dict:
+    """Median start-up times over repeat runs; a milestone that cannot be reached here reports its error."""
+    workdir = workdir or tempfile.mkdtemp(prefix="meetingrecorder-bench-")
+    folder = os.path.dirname(SCRIPT)
+    milestones = {
+        "python": ([sys.executable, "-c", "print('started', flush=True)"], "started"),
+        "import": ([sys.executable, "-c", STARTUP_IMPORT.format(folder=folder)], "imported"),
+        "first_window": ([sys.executable, "-c", STARTUP_WINDOW.format(folder=folder)], "window shown"),
+        "cli_first_frame": ([sys.executable, "-u", SCRIPT, "--cli", "--frame-source", frame_source],
+                            "First frame recorded"),
+    }
+    report = {}
+    for name, (cmd, marker) in milestones.items():
+        print(f"Timing {name}...", file=sys.stderr)
+        try:
+            samples = [time_to_marker(cmd, marker, cwd=workdir) for _ in range(repeat)]
+        except Exception as e:
+            report[name] = {"error": str(e).strip().splitlines()[-1] if str(e).strip() else repr(e)}
+            print(f"  not measured: {report[name]['error']}", file=sys.stderr)
+            continue
+        report[name] = {"median_seconds": round(statistics.median(samples), 3),
+                        "samples": [round(sample, 3) for sample in samples]}
+        print(f"  {report[name]['median_seconds']} s", file=sys.stderr)
+    return report
+
+
+def _environment(**extra) -> dict:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "ffmpeg": mr.find_ffmpeg(),
+        **extra,
+    }
+
+
+def run_suite(resolutions, contents, seconds: float, fps: float, encoder: str, finalize: str, workdir: str,
+              profile: str = "default"):
+    """Run every resolution x content case, each in a fresh process so RSS and CPU are its own."""
+    cases = []
+    for resolution in resolutions:
+        for content in contents:
+            print(f"Benchmarking {content} at {resolution}...", file=sys.stderr)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+                case = pool.submit(run_case, resolution, content, seconds, fps, encoder, finalize, workdir,
+                                   profile).result()
+            print(f"  {case['achieved_fps']} fps, finalize {case['finalize_seconds']} s", file=sys.stderr)
+            cases.append(case)
+    return {
+        "environment": _environment(encoder=encoder, finalize=finalize,
+                                    encoder_profile=str(mr.encoder_profile(profile))),
+        "cases": cases,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float):
+    """Cases and start-up milestones that got more than tolerance (a fraction) slower than in baseline."""
+    previous = {(case["resolution"], case["content"]): case for case in baseline.get("cases", [])}
+    regressions = []
+    for name, timing in report.get("startup", {}).items():
+        before = baseline.get("startup", {}).get(name, {})
+        if "median_seconds" in timing and "median_seconds" in before:
+            if timing["median_seconds"] > before["median_seconds"] * (1 + tolerance) + 0.05:
+                regressions.append(f"start-up {name}: {timing['median_seconds']} s (was {before['median_seconds']})")
+    for case in report.get("cases", []):
+        before = previous.get((case["resolution"], case["content"]))
+        if before is None:
+            continue
+        name = f"{case['content']} {case['resolution']}"
+        if case["achieved_fps"] < before["achieved_fps"] * (1 - tolerance):
+            regressions.append(f"{name}: {case['achieved_fps']} fps (was {before['achieved_fps']})")
+        if case["finalize_seconds"] > before["finalize_seconds"] * (1 + tolerance) + 0.1:
+            regressions.append(f"{name}: finalize {case['finalize_seconds']} s (was {before['finalize_seconds']})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Meeting Recorder capture and encode path headlessly.")
+    parser.add_argument("--resolutions", default="1080p,1440p,4k", help="comma-separated: " + ",".join(RESOLUTIONS))
+    parser.add_argument("--content", default=",".join(CONTENT_TYPES), help="comma-separated: " + ",".join(CONTENT_TYPES))
+    parser.add_argument("--seconds", type=float, default=5.0, help="recording length per case")
+    parser.add_argument("--fps", type=float, help="capture rate (default: the encoder profile's)")
+    parser.add_argument("--encoder", default="auto", choices=["auto", "ffmpeg", "opencv"])
+    parser.add_argument("--finalize", default="auto", choices=["auto", "fast", "transcode"])
+    parser.add_argument("--encoder-profile", default="default", choices=list(mr.ENCODER_PROFILES))
+    parser.add_argument("--workdir", help="where to write the recordings (default: a temporary folder)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown against the baseline")
+    startup = parser.add_argument_group("start-up", "measure start-up time instead of recording throughput")
+    startup.add_argument("--startup", action="store_true", help="time import, first window and --cli first frame")
+    startup.add_argument("--repeat", type=int, default=5, help="runs per milestone (the median is reported)")
+    startup.add_argument("--frame-source", default="auto", help="--frame-source for the --cli run, e.g. synthetic")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="meetingrecorder-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    if args.startup:
+        report = {"environment": _environment(), "startup": run_startup(args.repeat, args.frame_source, workdir)}
+    else:
+        report = run_suite(args.resolutions.split(","), args.content.split(","), args.seconds, args.fps,
+                           args.encoder, args.finalize, workdir, args.encoder_profile)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Meeting recorder: screen, microphone and system audio into a single MP4.
+
+Recorder is the programmatic entry point; the GUI (meetingrecorder.gui) and the
+command line (meetingrecorder.cli, python -m meetingrecorder) are thin clients of it.
+Importing the package loads neither tkinter nor the capture backends.
+"""
+from .backends import audio_available, find_ffmpeg, load_recording_modules, warm_up
+from .paths import ensure_output_dir
+from .audio import AudioSource, AudioStats, get_input_devices, parse_audio_source, record_audio
+from .vad import load_voice_index, VoiceActivityDetector
+from .inventory import get_available_monitors, get_available_windows, InventoryService
+from .pipeline import CapturePipeline, DEFAULT_FPS, FrameScheduler
+from .sources import (CompositeFrameSource, FileFrameSource, FrameSource, FRAME_SOURCES, select_frame_source,
+                      SyntheticFrameSource, WindowFrameSource)
+from .encoding import EncoderProfile, encoder_profile, ENCODER_PROFILES, open_video_writer
+from .segments import join_segments, RecordingManifest, recover_segments
+from .finalize import finalize_recording, FinalizeQueue
+from .slides import Slide, SlideExtractor
+from .ocr import ScreenTextIndexer, search_text, TextIndex
+from .metrics import MetricsFileWriter, MetricsRegistry, MetricsServer, start_metrics
+from .tracing import Tracer
+from .recorder import record_screen_region, Recorder, RecorderStats, source_for_region
@@ -0,0 +1,6 @@
+"""python -m meetingrecorder: see meetingrecorder.cli."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
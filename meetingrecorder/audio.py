@@ -0,0 +1,478 @@
+"""Audio capture: one or more input devices, mixed or as separate tracks, written to WAV."""
+import contextlib
+import functools
+import threading
+import time
+import types
+import wave
+
+from .backends import audio_available, load_recording_modules, np, sd
+from .paths import audio_track_paths, segment_path
+from .tracing import profiled
+from .vad import VoiceActivityDetector
+
+
+class AudioRingBuffer:
+    """
+    Preallocated int16 ring between the PortAudio callback and the WAV writer.
+
+    Single producer (the callback) and single consumer (the writer thread): each side
+    only advances its own counter after copying, so no lock is needed. write() never
+    allocates. If the writer falls behind, samples that do not fit are dropped and
+    counted in overflowed_frames rather than growing memory.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int):
+        self.capacity = capacity_frames
+        self.channels = channels
+        self.buffer = np.zeros((capacity_frames, channels), dtype=np.int16)
+        self.overflowed_frames = 0
+        self._written = 0
+        self._read = 0
+
+    def available(self) -> int:
+        return self._written - self._read
+
+    def write(self, data):
+        """Copy data (frames x channels) into the ring. Called from the audio callback."""
+        count = min(len(data), self.capacity - self.available())
+        self.overflowed_frames += len(data) - count
+        if count <= 0:
+            return
+        start = self._written % self.capacity
+        first = min(count, self.capacity - start)
+        self.buffer[start:start + first] = data[:first]
+        if count > first:
+            self.buffer[:count - first] = data[first:count]
+        self._written += count
+
+    def read_into(self, out) -> int:
+        """Move up to len(out) frames into out. Returns the number of frames copied."""
+        count = min(len(out), self.available())
+        start = self._read % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        if count > first:
+            out[first:count] = self.buffer[:count - first]
+        self._read += count
+        return count
+
+    def skip(self, count: int) -> int:
+        """Discard up to count frames without copying them. Returns the number discarded."""
+        count = min(count, self.available())
+        self._read += count
+        return count
+
+
+class AudioStats:
+    """Counters reported by record_audio."""
+
+    def __init__(self):
+        self.frames_written = 0
+        self.overflowed_frames = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.max_backlog = 0
+        self.clipped_samples = 0
+        self.drift_frames = 0
+        self.samplerate = 0
+
+    def __str__(self):
+        seconds = self.frames_written / self.samplerate if self.samplerate else 0.0
+        return (
+            f"audio: {seconds:.1f} s written, {self.overflowed_frames} frames lost to a full buffer, "
+            f"{self.input_overflows} input overflows / {self.input_underflows} underflows reported by the device, "
+            f"max backlog {self.max_backlog} frames, {self.clipped_samples} samples clipped, "
+            f"{self.drift_frames} frames dropped to correct drift"
+        )
+
+
+class AudioSource:
+    """
+    One audio input to record.
+
+    device: None for the default input, a sounddevice index or name (e.g. a loopback /
+            "Stereo Mix" / PulseAudio monitor device for the remote side of a call), or
+            "null" for a NullInputStream that delivers silence without any hardware.
+    gain:   linear gain applied when mixing.
+    """
+
+    def __init__(self, device=None, gain: float = 1.0, channels: int = None, name: str = None):
+        self.device = device
+        self.gain = gain
+        self.channels = channels
+        self.name = name or ("default" if device is None else str(device))
+
+    @property
+    def is_null(self) -> bool:
+        return self.device == "null"
+
+
+def parse_audio_source(spec: str) -> AudioSource:
+    """
+    An AudioSource from a command-line spec, DEVICE or DEVICE@GAIN: DEVICE is "default",
+    "null", a sounddevice index, or (part of) a device name.
+    """
+    device, _, gain = spec.rpartition("@") if "@" in spec else (spec, "", "")
+    try:
+        gain = float(gain) if gain else 1.0
+    except ValueError:
+        raise ValueError(f"Invalid gain in audio source {spec!r}") from None
+    if device == "default":
+        return AudioSource(gain=gain)
+    return AudioSource(int(device) if device.isdigit() else device, gain=gain)
+
+
+def get_input_devices():
+    """(index, name) of every device that can record, e.g. to find a loopback / monitor device."""
+    if not audio_available():
+        return []
+    return [(index, device["name"]) for index, device in enumerate(sd.query_devices())
+            if device["max_input_channels"] > 0]
+
+
+class NullInputStream:
+    """
+    Stand-in for sd.InputStream that calls back with silence in real time.
+    Lets the audio engine run on machines without audio devices.
+    """
+
+    def __init__(self, samplerate: int, channels: int, dtype: str = "int16", callback=None, blocksize: int = 0,
+                 **kwargs):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.blocksize = blocksize or max(1, samplerate // 50)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        block = np.zeros((self.blocksize, self.channels), dtype=np.int16)
+        status = types.SimpleNamespace(input_overflow=False, input_underflow=False)
+        start = time.monotonic()
+        blocks = 0
+        while not self._stop.is_set():
+            due = start + (blocks + 1) * self.blocksize / self.samplerate
+            if self._stop.wait(max(0.0, due - time.monotonic())):
+                break
+            now = time.monotonic()
+            time_info = types.SimpleNamespace(inputBufferAdcTime=due - self.blocksize / self.samplerate,
+                                              currentTime=now)
+            self.callback(block, self.blocksize, time_info, status)
+            blocks += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name="null-audio", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def detect_input_channels(device=None) -> int:
+    """Pick a channel count for device: mono for the default microphone, up to stereo for others."""
+    try:
+        device_info = sd.query_devices(device, kind='input') if device is not None else sd.query_devices(kind='input')
+        channels = device_info['max_input_channels']
+        # Most microphones are mono; loopback/monitor devices are usually stereo
+        channels = min(channels, 1 if device is None else 2)
+        print(f"Using {channels} channel(s) for audio recording from {device_info['name']}")
+        return max(channels, 1)
+    except Exception as e:
+        print(f"Warning: Could not detect audio device channels, using mono: {e}")
+        return 1
+
+
+class SegmentedWavWriter:
+    """
+    wave.Wave_write stand-in that rolls over to a new chunk file every segment_frames
+    frames. on_segment(index, path) is called as each chunk is closed.
+    """
+
+    def __init__(self, path: str, channels: int, samplerate: int, segment_frames: int, on_segment=None):
+        self.path = path
+        self.channels = channels
+        self.samplerate = samplerate
+        self.segment_frames = segment_frames
+        self.on_segment = on_segment
+        self.index = -1
+        self._wf = None
+        self._frames = 0
+
+    def _roll(self):
+        self.close()
+        self.index += 1
+        self._wf = wave.open(segment_path(self.path, self.index), "wb")
+        self._wf.setnchannels(self.channels)
+        self._wf.setsampwidth(2)
+        self._wf.setframerate(self.samplerate)
+        self._frames = 0
+
+    def writeframes(self, data):
+        while len(data):
+            if self._wf is None or self._frames >= self.segment_frames:
+                self._roll()
+            count = min(len(data), self.segment_frames - self._frames)
+            self._wf.writeframes(data[:count])
+            self._frames += count
+            data = data[count:]
+
+    def close(self):
+        if self._wf is not None:
+            self._wf.close()
+            self._wf = None
+            if self.on_segment:
+                self.on_segment(self.index, segment_path(self.path, self.index))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _AudioInput:
+    """Per-source state of a record_audio run."""
+
+    def __init__(self, source: AudioSource, channels: int, capacity: int, batch: int):
+        self.source = source
+        self.channels = channels
+        self.ring = AudioRingBuffer(capacity, channels)
+        self.block = np.empty((batch, channels), dtype=np.int16)
+        self.start_time = None
+        self.last_seen = None
+        self.lead_silence = 0
+
+    def available(self) -> int:
+        return self.lead_silence + self.ring.available()
+
+    def read(self, count: int):
+        """Return the next count frames (leading alignment silence first, zeros for any shortfall)."""
+        out = self.block[:count]
+        silence = min(self.lead_silence, count)
+        out[:silence] = 0
+        self.lead_silence -= silence
+        got = silence + self.ring.read_into(out[silence:])
+        out[got:] = 0
+        return out
+
+
+def record_audio(stop_event: threading.Event, audio_path: str, samplerate: int = 44100, channels: int = None,
+                 buffer_seconds: float = 10.0, flush_seconds: float = 0.5, stats: AudioStats = None,
+                 sources=None, mode: str = "mix", max_skew_seconds: float = 0.05, stall_seconds: float = 1.0,
+                 segment_seconds: float = None, on_segment=None, paused: threading.Event = None,
+                 voice_index_path: str = None, tracer=None):
+    """
+    Record audio to a .wav file until stop_event is set.
+    Requires the 'sounddevice' package: pip install sounddevice
+
+    sources: list of AudioSource; defaults to the default input (microphone) alone.
+    mode:    "mix" sums all sources (with per-source gain, clipped to int16) into audio_path;
+             "tracks" writes each source to its own WAV, see audio_track_paths().
+
+    Each source's callback copies blocks into its own AudioRingBuffer holding
+    buffer_seconds of audio; this thread writes to disk in batches of up to flush_seconds.
+    A disk stall longer than buffer_seconds loses audio (counted in stats) instead of
+    growing memory.
+
+    Sources are aligned on the ADC time of their first block: later starters get leading
+    silence. Device clocks then drift apart slowly; a source that gets more than
+    max_skew_seconds ahead of the slowest one has the excess dropped, so neither latency
+    nor skew accumulates. A source silent for stall_seconds is padded with zeros rather
+    than holding the others back.
+
+    With segment_seconds, each WAV is split into chunks of exactly that length
+    (see segment_path); on_segment(track, index, path) is called as each chunk closes.
+
+    While paused is set, incoming blocks are discarded: the files simply carry on when
+    it is cleared, without a gap.
+
+    With voice_index_path, what is written also goes through a VoiceActivityDetector,
+    which writes a speech/silence index of the recording there (all tracks together).
+
+    With a Tracer, each batch written to disk is recorded as an "audio write" span (and
+    the voice activity detection as its own), and this thread is profiled.
+    """
+    if sources is None:
+        sources = [AudioSource(channels=channels)]
+    if not audio_available() and not all(source.is_null for source in sources):
+        print("Audio recording is not available because 'sounddevice' is not installed.")
+        print("Install it with: pip install sounddevice")
+        return
+    load_recording_modules()
+
+    stats = stats if stats is not None else AudioStats()
+    stats.samplerate = samplerate
+    batch = max(1, int(samplerate * flush_seconds))
+    max_skew = int(samplerate * max_skew_seconds)
+
+    def open_stream(inp):
+        def callback(indata, frames, time_info, status):
+            now = time.monotonic()
+            if inp.start_time is None:
+                # Put every source on the monotonic clock via its own stream time
+                inp.start_time = now - (time_info.currentTime - time_info.inputBufferAdcTime)
+            inp.last_seen = now
+            if status.input_overflow:
+                stats.input_overflows += 1
+            if status.input_underflow:
+                stats.input_underflows += 1
+            if paused is not None and paused.is_set():
+                return
+            inp.ring.write(indata)
+
+        stream_class = NullInputStream if inp.source.is_null else sd.InputStream
+        kwargs = {} if inp.source.device is None or inp.source.is_null else {"device": inp.source.device}
+        return stream_class(samplerate=samplerate, channels=inp.channels, dtype="int16", callback=callback, **kwargs)
+
+    def record(inputs):
+        out_channels = max(inp.channels for inp in inputs)
+        passthrough = len(inputs) == 1 and inputs[0].source.gain == 1.0
+        mix = np.empty((batch, out_channels), dtype=np.float32)
+        scratch = np.empty((batch, out_channels), dtype=np.float32)
+        aligned = False
+        opened = time.monotonic()
+
+        def active(inp, now):
+            if inp.start_time is None:
+                return now - opened < stall_seconds
+            return now - inp.last_seen < stall_seconds
+
+        def align():
+            started = [inp.start_time for inp in inputs if inp.start_time is not None]
+            first = min(started)
+            for inp in inputs:
+                if inp.start_time is not None:
+                    inp.lead_silence = int(round((inp.start_time - first) * samplerate))
+                else:
+                    # Never delivered anything: pad from the very beginning
+                    inp.lead_silence = inp.ring.available()
+
+        def flush(final=False):
+            nonlocal aligned
+            now = time.monotonic()
+            if not aligned:
+                if not final and any(inp.start_time is None and active(inp, now) for inp in inputs):
+                    return
+                if all(inp.start_time is None for inp in inputs):
+                    return
+                align()
+                aligned = True
+            while True:
+                live = [inp for inp in inputs if final or active(inp, now)]
+                count = min(batch, min((inp.available() for inp in live), default=0))
+                if final:
+                    count = min(batch, max(inp.available() for inp in inputs))
+                if count <= 0:
+                    break
+                stats.max_backlog = max(stats.max_backlog, max(inp.available() for inp in inputs))
+                t0 = time.perf_counter()
+                vad_block = None
+                if mode == "tracks":
+                    blocks = [inp.read(count) for inp in inputs]
+                    for block, wf in zip(blocks, writers):
+                        wf.writeframes(block)
+                    if vad is not None:
+                        vad_block = np.hstack(blocks)
+                elif passthrough:
+                    vad_block = inputs[0].read(count)
+                    writers[0].writeframes(vad_block)
+                else:
+                    acc = mix[:count]
+                    acc.fill(0.0)
+                    for inp in inputs:
+                        block = inp.read(count)
+                        part = scratch[:count]
+                        if inp.channels == out_channels:
+                            part[:] = block
+                        else:
+                            # Mono sources feed every output channel
+                            part[:] = block.mean(axis=1, keepdims=True)
+                        part *= inp.source.gain
+                        acc += part
+                    stats.clipped_samples += int(np.count_nonzero((acc > 32767) | (acc < -32768)))
+                    np.clip(acc, -32768, 32767, out=acc)
+                    writers[0].writeframes(acc.astype(np.int16))
+                    vad_block = acc
+                t1 = time.perf_counter()
+                if vad is not None:
+                    vad.feed(vad_block)
+                if tracer is not None:
+                    tracer.add("audio write", t0, t1, "audio")
+                    if vad is not None:
+                        tracer.add("voice activity", t1, time.perf_counter(), "audio")
+                stats.frames_written += count
+            # Kept current for live monitoring (see Recorder.collect_metrics)
+            stats.overflowed_frames = sum(inp.ring.overflowed_frames for inp in inputs)
+            # Drop what a faster clock has run ahead, so sources stay aligned
+            live = [inp for inp in inputs if active(inp, now)]
+            if len(live) > 1:
+                slowest = min(inp.available() for inp in live)
+                for inp in live:
+                    excess = inp.available() - slowest - max_skew
+                    if excess > 0:
+                        stats.drift_frames += inp.ring.skip(excess)
+
+        paths = audio_track_paths(audio_path, len(inputs)) if mode == "tracks" else [audio_path]
+        vad = None
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(profiled(tracer))
+            if voice_index_path:
+                vad = stack.enter_context(VoiceActivityDetector(samplerate, voice_index_path))
+            writers = []
+            for index, path in enumerate(paths):
+                wav_channels = inputs[index].channels if mode == "tracks" else out_channels
+                if segment_seconds:
+                    callback = functools.partial(on_segment, index) if on_segment else None
+                    wf = stack.enter_context(SegmentedWavWriter(
+                        path, wav_channels, samplerate, int(round(segment_seconds * samplerate)), callback))
+                else:
+                    wf = stack.enter_context(wave.open(path, "wb"))
+                    wf.setnchannels(wav_channels)
+                    wf.setsampwidth(2)  # 16-bit audio
+                    wf.setframerate(samplerate)
+                writers.append(wf)
+
+            with contextlib.ExitStack() as streams:
+                for inp in inputs:
+                    streams.enter_context(open_stream(inp))
+                names = ", ".join(inp.source.name for inp in inputs)
+                print(f"Audio recording started ({names})... Audio will be saved as {', '.join(paths)}")
+                while not stop_event.wait(flush_seconds):
+                    flush()
+            # The streams are closed, so no more callbacks: write what is left
+            flush(final=True)
+        stats.overflowed_frames = sum(inp.ring.overflowed_frames for inp in inputs)
+        if vad is not None:
+            print(f"{vad}, index saved as {voice_index_path}")
+
+    def make_inputs(mono=False):
+        inputs = []
+        for source in sources:
+            if mono:
+                source_channels = 1
+            elif source.channels is not None:
+                source_channels = source.channels
+            elif source.is_null:
+                source_channels = 1
+            else:
+                source_channels = detect_input_channels(source.device)
+            inputs.append(_AudioInput(source, source_channels, int(samplerate * buffer_seconds), batch))
+        return inputs
+
+    inputs = make_inputs()
+    try:
+        record(inputs)
+    except Exception as e:
+        if not audio_available() or not isinstance(e, sd.PortAudioError):
+            raise
+        print(f"Error starting audio recording: {e}")
+        print("Trying with mono (1 channel)...")
+        if any(inp.channels != 1 for inp in inputs):
+            # Retry with mono
+            record(make_inputs(mono=True))
+        else:
+            raise
+    print(stats)
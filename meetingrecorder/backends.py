@@ -0,0 +1,147 @@
+"""
+Optional and heavy third-party modules, imported lazily.
+
+OpenCV, numpy, pyautogui and sounddevice load on first use (or from warm_up() on a
+background thread), moviepy only when a finalize needs it, so the window appears
+before any of them has been imported.
+"""
+import functools
+import importlib.util
+import shutil
+import sys
+import threading
+import time
+
+
+def _lazy_import(name: str):
+    """
+    Module name, imported on first attribute access instead of now (importlib's LazyLoader),
+    so the window appears before the heavy backends load. Raises ImportError only if the
+    module is not installed; errors while importing it surface on first use (see loaded()).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+_import_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def loaded(name: str) -> bool:
+    """
+    Import module name (from _lazy_import) now if it has not been yet; False if that fails.
+    Serialized, since a module half-imported on one thread must not be used from another:
+    threads that may be the first to touch a lazy module call this before using it.
+    """
+    with _import_lock:
+        module = sys.modules.get(name)
+        if module is None:
+            return False
+        try:
+            # Any attribute access runs the deferred import
+            getattr(module, "__file__", None)
+            return True
+        except Exception as e:
+            sys.modules.pop(name, None)
+            print(f"Could not load {name}: {e}")
+            return False
+
+
+cv2 = _lazy_import("cv2")
+np = _lazy_import("numpy")
+
+try:
+    pyautogui = _lazy_import("pyautogui")
+except ImportError:
+    pyautogui = None
+
+try:
+    sd = _lazy_import("sounddevice")
+except ImportError:
+    sd = None
+
+# moviepy pulls in imageio and its ffmpeg plumbing, which only the transcode finalize needs
+MOVIEPY_AVAILABLE = importlib.util.find_spec("moviepy") is not None
+
+
+def pyautogui_available() -> bool:
+    # pyautogui needs a display; headless runs (e.g. benchmark.py) only use mss or synthetic frames
+    return pyautogui is not None and loaded("pyautogui")
+
+
+def audio_available() -> bool:
+    # Importing sounddevice fails with OSError when the PortAudio library is missing
+    return sd is not None and loaded("sounddevice")
+
+
+@functools.lru_cache(maxsize=None)
+def load_moviepy():
+    """(VideoFileClip, AudioFileClip) from moviepy, imported on first use."""
+    try:
+        from moviepy import VideoFileClip, AudioFileClip
+    except ImportError:
+        # Fallback for older moviepy versions
+        from moviepy.editor import VideoFileClip, AudioFileClip
+    return VideoFileClip, AudioFileClip
+
+
+def load_recording_modules():
+    """Import numpy and OpenCV on this thread, before capture and audio threads start using them."""
+    for name in ("numpy", "cv2"):
+        if not loaded(name):
+            raise RuntimeError(f"Could not import {name}, which recording needs")
+
+
+def warm_up():
+    """
+    Load the heavy backends now (OpenCV, numpy, audio, moviepy, ffmpeg lookup), e.g. on a
+    background thread once the window is up, so the first recording does not wait for them.
+    """
+    started = time.perf_counter()
+    load_recording_modules()
+    audio_available()
+    pyautogui_available()
+    if MOVIEPY_AVAILABLE:
+        try:
+            load_moviepy()
+        except Exception as e:
+            print(f"Could not load moviepy: {e}")
+    find_ffmpeg()
+    print(f"Backends loaded in {time.perf_counter() - started:.2f} s")
+
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    mss = None
+    MSS_AVAILABLE = False
+
+try:
+    import pygetwindow as gw
+    WINDOW_DETECTION_AVAILABLE = True
+except (ImportError, NotImplementedError):
+    # NotImplementedError: pygetwindow has no Linux support
+    gw = None
+    WINDOW_DETECTION_AVAILABLE = False
+
+
+def find_ffmpeg():
+    """Return the ffmpeg executable from PATH or the copy bundled with moviepy (imageio-ffmpeg), or None."""
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
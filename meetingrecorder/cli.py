@@ -0,0 +1,171 @@
+"""Command line entry point: the GUI by default, or a full-screen recording with --cli."""
+import argparse
+import glob
+import json
+import os
+import time
+
+from .backends import audio_available, MOVIEPY_AVAILABLE
+from .audio import get_input_devices, parse_audio_source
+from .paths import slides_folder_for, text_index_path_for, timestamps_path_for
+from .sources import FRAME_SOURCES, SyntheticFrameSource
+from .encoding import encoder_profile, ENCODER_PROFILES
+from .metrics import start_metrics
+from .segments import recover_segments
+from .recorder import Recorder
+
+
+def record_screen_with_audio(fps: float = None, encoder: str = "auto", finalize: str = "auto",
+                             audio_sources=None, audio_mode: str = "mix", segment_seconds: float = None,
+                             frame_source="auto", profile=None, adaptive: bool = True, slides: bool = False,
+                             ocr: bool = False, metrics=None, trace: bool = False, cprofile: bool = False):
+    """
+    Record the entire screen and microphone into a single MP4 in the recordings folder
+    (see Recorder for the options). Stop with Ctrl+C in the terminal window.
+    """
+    started = time.monotonic()
+    recorder = Recorder(source=frame_source, fps=fps, profile=profile, encoder=encoder, finalize=finalize,
+                        audio_sources=audio_sources, audio_mode=audio_mode, segment_seconds=segment_seconds,
+                        adaptive=adaptive, slides=slides, ocr=ocr, metrics=metrics, trace=trace, cprofile=cprofile,
+                        status_callback=print,
+                        on_first_frame=lambda: print(f"First frame recorded after {time.monotonic() - started:.2f} s",
+                                                     flush=True))
+    recorder.start()
+    track = recorder.tracks[0]
+    print(f"- Capturing {track.source.frame_size[0]}×{track.source.frame_size[1]} with {track.source.name}")
+    print(f"- Raw video will be saved as {track.encoded_path or recorder.video_path} ({recorder.fps:g} fps)")
+    print(f"- Encoder profile: {recorder.profile}")
+    print(f"- Frame timestamps will be saved as {timestamps_path_for(recorder.final_mp4_path)}")
+    if recorder.manifest:
+        print(f"- Chunks of {recorder.segment_seconds:g} s are tracked in {recorder.manifest.path}")
+    if recorder.slides:
+        print(f"- Slides will be saved in {slides_folder_for(recorder.final_mp4_path)}")
+    if recorder.ocr:
+        print(f"- Their text will be indexed in {text_index_path_for(recorder.final_mp4_path)}")
+    if recorder.trace_path:
+        print(f"- Profiling spans will be saved as {recorder.trace_path}")
+    if recorder.profile_folder:
+        print(f"- cProfile stats will be saved in {recorder.profile_folder}")
+    if recorder.records_audio:
+        print(f"- Raw audio will be saved as {recorder.audio_path}")
+        print(f"- Speech/silence index will be saved as {recorder.voice_index_path}")
+    if track.finalize_mode != "transcode" or MOVIEPY_AVAILABLE:
+        print(f"After recording, a combined MP4 will be created as {recorder.final_mp4_path}")
+    else:
+        print("Note: To automatically create a single MP4 file, install moviepy:")
+        print("      py -m pip install moviepy")
+    print("Press Ctrl+C in this window to stop recording.")
+
+    try:
+        recorder.wait()
+    except KeyboardInterrupt:
+        print("\nRecording stopped by user.")
+        recorder.stop()
+    print(recorder.stats)
+    return recorder
+
+
+def recover_recordings(path: str) -> int:
+    """
+    Join the chunks a crashed segmented recording left behind (see recover_segments).
+    path is its .manifest.json, or a folder whose unfinished manifests are all recovered.
+    Returns the number of recordings that could not be recovered.
+    """
+    if os.path.isdir(path):
+        manifests = []
+        for manifest_path in sorted(glob.glob(os.path.join(path, "*.manifest.json"))):
+            with open(manifest_path, encoding="utf-8") as f:
+                if not json.load(f).get("complete"):
+                    manifests.append(manifest_path)
+        if not manifests:
+            print(f"No unfinished segmented recordings in {path}")
+    else:
+        manifests = [path]
+    failed = 0
+    for manifest_path in manifests:
+        print(f"Recovering {manifest_path}...")
+        try:
+            print(f"✓ Success! MP4 saved: {recover_segments(manifest_path)}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ Failed to recover {manifest_path}: {e}")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record the screen and microphone into a single MP4 file.")
+    parser.add_argument("--cli", action="store_true", help="record the full screen from the terminal (Ctrl+C stops)")
+    parser.add_argument("--frame-source", default="auto",
+                        choices=["auto", *(cls.name for cls in FRAME_SOURCES), SyntheticFrameSource.name],
+                        help="screen capture backend for --cli (synthetic: generated frames, no display needed)")
+    parser.add_argument("--slides", action="store_true",
+                        help="with --cli, also save each distinct slide / screen as a PNG next to the recording")
+    parser.add_argument("--ocr", action="store_true",
+                        help="with --cli, also read the slides' text into a searchable index (needs pytesseract)")
+    audio = parser.add_argument_group("audio", "what to record besides the screen (default: the microphone)")
+    audio.add_argument("--audio-source", action="append", type=parse_audio_source, metavar="DEVICE[@GAIN]",
+                       help="record this input; repeat to add more, e.g. --audio-source default --audio-source "
+                            "\"Stereo Mix@0.8\" for both sides of a call. DEVICE is default, an index or a name "
+                            "from --list-audio-devices, or null (silence)")
+    audio.add_argument("--audio-mode", choices=["mix", "tracks"], default="mix",
+                       help="mix the sources into one audio track, or keep one track per source")
+    audio.add_argument("--list-audio-devices", action="store_true", help="list the devices that can record, and exit")
+    parser.add_argument("--segment-seconds", type=float,
+                        help="write the recording in chunks of this length, finalized while recording continues, "
+                             "so a crash loses at most the last chunk (needs ffmpeg)")
+    parser.add_argument("--recover", metavar="PATH",
+                        help="join the chunks of crashed segmented recordings: a .manifest.json, or a folder "
+                             "such as recordings")
+    encoding = parser.add_argument_group("encoding", "start from a named profile and override single settings")
+    encoding.add_argument("--encoder-profile", default="default", choices=list(ENCODER_PROFILES))
+    encoding.add_argument("--codec", help="ffmpeg video encoder, e.g. libx264 or h264_nvenc")
+    encoding.add_argument("--preset", help="libx264 preset, e.g. ultrafast, veryfast, medium")
+    encoding.add_argument("--crf", type=float, help="constant quality, lower is better")
+    encoding.add_argument("--bitrate", help="target bitrate such as 2M (instead of --crf)")
+    encoding.add_argument("--threads", type=int, help="encoder threads, 0 = automatic")
+    encoding.add_argument("--keyframe-seconds", type=float, help="longest gap between keyframes")
+    encoding.add_argument("--pix-fmt", help="output pixel format, e.g. yuv420p")
+    encoding.add_argument("--fps", type=float, help="capture frame rate")
+    encoding.add_argument("--no-adaptive", dest="adaptive", action="store_false",
+                          help="keep resolution and frame rate fixed even when the encoder falls behind")
+    monitoring = parser.add_argument_group("monitoring", "live recorder health, for dashboards and alerts")
+    monitoring.add_argument("--metrics-file", help="write the metrics as JSON to this file periodically")
+    monitoring.add_argument("--metrics-port", type=int,
+                            help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics")
+    monitoring.add_argument("--metrics-interval", type=float, default=5.0, help="seconds between metrics file updates")
+    profiling = parser.add_argument_group("profiling", "where the time goes, for tracking down choppy video")
+    profiling.add_argument("--profile", action="store_true",
+                           help="record per-stage timing spans into a .trace.json file (open in ui.perfetto.dev)")
+    profiling.add_argument("--profile-threads", action="store_true",
+                           help="also save cProfile stats of each thread (of the whole process on Python 3.12+) "
+                                "in a .profile folder (implies --profile)")
+    args = parser.parse_args(argv)
+    if args.recover:
+        return 1 if recover_recordings(args.recover) else 0
+    if args.list_audio_devices:
+        if not audio_available():
+            print("Audio recording is not available because 'sounddevice' is not installed.")
+            return 1
+        for index, name in get_input_devices():
+            print(f"{index:3d}  {name}")
+        return 0
+    profile = encoder_profile(args.encoder_profile, codec=args.codec, preset=args.preset, crf=args.crf,
+                              bitrate=args.bitrate, threads=args.threads, keyframe_seconds=args.keyframe_seconds,
+                              pix_fmt=args.pix_fmt, fps=args.fps)
+    metrics, stop_metrics = start_metrics(args.metrics_file, args.metrics_port, args.metrics_interval)
+    try:
+        if args.cli:
+            frame_source = SyntheticFrameSource() if args.frame_source == SyntheticFrameSource.name else args.frame_source
+            record_screen_with_audio(profile=profile, adaptive=args.adaptive, frame_source=frame_source,
+                                     segment_seconds=args.segment_seconds, audio_sources=args.audio_source,
+                                     audio_mode=args.audio_mode,
+                                     slides=args.slides, ocr=args.ocr, metrics=metrics, trace=args.profile,
+                                     cprofile=args.profile_threads)
+        else:
+            # Only the GUI needs tkinter
+            from .gui import launch_gui
+            launch_gui(profile, metrics, args.profile, args.profile_threads, args.segment_seconds)
+    finally:
+        if stop_metrics is not None:
+            stop_metrics()
+    return 0
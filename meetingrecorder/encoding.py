@@ -0,0 +1,407 @@
+"""Video encoding: encoder profiles, the ffmpeg / OpenCV writers, and ffmpeg mux / concat helpers."""
+import os
+import queue
+import subprocess
+import threading
+
+from .backends import cv2, find_ffmpeg, np
+from .paths import segment_path
+from .pipeline import DEFAULT_FPS
+
+
+def run_ffmpeg(args, ffmpeg: str = None, progress=None, duration: float = None):
+    """
+    Run ffmpeg to completion, raising RuntimeError with its error output on failure.
+    If progress and duration are given, progress(fraction) is called as ffmpeg advances.
+    """
+    ffmpeg = ffmpeg or find_ffmpeg()
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found")
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y"]
+    if progress is not None and duration:
+        cmd += ["-progress", "pipe:1", "-nostats"]
+    proc = subprocess.Popen(
+        [*cmd, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        start_new_session=True,
+    )
+    # ffmpeg reports "out_time_us=<microseconds>" lines on stdout with -progress
+    for line in proc.stdout:
+        if progress is not None and duration and line.startswith(b"out_time_us="):
+            try:
+                progress(min(1.0, int(line.split(b"=", 1)[1]) / 1e6 / duration))
+            except ValueError:
+                pass
+    error = proc.stderr.read()
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed: {error.decode(errors='replace').strip()}")
+
+
+# ffmpeg option for constant-quality encoding, per encoder; others only take a bitrate
+QUALITY_OPTIONS = {
+    "libx264": "-crf",
+    "libx265": "-crf",
+    "libvpx-vp9": "-crf",
+    "h264_nvenc": "-cq",
+    "hevc_nvenc": "-cq",
+    "h264_qsv": "-global_quality",
+    "hevc_qsv": "-global_quality",
+}
+
+
+# Encoders that understand x264-style -preset / -tune names
+X264_STYLE_CODECS = ("libx264", "libx265")
+
+
+class EncoderProfile:
+    """
+    How a recording is encoded.
+
+    codec:            ffmpeg encoder, e.g. libx264, or a hardware one (h264_nvenc, h264_qsv, h264_amf)
+    preset:           libx264/libx265 speed vs. size ("ultrafast" ... "veryslow")
+    crf:              constant quality, lower is better; ignored when bitrate (e.g. "2M") is set
+    threads:          encoder threads, 0 lets the encoder decide
+    keyframe_seconds: longest gap between keyframes, None for the encoder default
+    pix_fmt:          output pixel format; yuv420p plays everywhere
+    fps:              capture rate used when the caller does not ask for one
+    tune:             libx264 tuning such as "stillimage", or None
+    The OpenCV fallback writers only honour fps.
+    """
+
+    def __init__(self, name: str = "default", codec: str = "libx264", preset: str = "veryfast", crf: float = 23,
+                 bitrate: str = None, threads: int = 0, keyframe_seconds: float = None, pix_fmt: str = "yuv420p",
+                 fps: float = DEFAULT_FPS, tune: str = None):
+        self.name = name
+        self.codec = codec
+        self.preset = preset
+        self.crf = crf
+        self.bitrate = bitrate
+        self.threads = threads
+        self.keyframe_seconds = keyframe_seconds
+        self.pix_fmt = pix_fmt
+        self.fps = fps
+        self.tune = tune
+
+    def replace(self, **changes) -> "EncoderProfile":
+        """A copy with the given fields changed."""
+        return EncoderProfile(**{**vars(self), **changes})
+
+    def quality_args(self, fps: float = None) -> list:
+        """ffmpeg output options besides codec, preset and threads."""
+        args = []
+        if self.codec in X264_STYLE_CODECS and self.tune:
+            args += ["-tune", self.tune]
+        if self.bitrate:
+            args += ["-b:v", str(self.bitrate)]
+        elif self.crf is not None and self.codec in QUALITY_OPTIONS:
+            args += [QUALITY_OPTIONS[self.codec], f"{self.crf:g}"]
+        if self.keyframe_seconds:
+            args += ["-g", str(max(1, round(self.keyframe_seconds * (fps or self.fps))))]
+        return args + ["-pix_fmt", self.pix_fmt]
+
+    def ffmpeg_args(self, fps: float = None) -> list:
+        """ffmpeg output options for the video stream."""
+        args = ["-c:v", self.codec]
+        if self.codec in X264_STYLE_CODECS:
+            args += ["-preset", self.preset]
+        if self.threads:
+            args += ["-threads", str(self.threads)]
+        return args + self.quality_args(fps)
+
+    def moviepy_options(self, fps: float = None) -> dict:
+        """Keyword arguments for moviepy's write_videofile."""
+        return {
+            "codec": self.codec,
+            "preset": self.preset,
+            "threads": self.threads or None,
+            "ffmpeg_params": self.quality_args(fps),
+        }
+
+    def __str__(self):
+        quality = f"{self.bitrate}bps" if self.bitrate else f"crf {self.crf:g}"
+        return f"{self.name} ({self.codec} {self.preset}, {quality}, {self.fps:g} fps)"
+
+
+ENCODER_PROFILES = {
+    "default": EncoderProfile("default"),
+    # Mostly static screens: few frames, cheapest preset, rare keyframes
+    "slides-low-cpu": EncoderProfile("slides-low-cpu", preset="ultrafast", crf=28, threads=2, keyframe_seconds=10,
+                                     fps=10, tune="stillimage"),
+    # Scrolling, typing and cursor motion: higher frame rate and quality, seekable every 2 s
+    "demo-smooth": EncoderProfile("demo-smooth", preset="faster", crf=20, keyframe_seconds=2, fps=30),
+}
+
+
+def encoder_profile(profile=None, **overrides) -> EncoderProfile:
+    """
+    Resolve profile (an EncoderProfile, a name from ENCODER_PROFILES, or None for "default")
+    and apply overrides whose value is not None, e.g. from command-line options.
+    """
+    if profile is None:
+        profile = ENCODER_PROFILES["default"]
+    elif not isinstance(profile, EncoderProfile):
+        if profile not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile: {profile} (choose from {', '.join(ENCODER_PROFILES)})")
+        profile = ENCODER_PROFILES[profile]
+    changes = {key: value for key, value in overrides.items() if value is not None}
+    return profile.replace(**changes) if changes else profile
+
+
+class FFmpegPipeWriter:
+    """
+    Stand-in for cv2.VideoWriter that pipes raw frames into an ffmpeg process,
+    which encodes H.264 into an .mp4 while recording is still running.
+    pixel_format "bgra" accepts mss grabs as-is, leaving the colour conversion to ffmpeg.
+    profile is an EncoderProfile (default: libx264 veryfast).
+    """
+
+    def __init__(self, path: str, fps: float, frame_size, ffmpeg: str = None, pixel_format: str = "bgr24",
+                 profile: EncoderProfile = None):
+        self.path = path
+        self.fps = fps
+        self.pixel_format = pixel_format
+        self.profile = profile or ENCODER_PROFILES["default"]
+        width, height = frame_size
+        ffmpeg = ffmpeg or find_ffmpeg()
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found")
+        cmd = [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", pixel_format, "-s", f"{width}x{height}", "-r", f"{fps:g}",
+            "-i", "-",
+            "-an",
+            # yuv420p needs even dimensions; custom regions can be odd-sized
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            *self.profile.ffmpeg_args(fps),
+            path,
+        ]
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            # Own session: Ctrl+C stops the recording, which then closes ffmpeg's input
+            start_new_session=True,
+        )
+
+    def isOpened(self) -> bool:
+        return self.proc.poll() is None
+
+    def write(self, frame):
+        self.proc.stdin.write(np.ascontiguousarray(frame).data)
+
+    def release(self):
+        """Close the pipe and wait for ffmpeg to finish the file."""
+        if self.proc.stdin.closed:
+            return
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        error = self.proc.stderr.read()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg encoder failed: {error.decode(errors='replace').strip()}")
+
+
+def open_video_writer(video_path: str, fps: float, frame_size, encoder: str = "auto", finalize: str = "auto",
+                      accept_bgra: bool = False, profile: EncoderProfile = None):
+    """
+    Open the writer used during capture.
+
+    encoder:  "ffmpeg" streams H.264 straight into an .mp4 next to video_path,
+              "opencv" uses cv2.VideoWriter,
+              "auto" uses ffmpeg when it can be found and falls back to opencv.
+    finalize: only matters for the opencv writer. "fast" writes an MP4-compatible stream
+              (H.264, else MPEG-4) so the final step just remuxes it with the audio,
+              "transcode" writes XVID into video_path for the moviepy merge,
+              "auto" picks fast whenever ffmpeg is available for the remux.
+    accept_bgra: the caller can supply BGRA frames; the ffmpeg writer then takes them
+              directly (check writer.pixel_format), OpenCV writers always want BGR.
+    profile:  EncoderProfile for the ffmpeg writer.
+    Returns (writer, path_written, finalize_mode) where finalize_mode is "remux" or "transcode".
+    """
+    ffmpeg = find_ffmpeg()
+    mp4_path = os.path.splitext(video_path)[0] + ".video.mp4"
+    if encoder in ("auto", "ffmpeg"):
+        if ffmpeg is not None:
+            try:
+                pixel_format = "bgra" if accept_bgra else "bgr24"
+                writer = FFmpegPipeWriter(mp4_path, fps, frame_size, ffmpeg, pixel_format, profile)
+                return writer, mp4_path, "remux"
+            except OSError as e:
+                print(f"Warning: Could not start ffmpeg encoder, using OpenCV: {e}")
+        elif encoder == "ffmpeg":
+            print("Warning: ffmpeg not found, using OpenCV encoder.")
+
+    if finalize == "fast" and ffmpeg is None:
+        print("Warning: ffmpeg not found, fast finalize is not available.")
+    elif finalize in ("auto", "fast") and ffmpeg is not None:
+        for codec in ("avc1", "mp4v"):
+            writer = cv2.VideoWriter(mp4_path, cv2.VideoWriter_fourcc(*codec), fps, frame_size)
+            if writer.isOpened():
+                return writer, mp4_path, "remux"
+            writer.release()
+
+    fourcc = cv2.VideoWriter_fourcc(*"XVID")
+    return cv2.VideoWriter(video_path, fourcc, fps, frame_size), video_path, "transcode"
+
+
+def mux_audio_video(video_path: str, audio_path, final_mp4_path: str, duration: float = None, progress=None,
+                    subtitle_path: str = None):
+    """
+    Combine an already-encoded MP4-compatible video with the WAV into final_mp4_path.
+    The video stream is copied, so only the audio is encoded.
+    video_path may be a list (one per monitor); each becomes its own video track.
+    audio_path may be a list of WAVs (separate-track recording); each becomes its own
+    audio track. Missing WAVs are skipped, so with none the video is remuxed on its own.
+    subtitle_path: optional .srt added as a text track (e.g. the adaptive quality log).
+    """
+    video_paths = list(video_path) if isinstance(video_path, (list, tuple)) else [video_path]
+    audio_paths = audio_path if isinstance(audio_path, (list, tuple)) else [audio_path]
+    audio_paths = [path for path in audio_paths if path is not None and os.path.exists(path)]
+    args = []
+    for path in video_paths + audio_paths:
+        args += ["-i", path]
+    if subtitle_path is not None:
+        args += ["-i", subtitle_path]
+    for index in range(len(video_paths)):
+        args += ["-map", f"{index}:v:0"]
+    for index in range(len(audio_paths)):
+        args += ["-map", f"{len(video_paths) + index}:a:0"]
+    if audio_paths:
+        args += ["-c:a", "aac"]
+    if subtitle_path is not None:
+        args += ["-map", f"{len(video_paths) + len(audio_paths)}:s:0", "-c:s", "mov_text",
+                 "-metadata:s:s:0", "title=Recording quality"]
+    args += ["-c:v", "copy"]
+    if duration is not None:
+        # Like the moviepy merge, the video length wins
+        args += ["-t", f"{duration:.3f}"]
+    args += ["-movflags", "+faststart", final_mp4_path]
+    run_ffmpeg(args, progress=progress, duration=duration)
+
+
+def concat_mp4_parts(part_paths, final_mp4_path: str, duration: float = None, progress=None):
+    """Join MP4 chunks with identical codec settings into one file without re-encoding."""
+    list_path = os.path.splitext(final_mp4_path)[0] + ".concat.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in part_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        run_ffmpeg(["-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", "-movflags", "+faststart",
+                    final_mp4_path], progress=progress, duration=duration)
+    finally:
+        os.remove(list_path)
+
+
+def join_video_parts(parts, video_path: str, frame_size, profile: EncoderProfile = None, fps: float = None):
+    """
+    Combine the parts written by an AdaptiveVideoWriter, given as (path, (width, height)),
+    into video_path at frame_size and delete them. Only the parts recorded at a lower
+    resolution are re-encoded (scaled back up to frame_size with profile, the settings the
+    full-size parts were written with); then all parts are stream-copied into one file,
+    so the cost follows the time spent at reduced quality, not the whole recording.
+    """
+    paths = [path for path, size in parts]
+    if len(paths) == 1:
+        os.replace(paths[0], video_path)
+        return
+    profile = profile or ENCODER_PROFILES["default"]
+    width, height = (frame_size[0] + 1) // 2 * 2, (frame_size[1] + 1) // 2 * 2
+    joined, scaled = [], []
+    try:
+        for path, size in parts:
+            if tuple(size) == tuple(frame_size):
+                joined.append(path)
+                continue
+            scaled_path = os.path.splitext(path)[0] + ".scaled.mp4"
+            scaled.append(scaled_path)
+            run_ffmpeg(["-i", path, "-vf", f"scale={width}:{height},setsar=1", "-r", f"{fps or profile.fps:g}",
+                        *profile.ffmpeg_args(fps), scaled_path])
+            joined.append(scaled_path)
+        concat_mp4_parts(joined, video_path)
+    finally:
+        for path in scaled:
+            if os.path.exists(path):
+                os.remove(path)
+    for path in paths:
+        os.remove(path)
+
+
+class AdaptiveVideoWriter:
+    """
+    Writer that accepts frames whose size changes mid-recording (AdaptiveQualityController).
+    An MP4 stream cannot change resolution, so every size change closes the current part
+    and opens a new one with open_video_writer(); join_video_parts() puts them back
+    together when the recording is finalized. Every part has to come from the ffmpeg
+    encoder, so that they share a codec and can be stream-copied together; a part that
+    falls back to OpenCV raises RuntimeError. The closed part is released on a thread of
+    its own: ffmpeg finishing its backlog must not hold up the encoder, which is already
+    behind when the size steps down.
+    """
+
+    def __init__(self, video_path: str, fps: float, frame_size, encoder: str = "auto", accept_bgra: bool = False,
+                 profile: EncoderProfile = None):
+        self.video_path = video_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.encoder = encoder
+        self.accept_bgra = accept_bgra
+        self.profile = profile
+        # (path, (width, height)) of every part, in order
+        self.parts = []
+        self._writer = None
+        self._error = None
+        self._closing = queue.Queue()
+        self._closer = threading.Thread(target=self._close_parts, name="adaptive-writer-closer", daemon=True)
+        self._closer.start()
+        self._open(tuple(frame_size))
+        self.pixel_format = getattr(self._writer, "pixel_format", "bgr24")
+
+    def _open(self, size):
+        writer, path, mode = open_video_writer(segment_path(self.video_path, len(self.parts)), self.fps, size,
+                                               self.encoder, "fast", self.accept_bgra, self.profile)
+        if not isinstance(writer, FFmpegPipeWriter):
+            # An OpenCV part (mp4v, avc1) cannot be concat-copied with libx264 ones
+            writer.release()
+            if os.path.exists(path):
+                os.remove(path)
+            raise RuntimeError("Adaptive resolution needs the ffmpeg encoder for every part")
+        self._writer = writer
+        self._size = size
+        self.parts.append((path, size))
+
+    def isOpened(self) -> bool:
+        return self._writer is not None and self._writer.isOpened()
+
+    def _close_parts(self):
+        while True:
+            writer = self._closing.get()
+            if writer is None:
+                break
+            try:
+                writer.release()
+            except RuntimeError as e:
+                if self._error is None:
+                    self._error = e
+
+    def write(self, frame):
+        size = (frame.shape[1], frame.shape[0])
+        if size != self._size:
+            self._closing.put(self._writer)
+            self._open(size)
+        self._writer.write(frame)
+
+    def release(self):
+        """Close the current part and wait for all parts to be finished; raises the first encoder error."""
+        if self._writer is not None:
+            self._closing.put(self._writer)
+            self._writer = None
+            self._closing.put(None)
+            self._closer.join()
+        if self._error is not None:
+            raise self._error
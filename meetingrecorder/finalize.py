@@ -0,0 +1,275 @@
+"""Turning a finished capture into the final MP4, inline or on a background process pool."""
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+import os
+import queue
+import threading
+
+from .backends import load_moviepy
+from .encoding import encoder_profile, join_video_parts, mux_audio_video
+from .segments import join_segments
+from .tracing import Tracer, profiled, span
+
+
+def _moviepy_logger(progress):
+    """A proglog logger forwarding moviepy's frame progress to progress(fraction), or None."""
+    if progress is None:
+        return None
+    try:
+        from proglog import ProgressBarLogger
+    except ImportError:
+        return None
+
+    class Logger(ProgressBarLogger):
+        def bars_callback(self, bar, attr, value, old_value=None):
+            total = self.bars[bar].get("total")
+            if bar == "frame_index" and attr == "index" and total:
+                progress(min(1.0, value / total))
+
+    return Logger()
+
+
+def finalize_recording(job: dict, progress=None) -> str:
+    """
+    Turn the files a capture left behind into the final MP4 and remove the intermediates.
+    Only uses the paths in job, so it can run in a worker process.
+
+    job["mode"]: "remux"     - video_path is MP4-compatible; copy it and encode the audio. With
+                               video_parts (AdaptiveVideoWriter.parts), those are first joined into
+                               video_path at frame_size; a metadata_path .srt becomes a text track.
+                               video_path may be a list of per-monitor tracks.
+                 "transcode" - XVID video_path + WAV merged by moviepy, encoded with job["profile"]
+                 "segments"  - concatenate the chunks listed in manifest_path
+    progress: optional callable(fraction in 0..1).
+    job["trace_path"] (optional) is a Tracer file the steps are appended to as spans, with
+    a cProfile of this thread in job["profile_folder"] if that is set too.
+    Returns the final path; raises on failure, leaving the intermediates in place.
+    """
+    if not job.get("trace_path"):
+        return _finalize(job, progress, None)
+    # Inline, this runs in the capture's process: its 3.12+ profile must not replace the capture's
+    tracer = Tracer(job["trace_path"], job.get("profile_folder"), profile_name="finalize")
+    tracer.start()
+    try:
+        with profiled(tracer), tracer.span("finalize " + job["mode"], "finalize"):
+            return _finalize(job, progress, tracer)
+    finally:
+        tracer.close()
+
+
+def _finalize(job: dict, progress, tracer) -> str:
+    mode = job["mode"]
+    final_mp4_path = job["final_mp4_path"]
+    if mode == "segments":
+        with span(tracer, "join segments", "finalize"):
+            return join_segments(job["manifest_path"], progress)
+
+    video_path = job["video_path"]
+    audio_paths = [path for path in job["audio_paths"] if os.path.exists(path)]
+    metadata_path = job.get("metadata_path")
+    video_paths = video_path if isinstance(video_path, (list, tuple)) else [video_path]
+    intermediates = [*video_paths, *audio_paths]
+    if job.get("video_parts"):
+        # Adaptive resolution: join the parts into video_path first
+        with span(tracer, "join video parts", "finalize"):
+            join_video_parts(job["video_parts"], video_path, job["frame_size"], encoder_profile(job.get("profile")),
+                             job.get("fps"))
+    if mode == "remux":
+        with span(tracer, "mux audio and video", "finalize"):
+            mux_audio_video(video_path, audio_paths, final_mp4_path, duration=job.get("duration"),
+                            progress=progress, subtitle_path=metadata_path)
+        if metadata_path:
+            intermediates.append(metadata_path)
+    else:
+        with span(tracer, "load moviepy", "finalize"):
+            VideoFileClip, AudioFileClip = load_moviepy()
+            video_clip = VideoFileClip(video_path)
+            audio_clip = AudioFileClip(audio_paths[0])
+
+        # Attach audio as-is using moviepy 2.x API (`with_audio`)
+        video_with_audio = video_clip.with_audio(audio_clip)
+
+        # Write final MP4
+        with span(tracer, "moviepy merge", "finalize"):
+            video_with_audio.write_videofile(
+                final_mp4_path,
+                audio_codec="aac",
+                temp_audiofile=os.path.splitext(final_mp4_path)[0] + "_temp_audio.m4a",
+                remove_temp=True,
+                logger=_moviepy_logger(progress) or "bar",
+                **encoder_profile(job.get("profile")).moviepy_options(video_clip.fps),
+            )
+
+        video_clip.close()
+        audio_clip.close()
+        video_with_audio.close()
+
+    # Delete the intermediate files
+    try:
+        for path in intermediates:
+            os.remove(path)
+    except Exception:
+        pass
+    return final_mp4_path
+
+
+class FinalizeJob:
+    """State of one background finalization, as shown in the GUI."""
+
+    def __init__(self, job_id: int, spec: dict):
+        self.id = job_id
+        self.spec = spec
+        self.state = "queued"
+        self.progress = 0.0
+        self.error = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.spec["final_mp4_path"])
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed")
+
+    def __str__(self):
+        if self.state == "running":
+            return f"{self.name}: finalizing {self.progress:.0%}"
+        if self.state == "failed":
+            # ffmpeg errors span several lines; the last one says what went wrong
+            lines = (self.error or "").strip().splitlines()
+            return f"{self.name}: failed ({(lines or ['unknown error'])[-1]})"
+        return f"{self.name}: {self.state}"
+
+
+def _finalize_worker(job_id: int, spec: dict, events):
+    """Process pool entry point: run finalize_recording and report through the events queue."""
+    events.put((job_id, "running", 0.0, None))
+    last = [0.0]
+
+    def progress(fraction):
+        # Only report whole-percent steps to keep the queue quiet
+        if fraction - last[0] >= 0.01:
+            last[0] = fraction
+            events.put((job_id, "running", fraction, None))
+
+    try:
+        finalize_recording(spec, progress)
+        events.put((job_id, "done", 1.0, None))
+    except Exception as e:
+        events.put((job_id, "failed", None, str(e)))
+
+
+class FinalizeQueue:
+    """
+    Runs finalize_recording() for finished captures on a process pool, so a new
+    recording can start while earlier ones are still being muxed or encoded, and
+    several finalizations can run side by side.
+
+    on_update(job) is called from a listener thread whenever a job changes state or
+    progress. Falls back to threads where a process pool cannot be started. A worker
+    process that dies (crash, out of memory) fails its job and breaks the pool; the
+    next submit() starts a new pool. Worker processes are spawned, not forked, so they
+    do not hold the pipes of a recording that is still running.
+    """
+
+    def __init__(self, max_workers: int = 2, on_update=None, use_processes: bool = True):
+        self.max_workers = max_workers
+        self.on_update = on_update
+        self.use_processes = use_processes
+        self.jobs = {}
+        self._next_id = 1
+        self._pool = None
+        self._manager = None
+        self._events = None
+        self._listener = None
+
+    def _new_pool(self):
+        return concurrent.futures.ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _start(self):
+        # Started on first use: the pool and its manager process cost startup time
+        if self.use_processes:
+            try:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+                self._events = self._manager.Queue()
+                self._pool = self._new_pool()
+            except (OSError, NotImplementedError) as e:
+                print(f"Warning: Could not start finalize processes, using threads: {e}")
+                self.use_processes = False
+        if not self.use_processes:
+            self._events = queue.Queue()
+            self._pool = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="finalize")
+        self._listener = threading.Thread(target=self._listen, name="finalize-listener", daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                event = self._events.get()
+            except (EOFError, OSError):
+                # The manager process is gone (shutdown without waiting)
+                break
+            if event is None:
+                break
+            job_id, state, progress, error = event
+            job = self.jobs[job_id]
+            job.state = state
+            if progress is not None:
+                job.progress = progress
+            job.error = error
+            if self.on_update:
+                self.on_update(job)
+
+    def submit(self, spec: dict) -> FinalizeJob:
+        """Queue a finalize_recording() job spec and return its FinalizeJob."""
+        if self._pool is None:
+            self._start()
+        job = FinalizeJob(self._next_id, spec)
+        self._next_id += 1
+        self.jobs[job.id] = job
+        try:
+            future = self._pool.submit(_finalize_worker, job.id, spec, self._events)
+        except concurrent.futures.process.BrokenProcessPool:
+            # An earlier worker died and took the pool with it: start a fresh one
+            print("Warning: A finalize process died; restarting the finalize processes.")
+            self._pool.shutdown(wait=False)
+            self._pool = self._new_pool()
+            future = self._pool.submit(_finalize_worker, job.id, spec, self._events)
+
+        def check_crash(future):
+            # A worker process that died never reports back
+            error = future.exception()
+            if error is not None:
+                try:
+                    self._events.put((job.id, "failed", None, str(error) or type(error).__name__))
+                except (EOFError, OSError):
+                    pass
+
+        future.add_done_callback(check_crash)
+        if self.on_update:
+            self.on_update(job)
+        return job
+
+    def active(self):
+        return [job for job in self.jobs.values() if not job.finished]
+
+    def collect_metrics(self):
+        """Samples for a MetricsRegistry: jobs by state and the progress of the running ones."""
+        jobs = list(self.jobs.values())
+        samples = [("meetingrecorder_finalize_jobs", {"state": state}, sum(1 for job in jobs if job.state == state))
+                   for state in ("queued", "running", "done", "failed")]
+        samples.extend(("meetingrecorder_finalize_progress", {"file": job.name}, round(job.progress, 3))
+                       for job in jobs if job.state == "running")
+        return samples
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs; with wait, block until queued finalizations are done."""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=wait)
+        self._events.put(None)
+        if wait:
+            self._listener.join()
+        if self._manager is not None:
+            self._manager.shutdown()
@@ -0,0 +1,888 @@
+"""The Tk window."""
+import datetime
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from .backends import MSS_AVAILABLE, warm_up, WINDOW_DETECTION_AVAILABLE
+from .paths import ensure_output_dir
+from .audio import AudioSource, get_input_devices
+from .inventory import InventoryService, _monitor_key, _window_key
+from .encoding import encoder_profile, ENCODER_PROFILES
+from .finalize import FinalizeQueue
+from .ocr import tesseract_available
+from .recorder import Recorder, source_for_region
+
+# Chunk length of "Crash-safe" recordings
+DEFAULT_SEGMENT_SECONDS = 300.0
+NO_EXTRA_AUDIO = "Nothing else (microphone only)"
+
+
+def select_region_interactively():
+    """Open a full-screen overlay to let user select a custom region."""
+    class RegionSelector:
+        def __init__(self):
+            self.start_x = None
+            self.start_y = None
+            self.end_x = None
+            self.end_y = None
+            self.selected = False
+            
+            self.root = tk.Tk()
+            self.root.attributes('-fullscreen', True)
+            self.root.attributes('-alpha', 0.3)
+            self.root.configure(bg='black')
+            self.root.attributes('-topmost', True)
+            
+            # Create canvas for drawing selection rectangle
+            self.canvas = tk.Canvas(self.root, highlightthickness=0, bg='black', cursor='crosshair')
+            self.canvas.pack(fill=tk.BOTH, expand=True)
+            
+            # Instructions
+            self.canvas.create_text(
+                self.root.winfo_screenwidth() // 2,
+                50,
+                text="Click and drag to select recording area | Press ESC to cancel",
+                fill='white',
+                font=('Arial', 16, 'bold')
+            )
+            
+            self.canvas.bind('<Button-1>', self.on_click)
+            self.canvas.bind('<B1-Motion>', self.on_drag)
+            self.canvas.bind('<ButtonRelease-1>', self.on_release)
+            self.root.bind('<Escape>', self.cancel)
+            self.root.focus_set()
+            
+        def on_click(self, event):
+            self.start_x = event.x
+            self.start_y = event.y
+            self.canvas.delete('rect')
+            
+        def on_drag(self, event):
+            if self.start_x is not None:
+                self.canvas.delete('rect')
+                self.canvas.create_rectangle(
+                    self.start_x, self.start_y, event.x, event.y,
+                    outline='red', width=3, tags='rect'
+                )
+                
+        def on_release(self, event):
+            self.end_x = event.x
+            self.end_y = event.y
+            if self.start_x is not None:
+                # Ensure coordinates are correct (start < end)
+                left = min(self.start_x, self.end_x)
+                top = min(self.start_y, self.end_y)
+                right = max(self.start_x, self.end_x)
+                bottom = max(self.start_y, self.end_y)
+                
+                if abs(right - left) > 50 and abs(bottom - top) > 50:  # Minimum size
+                    self.selected = True
+                    self.region = {
+                        'left': left,
+                        'top': top,
+                        'width': right - left,
+                        'height': bottom - top
+                    }
+                    self.root.quit()
+                else:
+                    self.canvas.delete('rect')
+                    self.start_x = None
+                    
+        def cancel(self, event=None):
+            self.selected = False
+            self.root.quit()
+            
+        def get_region(self):
+            self.root.mainloop()
+            self.root.destroy()
+            return self.region if self.selected else None
+    
+    selector = RegionSelector()
+    return selector.get_region()
+
+
+class ScreenRecorderGUI:
+    def __init__(self, root, profile=None, metrics=None, trace: bool = False, cprofile: bool = False,
+                 segment_seconds: float = None):
+        self.root = root
+        self.root.title("Meeting Recorder")
+
+        # Modern window sizing & centering
+        window_width, window_height = 520, 610
+        screen_w = root.winfo_screenwidth()
+        screen_h = root.winfo_screenheight()
+        x = int((screen_w - window_width) / 2)
+        y = int((screen_h - window_height) / 3)
+        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        self.root.resizable(False, False)
+
+        # Dark theme background
+        dark_bg = "#1e1e1e"
+        dark_card = "#2d2d2d"
+        dark_text = "#e0e0e0"
+        dark_text_sub = "#a0a0a0"
+        accent_red = "#dc2626"
+        accent_blue = "#3b82f6"
+        
+        self.root.configure(bg=dark_bg)
+
+        # Use ttk themed widgets
+        style = ttk.Style()
+        try:
+            style.theme_use("clam")
+        except Exception:
+            pass
+
+        # Dark theme styles
+        style.configure(
+            "Card.TFrame",
+            background=dark_card,
+            relief="flat",
+        )
+        style.configure(
+            "Title.TLabel",
+            background=dark_card,
+            foreground=dark_text,
+            font=("Segoe UI", 14, "bold"),
+        )
+        style.configure(
+            "Subtitle.TLabel",
+            background=dark_card,
+            foreground=dark_text_sub,
+            font=("Segoe UI", 9),
+        )
+        style.configure(
+            "TLabel",
+            background=dark_card,
+            foreground=dark_text,
+            font=("Segoe UI", 10),
+        )
+        style.configure(
+            "Timer.TLabel",
+            background=dark_card,
+            foreground="#ffffff",
+            font=("Segoe UI", 24, "bold"),
+        )
+        style.configure(
+            "TButton",
+            font=("Segoe UI", 10, "bold"),
+            padding=8,
+        )
+        style.map(
+            "Primary.TButton",
+            background=[("!disabled", accent_blue), ("pressed", "#2563eb"), ("active", "#2563eb")],
+            foreground=[("!disabled", "white")],
+        )
+        style.map(
+            "Danger.TButton",
+            background=[("!disabled", accent_red), ("pressed", "#b91c1c"), ("active", "#b91c1c")],
+            foreground=[("!disabled", "white")],
+        )
+        style.map(
+            "Stop.TButton",
+            background=[("!disabled", accent_red), ("pressed", "#b91c1c"), ("active", "#b91c1c")],
+            foreground=[("!disabled", "white")],
+        )
+        
+        # Radio button dark theme
+        style.configure(
+            "TRadiobutton",
+            background=dark_card,
+            foreground=dark_text,
+            font=("Segoe UI", 9),
+        )
+        style.map(
+            "TRadiobutton",
+            background=[("selected", dark_card)],
+            foreground=[("selected", dark_text)],
+        )
+        style.configure(
+            "TCheckbutton",
+            background=dark_card,
+            foreground=dark_text,
+            font=("Segoe UI", 9),
+        )
+        style.map("TCheckbutton", background=[("active", dark_card)])
+        
+        # Combobox dark theme
+        style.configure(
+            "TCombobox",
+            fieldbackground=dark_card,
+            background=dark_card,
+            foreground=dark_text,
+            borderwidth=1,
+        )
+
+        # Store theme colors on the instance before creating child widgets
+        self.dark_bg = dark_bg
+        self.dark_card = dark_card
+        self.dark_text = dark_text
+        self.dark_text_sub = dark_text_sub
+        self.accent_red = accent_red
+        self.accent_blue = accent_blue
+
+        self.is_recording = False
+        self.stop_event = None
+        self.recording_thread = None
+        self.record_start_time = None
+        self.timer_job = None
+        # The running Recorder (set by the recording thread) and the time spent paused
+        self.recorder = None
+        self.paused_since = None
+        self.paused_seconds = 0.0
+        self.finalizer = None
+        # Encoder settings from the command line; the combobox can switch to another preset
+        self.profile = encoder_profile(profile)
+        # MetricsRegistry the recordings and background finalizations report into, if any
+        self.metrics = metrics
+        # Profiling mode (the checkbox); cprofile adds cProfile stats to the trace
+        self.trace = trace or cprofile
+        self.cprofile = cprofile
+        # Chunk length when "Crash-safe" is ticked
+        self.segments = segment_seconds is not None
+        self.segment_seconds = segment_seconds or DEFAULT_SEGMENT_SECONDS
+        # Filled in by the inventory service once the window is up
+        self.monitors = []
+        self.windows = []
+        self.selected_region = None
+
+        # Main card container
+        outer = tk.Frame(self.root, bg=self.dark_bg)
+        outer.pack(fill="both", expand=True, padx=12, pady=12)
+
+        card = ttk.Frame(outer, style="Card.TFrame", padding=20)
+        card.pack(fill="both", expand=True)
+
+        self.card = card
+
+        # Create GUI elements
+        self.create_widgets()
+
+        self.inventory = InventoryService(on_change=self.on_inventory_change, windows=WINDOW_DETECTION_AVAILABLE)
+        self.inventory.start()
+        # Load OpenCV, audio and moviepy once the window is on screen rather than before
+        self.warm_up_thread = threading.Thread(target=warm_up, daemon=True)
+        self.root.after(200, self.warm_up_thread.start)
+
+    def create_widgets(self):
+        card = self.card
+
+        # Header
+        header = ttk.Frame(card, style="Card.TFrame")
+        header.pack(fill="x", pady=(0, 8))
+
+        title_label = ttk.Label(header, text="Meeting Recorder", style="Title.TLabel")
+        title_label.pack(anchor="w")
+
+        subtitle = ttk.Label(
+            header,
+            text="Capture screen + microphone into a single MP4 file.",
+            style="Subtitle.TLabel",
+        )
+        subtitle.pack(anchor="w", pady=(2, 0))
+
+        # Recording mode selection
+        mode_frame = ttk.Frame(card, style="Card.TFrame")
+        mode_frame.pack(fill="x", pady=(4, 8))
+        
+        ttk.Label(mode_frame, text="Recording mode:").pack(anchor="w")
+        
+        self.mode_var = tk.StringVar(value="monitor")
+        mode_options_frame = ttk.Frame(mode_frame, style="Card.TFrame")
+        mode_options_frame.pack(fill="x", pady=(4, 0))
+        
+        ttk.Radiobutton(
+            mode_options_frame,
+            text="Full Screen",
+            variable=self.mode_var,
+            value="monitor",
+            command=self.on_mode_change
+        ).pack(side=tk.LEFT, padx=(0, 16))
+        
+        ttk.Radiobutton(
+            mode_options_frame,
+            text="Window",
+            variable=self.mode_var,
+            value="window",
+            command=self.on_mode_change
+        ).pack(side=tk.LEFT, padx=(0, 16))
+        
+        ttk.Radiobutton(
+            mode_options_frame,
+            text="Custom Region",
+            variable=self.mode_var,
+            value="custom",
+            command=self.on_mode_change
+        ).pack(side=tk.LEFT, padx=(0, 16))
+
+        ttk.Radiobutton(
+            mode_options_frame,
+            text="All Screens",
+            variable=self.mode_var,
+            value="monitors",
+            command=self.on_mode_change
+        ).pack(side=tk.LEFT)
+        
+        # Dynamic selection frame
+        self.selection_frame = ttk.Frame(card, style="Card.TFrame")
+        self.selection_frame.pack(fill="x", pady=(8, 0))
+        
+        # Monitor selection
+        self.monitor_row = ttk.Frame(self.selection_frame, style="Card.TFrame")
+        ttk.Label(self.monitor_row, text="Select monitor:").pack(side=tk.LEFT)
+        self.screen_var = tk.StringVar()
+        self.screen_combo = ttk.Combobox(
+            self.monitor_row,
+            textvariable=self.screen_var,
+            state="readonly",
+            width=25,
+            postcommand=lambda: self.inventory.refresh(),
+        )
+        self.screen_var.set("Detecting screens…")
+        self.screen_combo.pack(side=tk.LEFT, padx=(8, 0))
+        
+        # Window selection
+        self.window_row = ttk.Frame(self.selection_frame, style="Card.TFrame")
+        ttk.Label(self.window_row, text="Select window:").pack(side=tk.LEFT)
+        self.window_var = tk.StringVar()
+        self.window_combo = ttk.Combobox(
+            self.window_row,
+            textvariable=self.window_var,
+            state="readonly",
+            width=25,
+            postcommand=lambda: self.inventory.refresh(),
+        )
+        self.window_combo.pack(side=tk.LEFT, padx=(8, 0))
+        
+        # Custom region button
+        self.custom_row = ttk.Frame(self.selection_frame, style="Card.TFrame")
+        self.select_region_btn = ttk.Button(
+            self.custom_row,
+            text="Select Region",
+            command=self.select_custom_region,
+            width=20
+        )
+        self.select_region_btn.pack(side=tk.LEFT)
+        self.region_label = ttk.Label(self.custom_row, text="", style="Subtitle.TLabel")
+        self.region_label.pack(side=tk.LEFT, padx=(8, 0))
+
+        # All screens: one composited picture or one video track per screen
+        self.layout_row = ttk.Frame(self.selection_frame, style="Card.TFrame")
+        ttk.Label(self.layout_row, text="Layout:").pack(side=tk.LEFT)
+        self.layout_var = tk.StringVar()
+        self.layout_combo = ttk.Combobox(
+            self.layout_row,
+            textvariable=self.layout_var,
+            state="readonly",
+            width=25,
+        )
+        self.layout_combo["values"] = ["Side by side", "Separate video tracks"]
+        self.layout_combo.current(0)
+        self.layout_combo.pack(side=tk.LEFT, padx=(8, 0))
+        self.layout_combo.bind("<<ComboboxSelected>>", lambda event: self.update_segments_option())
+        
+        # Show initial mode
+        self.on_mode_change()
+
+        # Encoder profile: trade CPU for quality
+        profile_row = ttk.Frame(card, style="Card.TFrame")
+        profile_row.pack(fill="x", pady=(8, 0))
+        ttk.Label(profile_row, text="Encoding:").pack(side=tk.LEFT)
+        self.profile_var = tk.StringVar(value=self.profile.name)
+        self.profile_combo = ttk.Combobox(
+            profile_row,
+            textvariable=self.profile_var,
+            state="readonly",
+            width=25,
+        )
+        self.profile_combo["values"] = list(dict.fromkeys([self.profile.name, *ENCODER_PROFILES]))
+        self.profile_combo.pack(side=tk.LEFT, padx=(8, 0))
+
+        # Save each distinct slide of a shared deck as a PNG
+        self.slides_var = tk.BooleanVar(value=False)
+        self.slides_check = ttk.Checkbutton(profile_row, text="Save slides", variable=self.slides_var)
+        self.slides_check.pack(side=tk.LEFT, padx=(12, 0))
+        # ...and read their text into a search index
+        self.text_var = tk.BooleanVar(value=False)
+        self.text_check = ttk.Checkbutton(profile_row, text="Index text", variable=self.text_var)
+        self.text_check.pack(side=tk.LEFT, padx=(8, 0))
+        # Record per-stage timings, for tracking down choppy video
+        self.trace_var = tk.BooleanVar(value=self.trace)
+        self.trace_check = ttk.Checkbutton(profile_row, text="Profile", variable=self.trace_var)
+        self.trace_check.pack(side=tk.LEFT, padx=(8, 0))
+        # Write in chunks that are finalized as they fill, so a crash loses at most one
+        self.segments_var = tk.BooleanVar(value=self.segments)
+        self.segments_check = ttk.Checkbutton(profile_row, text="Crash-safe", variable=self.segments_var)
+        self.segments_check.pack(side=tk.LEFT, padx=(8, 0))
+        self.update_segments_option()
+
+        # A second audio input, e.g. a loopback / monitor device for the other side of a call
+        audio_row = ttk.Frame(card, style="Card.TFrame")
+        audio_row.pack(fill="x", pady=(8, 0))
+        ttk.Label(audio_row, text="Also record:").pack(side=tk.LEFT)
+        self.audio_devices = []
+        self.audio_var = tk.StringVar(value=NO_EXTRA_AUDIO)
+        self.audio_combo = ttk.Combobox(
+            audio_row,
+            textvariable=self.audio_var,
+            state="readonly",
+            width=40,
+            # Listed when opened, so sounddevice is not imported before the window shows
+            postcommand=self.refresh_audio_devices,
+        )
+        self.audio_combo["values"] = [NO_EXTRA_AUDIO]
+        self.audio_combo.pack(side=tk.LEFT, padx=(8, 0))
+        self.audio_tracks_var = tk.BooleanVar(value=False)
+        self.audio_tracks_check = ttk.Checkbutton(audio_row, text="Separate tracks", variable=self.audio_tracks_var)
+        self.audio_tracks_check.pack(side=tk.LEFT, padx=(12, 0))
+
+        # Timer Status Panel (prominent display like Capture Status)
+        timer_frame = tk.Frame(card, bg=self.dark_card, relief="flat")
+        timer_frame.pack(fill="x", pady=(16, 12), padx=0)
+        
+        # Left side: Recording indicator + Timer
+        timer_left = tk.Frame(timer_frame, bg=self.dark_card)
+        timer_left.pack(side=tk.LEFT, fill="x", expand=True, padx=12, pady=12)
+        
+        # Recording indicator circle (hidden initially)
+        self.recording_indicator = tk.Canvas(timer_left, width=16, height=16, bg=self.dark_card, highlightthickness=0)
+        self.recording_indicator.pack(side=tk.LEFT, padx=(0, 12))
+        self.indicator_circle = self.recording_indicator.create_oval(4, 4, 12, 12, fill="#666666", outline="")
+        
+        # Timer display (large and prominent)
+        self.timer_label = tk.Label(
+            timer_left,
+            text="0:00:00",
+            bg=self.dark_card,
+            fg="#ffffff",
+            font=("Segoe UI", 28, "bold"),
+            anchor="w"
+        )
+        self.timer_label.pack(side=tk.LEFT, fill="x", expand=True)
+        
+        # Right side: Pause and Stop buttons (disabled initially)
+        timer_right = tk.Frame(timer_frame, bg=self.dark_card)
+        timer_right.pack(side=tk.RIGHT, padx=(0, 12), pady=8)
+
+        self.pause_button = tk.Button(
+            timer_right,
+            text="⏸",
+            command=self.toggle_pause,
+            bg="#4b5563",
+            fg="white",
+            font=("Segoe UI", 14),
+            relief="flat",
+            bd=0,
+            width=3,
+            height=1,
+            cursor="hand2",
+            state="disabled"
+        )
+        self.pause_button.pack(side=tk.LEFT, padx=(0, 6))
+
+        self.stop_button = tk.Button(
+            timer_right,
+            text="⏹",
+            command=self.toggle_recording,
+            bg=self.accent_red,
+            fg="white",
+            font=("Segoe UI", 14),
+            relief="flat",
+            bd=0,
+            width=3,
+            height=1,
+            cursor="hand2",
+            state="disabled"
+        )
+        self.stop_button.pack(side=tk.LEFT)
+
+        # Start/Stop button
+        btn_frame = ttk.Frame(card, style="Card.TFrame")
+        btn_frame.pack(fill="x", pady=(8, 6))
+
+        self.control_button = ttk.Button(
+            btn_frame,
+            text="Start recording",
+            style="Primary.TButton",
+            command=self.toggle_recording,
+            width=22,
+        )
+        self.control_button.pack(pady=2)
+
+        # Status label
+        self.status_label = ttk.Label(card, text="Ready to record", style="Subtitle.TLabel")
+        self.status_label.pack(anchor="w", pady=(6, 0))
+
+        # Background finalization jobs (one line per recording)
+        self.jobs_label = ttk.Label(card, text="", style="Subtitle.TLabel", justify="left")
+        self.jobs_label.pack(anchor="w", pady=(2, 0))
+
+        # Info label
+        info_text = "Tip: For best results, close heavy apps you don't need while recording."
+        ttk.Label(card, text=info_text, style="Subtitle.TLabel").pack(anchor="w", pady=(4, 0))
+
+        if not MSS_AVAILABLE:
+            mss_text = "Multi-screen recording: install 'mss' →  py -m pip install mss"
+            ttk.Label(card, text=mss_text, style="Subtitle.TLabel", foreground="#d97706").pack(
+                anchor="w", pady=(2, 0)
+            )
+        
+    def on_mode_change(self):
+        """Update UI based on selected recording mode."""
+        mode = self.mode_var.get()
+        
+        # Hide all selection rows
+        self.monitor_row.pack_forget()
+        self.window_row.pack_forget()
+        self.custom_row.pack_forget()
+        self.layout_row.pack_forget()
+        
+        # Show appropriate selection
+        if mode == "monitor":
+            self.monitor_row.pack(fill="x", pady=(4, 0))
+        elif mode == "window":
+            if not WINDOW_DETECTION_AVAILABLE:
+                messagebox.showwarning("Window Detection", "Install 'pygetwindow' for window selection:\npy -m pip install pygetwindow")
+                self.mode_var.set("monitor")
+                self.on_mode_change()
+                return
+            if not self.windows:
+                messagebox.showwarning("No Windows", "No windows detected. Please open some applications.")
+                self.mode_var.set("monitor")
+                self.on_mode_change()
+                return
+            self.window_row.pack(fill="x", pady=(4, 0))
+        elif mode == "custom":
+            self.custom_row.pack(fill="x", pady=(4, 0))
+        elif mode == "monitors":
+            self.layout_row.pack(fill="x", pady=(4, 0))
+        self.update_segments_option()
+
+    def separate_tracks(self) -> bool:
+        return self.mode_var.get() == "monitors" and self.layout_combo.current() == 1
+
+    def update_segments_option(self):
+        """Separate video tracks are not recorded in chunks: no "Crash-safe" for them."""
+        if not hasattr(self, "segments_check"):
+            # First mode update, before the option row is built
+            return
+        self.segments_check.config(state="disabled" if self.separate_tracks() else "normal")
+    
+    def on_inventory_change(self, kind, items):
+        """Inventory service thread: hand the new list to the Tk thread."""
+        try:
+            self.root.after(0, self.apply_inventory, kind, items)
+        except RuntimeError:
+            # The main loop has ended
+            pass
+
+    def apply_inventory(self, kind, items):
+        """Swap in a changed monitor or window list, keeping the selected entry if it is still there."""
+        if kind == "monitors":
+            combo, key = self.screen_combo, _monitor_key
+            previous = self.monitors
+            self.monitors = items
+            options = [f"Screen {m['index'] + 1}  ({m['width']}×{m['height']})" for m in items]
+        else:
+            combo, key = self.window_combo, _window_key
+            previous = self.windows
+            self.windows = items[:50]  # Limit to 50 windows
+            options = [f"{w['title'][:40]} ({w['width']}×{w['height']})" for w in self.windows]
+        selected = combo.current()
+        selected_key = key(previous[selected]) if 0 <= selected < len(previous) else None
+        combo["values"] = options
+        keys = [key(item) for item in items[:len(options)]]
+        if selected_key in keys:
+            combo.current(keys.index(selected_key))
+        elif options:
+            combo.current(0)
+        else:
+            combo.set("")
+
+    def select_custom_region(self):
+        """Open region selector overlay."""
+        self.root.withdraw()  # Hide main window
+        region = select_region_interactively()
+        self.root.deiconify()  # Show main window again
+        
+        if region:
+            self.selected_region = region
+            self.region_label.config(
+                text=f"Region: {region['width']}×{region['height']} at ({region['left']}, {region['top']})"
+            )
+        else:
+            self.selected_region = None
+            self.region_label.config(text="")
+    
+    def toggle_recording(self):
+        if not self.is_recording:
+            self.start_recording()
+        else:
+            self.stop_recording()
+    
+    def start_recording(self):
+        mode = self.mode_var.get()
+        region_info = None
+        
+        if mode == "monitor":
+            if not self.monitors:
+                messagebox.showerror("Error", "No monitors detected!")
+                return
+            selected_index = self.screen_combo.current()
+            if selected_index < 0:
+                selected_index = 0
+            monitor = self.monitors[selected_index]
+            region_info = {
+                'type': 'monitor',
+                'left': monitor['left'],
+                'top': monitor['top'],
+                'width': monitor['width'],
+                'height': monitor['height']
+            }
+            status_text = f"Recording screen {monitor['index'] + 1}…"
+            
+        elif mode == "window":
+            if not self.windows:
+                messagebox.showerror("Error", "No windows available!")
+                return
+            selected_index = self.window_combo.current()
+            if selected_index < 0:
+                selected_index = 0
+            window = self.windows[selected_index]
+            region_info = {
+                'type': 'window',
+                'left': window['left'],
+                'top': window['top'],
+                'width': window['width'],
+                'height': window['height'],
+                'window': window.get('window'),
+            }
+            status_text = f"Recording window: {window['title'][:30]}…"
+            
+        elif mode == "custom":
+            if not self.selected_region:
+                messagebox.showwarning("No Region", "Please select a custom region first.")
+                return
+            region_info = {
+                'type': 'custom',
+                'left': self.selected_region['left'],
+                'top': self.selected_region['top'],
+                'width': self.selected_region['width'],
+                'height': self.selected_region['height']
+            }
+            status_text = f"Recording custom region ({region_info['width']}×{region_info['height']})…"
+
+        elif mode == "monitors":
+            if not self.monitors:
+                messagebox.showerror("Error", "No monitors detected!")
+                return
+            region_info = {
+                'type': 'monitors',
+                'monitors': [
+                    {'left': m['left'], 'top': m['top'], 'width': m['width'], 'height': m['height']}
+                    for m in self.monitors
+                ],
+                'layout': 'tracks' if self.layout_combo.current() == 1 else 'side-by-side',
+            }
+            status_text = f"Recording {len(self.monitors)} screens…"
+        
+        if self.text_var.get() and not tesseract_available():
+            messagebox.showwarning("Screen Text", "Install 'pytesseract' and Tesseract OCR to index screen text:\n"
+                                   "py -m pip install pytesseract")
+            self.text_var.set(False)
+
+        # Generate filenames
+        output_dir = ensure_output_dir()
+        base_name = datetime.datetime.now().strftime("Video_%Y-%m-%d_%H-%M-%S")
+        video_path = os.path.join(output_dir, f"{base_name}.avi")
+        audio_path = os.path.join(output_dir, f"{base_name}.wav")
+        final_mp4_path = os.path.join(output_dir, f"{base_name}.mp4")
+        
+        # Update UI
+        self.is_recording = True
+        self.record_start_time = time.time()
+        self.paused_since = None
+        self.paused_seconds = 0.0
+        self.start_timer()
+        # Show recording indicator and stop button
+        self.recording_indicator.itemconfig(self.indicator_circle, fill=self.accent_red)
+        self.stop_button.config(state="normal")
+        self.control_button.config(text="Stop recording", style="Danger.TButton")
+        self.status_label.config(text=status_text)
+        self.screen_combo.config(state="disabled")
+        self.window_combo.config(state="disabled")
+        self.layout_combo.config(state="disabled")
+        self.profile_combo.config(state="disabled")
+        self.slides_check.config(state="disabled")
+        self.text_check.config(state="disabled")
+        self.trace_check.config(state="disabled")
+        self.segments_check.config(state="disabled")
+        self.audio_combo.config(state="disabled")
+        self.audio_tracks_check.config(state="disabled")
+        self.select_region_btn.config(state="disabled")
+        
+        # Start recording in separate thread
+        self.stop_event = threading.Event()
+        self.recording_thread = threading.Thread(
+            target=self.run_recording,
+            args=(self.stop_event, video_path, audio_path, final_mp4_path, region_info),
+            daemon=True
+        )
+        self.recording_thread.start()
+
+    def refresh_audio_devices(self):
+        self.audio_devices = get_input_devices()
+        self.audio_combo["values"] = [NO_EXTRA_AUDIO, *(f"{index}: {name}" for index, name in self.audio_devices)]
+
+    def selected_audio_sources(self):
+        """The microphone plus the device chosen under "Also record", or None for the microphone alone."""
+        index = self.audio_combo.current()
+        if index <= 0:
+            return None
+        device, name = self.audio_devices[index - 1]
+        return [AudioSource(name="microphone"), AudioSource(device, name=name)]
+
+    def run_recording(self, stop_event, video_path, audio_path, final_mp4_path, region_info):
+        """Recording thread: capture, then hand the final merge to the background finalizer."""
+        if self.warm_up_thread.is_alive():
+            self.warm_up_thread.join()
+        if self.finalizer is None:
+            self.finalizer = FinalizeQueue(on_update=lambda job: self.root.after(0, self.update_jobs))
+            if self.metrics is not None:
+                self.metrics.add_collector(self.finalizer.collect_metrics)
+        try:
+            profile = self.selected_profile()
+            recorder = Recorder(final_mp4_path, source=source_for_region(region_info, fps=profile.fps),
+                                profile=profile, sink=self.finalizer, status_callback=self.update_status,
+                                stop_event=stop_event, video_path=video_path, audio_path=audio_path,
+                                slides=self.slides_var.get(), ocr=self.text_var.get(),
+                                metrics=self.metrics, trace=self.trace_var.get(),
+                                cprofile=self.cprofile and self.trace_var.get(),
+                                segment_seconds=(self.segment_seconds
+                                                 if self.segments_var.get() and not self.separate_tracks() else None),
+                                audio_sources=self.selected_audio_sources(),
+                                audio_mode="tracks" if self.audio_tracks_var.get() else "mix")
+            recorder.start()
+            self.recorder = recorder
+            self.root.after(0, lambda: self.pause_button.config(state="normal"))
+            recorder.wait()
+        finally:
+            # Capture is over; a new recording can start while the merge runs
+            self.recorder = None
+            self.root.after(0, self.reset_ui)
+
+    def selected_profile(self):
+        """The EncoderProfile picked in the combobox (the command-line one keeps its overrides)."""
+        name = self.profile_var.get()
+        return self.profile if name == self.profile.name else ENCODER_PROFILES[name]
+
+    def update_jobs(self):
+        """Show the running background finalizations and the most recent finished ones."""
+        jobs = list(self.finalizer.jobs.values())
+        shown = [job for job in jobs if not job.finished] + [job for job in jobs if job.finished][-3:]
+        self.jobs_label.config(text="\n".join(str(job) for job in sorted(shown, key=lambda job: job.id)))
+    
+    def toggle_pause(self):
+        """Pause or resume the running recording; it stays one file either way."""
+        recorder = self.recorder
+        if recorder is None:
+            return
+        if recorder.state == "paused":
+            recorder.resume()
+            self.paused_seconds += time.time() - self.paused_since
+            self.paused_since = None
+            self.pause_button.config(text="⏸")
+            self.recording_indicator.itemconfig(self.indicator_circle, fill=self.accent_red)
+            self.start_timer()
+        elif recorder.state == "recording":
+            recorder.pause()
+            self.paused_since = time.time()
+            self.pause_button.config(text="▶")
+            self.recording_indicator.itemconfig(self.indicator_circle, fill="#d97706")
+            # The timer holds while paused
+            if self.timer_job is not None:
+                self.root.after_cancel(self.timer_job)
+                self.timer_job = None
+
+    def stop_recording(self):
+        if self.stop_event:
+            self.stop_event.set()
+            self.status_label.config(text="Stopping recording…")
+            self.control_button.config(state="disabled")
+            self.pause_button.config(state="disabled")
+            # Stop timer; final update will happen in reset_ui
+            if self.timer_job is not None:
+                self.root.after_cancel(self.timer_job)
+                self.timer_job = None
+    
+    def update_status(self, message):
+        """Update status label from recording thread."""
+        self.root.after(0, lambda: self.status_label.config(text=message, fg="blue" if "Success" in message else "red" if "Error" in message or "Failed" in message else "gray"))
+        
+        if "Success" in message or "Failed" in message or "Error" in message:
+            # Recording finished, reset UI
+            self.root.after(0, self.reset_ui)
+    
+    def reset_ui(self):
+        """Reset UI to initial state."""
+        self.is_recording = False
+        # Hide recording indicator and stop button
+        self.recording_indicator.itemconfig(self.indicator_circle, fill="#666666")
+        self.stop_button.config(state="disabled")
+        self.pause_button.config(text="⏸", state="disabled")
+        self.control_button.config(text="Start recording", style="Primary.TButton", state="normal")
+        self.screen_combo.config(state="readonly")
+        self.window_combo.config(state="readonly")
+        self.layout_combo.config(state="readonly")
+        self.profile_combo.config(state="readonly")
+        self.slides_check.config(state="normal")
+        self.text_check.config(state="normal")
+        self.trace_check.config(state="normal")
+        self.update_segments_option()
+        self.audio_combo.config(state="readonly")
+        self.audio_tracks_check.config(state="normal")
+        self.select_region_btn.config(state="normal")
+        self.record_start_time = None
+        self.paused_since = None
+        self.paused_seconds = 0.0
+        self.timer_label.config(text="0:00:00")
+        if "Success" in self.status_label.cget("text"):
+            self.status_label.config(text="Recording saved successfully!")
+        elif self.finalizer is not None and self.finalizer.active():
+            self.status_label.config(text="Ready to record (finishing earlier recordings in the background)")
+        else:
+            self.status_label.config(text="Ready to record")
+
+    def start_timer(self):
+        """Start or continue updating the elapsed time label."""
+        if not self.is_recording or self.record_start_time is None or self.paused_since is not None:
+            return
+
+        # Recorded time: pauses do not count
+        elapsed = int(time.time() - self.record_start_time - self.paused_seconds)
+        hours = elapsed // 3600
+        minutes = (elapsed % 3600) // 60
+        seconds = elapsed % 60
+        # Format: 0:00:00 (single digit hours, like in the image)
+        self.timer_label.config(text=f"{hours}:{minutes:02d}:{seconds:02d}")
+
+        # Schedule next update
+        self.timer_job = self.root.after(1000, self.start_timer)
+
+
+def launch_gui(profile=None, metrics=None, trace: bool = False, cprofile: bool = False, segment_seconds: float = None):
+    """Launch the GUI application."""
+    root = tk.Tk()
+    app = ScreenRecorderGUI(root, profile, metrics, trace, cprofile, segment_seconds)
+    root.mainloop()
+    app.inventory.on_change = None
+    app.inventory.stop()
+    if app.finalizer is not None:
+        # The window is gone; nothing left to update
+        app.finalizer.on_update = None
+        if app.finalizer.active():
+            print("Waiting for background finalization to finish...")
+        app.finalizer.shutdown(wait=True)
@@ -0,0 +1,129 @@
+"""Monitors and windows that can be recorded, and a background service keeping that list current."""
+import threading
+
+from .backends import gw, mss, MSS_AVAILABLE, pyautogui, WINDOW_DETECTION_AVAILABLE
+
+
+def get_available_monitors():
+    """Get list of available monitors."""
+    monitors = []
+    if MSS_AVAILABLE:
+        with mss.mss() as sct:
+            for i, monitor in enumerate(sct.monitors):
+                if i == 0:
+                    # Monitor 0 is "All monitors", skip it
+                    continue
+                monitors.append({
+                    'index': i - 1,  # Adjust index (0-based for display)
+                    'width': monitor['width'],
+                    'height': monitor['height'],
+                    'left': monitor['left'],
+                    'top': monitor['top']
+                })
+    else:
+        # Fallback: single monitor
+        screen_size = pyautogui.size()
+        monitors.append({
+            'index': 0,
+            'width': screen_size.width,
+            'height': screen_size.height,
+            'left': 0,
+            'top': 0
+        })
+    return monitors
+
+
+def get_available_windows():
+    """Get list of available application windows."""
+    windows = []
+    if WINDOW_DETECTION_AVAILABLE:
+        try:
+            all_windows = gw.getAllWindows()
+            for win in all_windows:
+                if win.title and win.visible and win.width > 0 and win.height > 0:
+                    windows.append({
+                        'title': win.title,
+                        'left': win.left,
+                        'top': win.top,
+                        'width': win.width,
+                        'height': win.height,
+                        # Live handle, so a recording can follow the window (see WindowTracker)
+                        'window': win,
+                    })
+        except Exception:
+            pass
+    return windows
+
+
+def _monitor_key(monitor):
+    return (monitor['left'], monitor['top'], monitor['width'], monitor['height'])
+
+
+def _window_key(window):
+    return (window['title'], window['left'], window['top'], window['width'], window['height'])
+
+
+class InventoryService:
+    """
+    The monitor and window lists, kept current by a background thread so the Tk thread
+    never waits on mss or a walk of every window.
+
+    Windows are re-listed every interval seconds and monitors every monitor_every-th
+    pass (they rarely change); refresh() asks for an immediate pass over both, e.g.
+    when a combobox is opened, so a monitor plugged in just now shows up. When a list
+    changes, on_change(kind, items) is called from the service thread, with kind
+    "monitors" or "windows".
+    """
+
+    def __init__(self, on_change=None, interval: float = 2.0, monitor_every: int = 5, windows: bool = True):
+        self.on_change = on_change
+        self.interval = interval
+        self.monitor_every = monitor_every
+        self.include_windows = windows
+        self.monitors = []
+        self.windows = []
+        self.ready = threading.Event()
+        self._wake = threading.Event()
+        self._relist_monitors = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def refresh(self):
+        self._relist_monitors = True
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        passes = 0
+        while not self._stop.is_set():
+            if passes % self.monitor_every == 0 or self._relist_monitors:
+                # Cleared first: a refresh() during the listing gets a pass of its own
+                self._relist_monitors = False
+                self._update("monitors", get_available_monitors, _monitor_key)
+            if self.include_windows:
+                self._update("windows", get_available_windows, _window_key)
+            self.ready.set()
+            passes += 1
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _update(self, kind: str, query, key):
+        try:
+            items = query()
+        except Exception as e:
+            print(f"Could not list {kind}: {e}")
+            return
+        if [key(item) for item in items] == [key(item) for item in getattr(self, kind)]:
+            return
+        setattr(self, kind, items)
+        if self.on_change is not None:
+            self.on_change(kind, items)
@@ -0,0 +1,206 @@
+"""
+Live metrics of recordings and finalizations: a registry the Recorder and FinalizeQueue
+report into, exported as a periodic JSON file and a localhost Prometheus endpoint.
+"""
+import datetime
+import http.server
+import json
+import os
+import threading
+import time
+
+# Every metric: (Prometheus type, help text)
+METRICS = {
+    "meetingrecorder_recording": ("gauge", "1 while a recording is running or paused"),
+    "meetingrecorder_paused": ("gauge", "1 while the recording is paused"),
+    "meetingrecorder_recorded_seconds": ("gauge", "Seconds of video written so far"),
+    "meetingrecorder_frames_total": ("counter", "Frames handled by a pipeline stage"),
+    "meetingrecorder_stage_fps": ("gauge", "Average frames per second of a pipeline stage since it started"),
+    "meetingrecorder_stage_latency_ms": ("gauge", "Per-frame time of a pipeline stage over its recent frames"),
+    "meetingrecorder_queue_depth": ("gauge", "Frames waiting between two pipeline stages"),
+    "meetingrecorder_queue_capacity": ("gauge", "Capacity of the queue between two pipeline stages"),
+    "meetingrecorder_frames_dropped_total": ("counter", "Frames lost to a full queue or a missed capture tick"),
+    "meetingrecorder_frames_duplicated_total": ("counter", "Frames repeated to keep the nominal frame rate"),
+    "meetingrecorder_audio_seconds": ("gauge", "Seconds of audio written so far"),
+    "meetingrecorder_audio_input_overflows_total": ("counter", "Input overflows reported by the audio devices"),
+    "meetingrecorder_audio_input_underflows_total": ("counter", "Input underflows reported by the audio devices"),
+    "meetingrecorder_audio_lost_frames_total": ("counter", "Audio frames lost to a full buffer before reaching the disk"),
+    "meetingrecorder_bytes_written": ("gauge", "Bytes on disk of the recording's files"),
+    "meetingrecorder_finalize_jobs": ("gauge", "Background finalizations by state"),
+    "meetingrecorder_finalize_progress": ("gauge", "Progress (0-1) of a running finalization, by final file name"),
+}
+
+
+def _escape(value) -> str:
+    """A label value as the Prometheus text format wants it: backslash, quote and newline escaped."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _series(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{pairs}}}"
+
+
+class MetricsRegistry:
+    """
+    Collects samples on demand from the registered collectors: functions returning
+    (name, labels, value) tuples, name one of METRICS. Nothing is computed between
+    collections, so an unused registry costs the recording nothing.
+    """
+
+    def __init__(self):
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self):
+        """All current samples as (name, labels, value) tuples."""
+        with self._lock:
+            collectors = list(self._collectors)
+        samples = []
+        for collector in collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                # A collector racing its recorder's shutdown skips one round
+                print(f"Metrics collector failed: {e}")
+        return samples
+
+    def prometheus_text(self) -> str:
+        """The samples in the Prometheus text exposition format."""
+        by_name = {}
+        for name, labels, value in self.collect():
+            by_name.setdefault(name, []).append((labels, value))
+        lines = []
+        for name, samples in by_name.items():
+            kind, help_text = METRICS.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{_series(name, labels)} {value:g}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+class MetricsFileWriter:
+    """
+    Writes the registry's samples to path as JSON every interval seconds, replacing the
+    file atomically so readers never see half of it. Counters also get a per-second
+    rate over the last interval ("rates").
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 5.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._previous = {}
+        self._previous_time = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        now = time.monotonic()
+        values, rates = {}, {}
+        for name, labels, value in self.registry.collect():
+            series = _series(name, labels)
+            values[series] = value
+            if METRICS.get(name, ("",))[0] == "counter" and series in self._previous:
+                rates[series] = round((value - self._previous[series]) / (now - self._previous_time), 3)
+        self._previous, self._previous_time = values, now
+        report = {"time": datetime.datetime.now().isoformat(timespec="seconds"), "metrics": values, "rates": rates}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(report, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+
+class MetricsServer:
+    """Serves the registry at http://host:port/metrics in the Prometheus text format (localhost only by default)."""
+
+    def __init__(self, registry: MetricsRegistry, port: int = 9464, host: str = "127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        # Port 0 picks a free one
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def start_metrics(metrics_file: str = None, metrics_port: int = None, interval: float = 5.0):
+    """
+    A MetricsRegistry with the exporters asked for already running, and a function that
+    stops them (writing the file one last time); (None, None) if neither was asked for.
+    """
+    if metrics_file is None and metrics_port is None:
+        return None, None
+    registry = MetricsRegistry()
+    exporters = []
+    if metrics_file is not None:
+        exporters.append(MetricsFileWriter(registry, metrics_file, interval))
+    if metrics_port is not None:
+        exporters.append(MetricsServer(registry, metrics_port))
+    for exporter in exporters:
+        exporter.start()
+        if isinstance(exporter, MetricsServer):
+            print(f"Metrics served at http://{exporter.host}:{exporter.port}/metrics")
+        else:
+            print(f"Metrics written to {exporter.path} every {interval:g} s")
+
+    def stop():
+        for exporter in exporters:
+            exporter.stop()
+
+    return registry, stop
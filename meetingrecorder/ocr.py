@@ -0,0 +1,143 @@
+"""Searchable screen text: OCR of the extracted slides on a process pool, into a per-recording SQLite FTS5 index."""
+import concurrent.futures
+import functools
+import importlib.util
+import multiprocessing
+import os
+import sqlite3
+import threading
+
+
+@functools.lru_cache(maxsize=None)
+def tesseract_available() -> bool:
+    """Whether pytesseract and the tesseract program it drives are both installed."""
+    if importlib.util.find_spec("pytesseract") is None:
+        return False
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def tesseract_text(path: str, lang: str = "eng") -> str:
+    """The default OCR engine: the text tesseract reads in the image at path."""
+    import pytesseract
+    return pytesseract.image_to_string(path, lang=lang)
+
+
+def _lower_priority():
+    """Worker initializer: OCR gives way to capture and encoding for the CPU."""
+    if hasattr(os, "nice"):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+
+class TextIndex:
+    """
+    A recording's full-text index (SQLite FTS5): the text of each slide, with the slide
+    number, its PNG and the second of video it first appeared at.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS screen_text "
+                         "USING fts5(text, slide UNINDEXED, time UNINDEXED, file UNINDEXED)")
+
+    def add(self, slide: int, seconds: float, file: str, text: str):
+        with self._lock:
+            self._db.execute("INSERT INTO screen_text VALUES (?, ?, ?, ?)", (text, slide, seconds, file))
+            self._db.commit()
+
+    def search(self, query: str, limit: int = 20):
+        """(time, slide, file, snippet) of the slides matching an FTS5 query, best match first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT time, slide, file, snippet(screen_text, 0, '[', ']', '…', 10) FROM screen_text "
+                "WHERE screen_text MATCH ? ORDER BY rank LIMIT ?", (query, limit)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def search_text(index_path: str, query: str, limit: int = 20):
+    """Search a recording's text index (see TextIndex.search)."""
+    index = TextIndex(index_path)
+    try:
+        return index.search(query, limit)
+    finally:
+        index.close()
+
+
+class ScreenTextIndexer:
+    """
+    Reads the text of each slide as SlideExtractor saves it (pass submit as its
+    on_slide) and adds it to a TextIndex at index_path. Only distinct slides are read,
+    so the cost follows the number of different screens, not the length of the
+    recording. OCR runs on a process pool of max_workers at low priority, off the
+    capture path; threads are used where processes cannot be started.
+
+    engine(path, lang) -> text defaults to tesseract_text; it is sent to the worker
+    processes, so it has to be a module-level function.
+    """
+
+    def __init__(self, index_path: str, lang: str = "eng", max_workers: int = 1, engine=tesseract_text,
+                 use_processes: bool = True):
+        self.index = TextIndex(index_path)
+        self.lang = lang
+        self.max_workers = max_workers
+        self.engine = engine
+        self.use_processes = use_processes
+        self.submitted = 0
+        self.indexed = 0
+        self.failed = 0
+        self._pool = None
+
+    def _start(self):
+        # Started with the first slide: recordings without any never pay for the pool
+        if self.use_processes:
+            try:
+                # Spawned, not forked: a forked worker would hold the recording's ffmpeg pipes
+                # open, and ffmpeg would never see the end of its input
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_lower_priority)
+            except (OSError, NotImplementedError) as e:
+                print(f"Warning: Could not start OCR processes, using threads: {e}")
+                self.use_processes = False
+        if not self.use_processes:
+            self._pool = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="ocr")
+
+    def submit(self, slide):
+        """Queue a Slide whose PNG is on disk."""
+        if self._pool is None:
+            self._start()
+        self.submitted += 1
+        future = self._pool.submit(self.engine, slide.path, self.lang)
+        future.add_done_callback(functools.partial(self._done, slide))
+
+    def _done(self, slide, future):
+        try:
+            text = future.result().strip()
+        except Exception as e:
+            self.failed += 1
+            print(f"Could not read the text of {slide.path}: {e}")
+            return
+        if text:
+            self.index.add(slide.number, round(slide.seconds, 2), os.path.basename(slide.path), text)
+        self.indexed += 1
+
+    def close(self):
+        """Wait for the slides still being read, then close the index."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self.index.close()
+
+    def summary(self) -> str:
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"screen text: {self.indexed} of {self.submitted} slides read{failed}, index saved as {self.index.path}"
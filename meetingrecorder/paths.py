@@ -0,0 +1,51 @@
+"""Where a recording's files go and how the sidecar / chunk paths are derived from it."""
+import os
+
+
+def ensure_output_dir(path: str = "recordings") -> str:
+    """Create output directory if it does not exist and return the path."""
+    if not os.path.exists(path):
+        os.makedirs(path)
+    return path
+
+
+def audio_track_paths(audio_path: str, count: int):
+    """WAV paths for separate-track recording: audio_path for the first source, numbered siblings for the rest."""
+    stem, ext = os.path.splitext(audio_path)
+    return [audio_path] + [f"{stem}.track{i + 1}{ext}" for i in range(1, count)]
+
+
+def segment_path(path: str, index: int) -> str:
+    """Path of chunk `index` of a segmented recording: name.ext -> name.part003.ext"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.part{index:03d}{ext}"
+
+
+def timestamps_path_for(video_path: str) -> str:
+    """Return the per-frame timestamp sidecar path for a recording."""
+    return os.path.splitext(video_path)[0] + ".timestamps.csv"
+
+
+def voice_index_path_for(video_path: str) -> str:
+    """Return the speech/silence index sidecar path for a recording."""
+    return os.path.splitext(video_path)[0] + ".speech.csv"
+
+
+def slides_folder_for(video_path: str) -> str:
+    """Return the folder a recording's extracted slides are saved in."""
+    return os.path.splitext(video_path)[0] + ".slides"
+
+
+def text_index_path_for(video_path: str) -> str:
+    """Return the full-text index (SQLite) of a recording's screen text."""
+    return os.path.splitext(video_path)[0] + ".text.sqlite"
+
+
+def trace_path_for(video_path: str) -> str:
+    """Return the profiling trace (Chrome trace JSON) of a recording."""
+    return os.path.splitext(video_path)[0] + ".trace.json"
+
+
+def profile_folder_for(video_path: str) -> str:
+    """Return the folder a recording's per-thread cProfile stats are saved in."""
+    return os.path.splitext(video_path)[0] + ".profile"
@@ -0,0 +1,679 @@
+"""The capture -> convert -> encode pipeline and the pacing, pooling and quality control around it."""
+import collections
+import csv
+import threading
+import time
+
+from .backends import cv2, load_recording_modules, np
+from .tracing import profiled
+
+
+# Nominal frame rate of recordings; captures are paced to this rate
+DEFAULT_FPS = 20.0
+
+
+class FrameRing:
+    """
+    Bounded ring queue joining two pipeline stages.
+    When the ring is full the oldest item is dropped, so the producer never blocks.
+    """
+
+    def __init__(self, capacity: int = 8, name: str = "ring"):
+        self.capacity = capacity
+        self.name = name
+        self.dropped = 0
+        self.max_depth = 0
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    def put(self, item):
+        """Append item. Returns the item that was dropped to make room, or None."""
+        dropped = None
+        with self._cond:
+            if len(self._items) >= self.capacity:
+                dropped = self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+        return dropped
+
+    def get(self, timeout: float = 0.1):
+        """Pop the oldest item, or return None if nothing arrived within timeout."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        """Signal that no more items will be put."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def drained(self) -> bool:
+        with self._cond:
+            return self._closed and not self._items
+
+
+class StageStats:
+    """Frame count and busy time of a single pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames = 0
+        self.busy = 0.0
+        self.started = None
+        self.finished = None
+        # Most recent per-frame times, for latency percentiles
+        self.samples = collections.deque(maxlen=10000)
+
+    def add(self, seconds: float):
+        self.frames += 1
+        self.busy += seconds
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Per-frame time in ms at percentile p (0-100) of the recent frames."""
+        if not self.samples:
+            return 0.0
+        return 1000.0 * float(np.percentile(self.samples, p))
+
+    def recent_percentile(self, p: float, count: int = 200) -> float:
+        """Like percentile(), over the last `count` frames only; safe to call while the stage runs."""
+        samples = list(self.samples)[-count:]
+        return 1000.0 * float(np.percentile(samples, p)) if samples else 0.0
+
+    @property
+    def fps(self) -> float:
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def ms_per_frame(self) -> float:
+        return 1000.0 * self.busy / self.frames if self.frames else 0.0
+
+    def __str__(self):
+        return f"{self.name}: {self.frames} frames, {self.fps:.1f} fps, {self.ms_per_frame:.1f} ms/frame"
+
+
+class FramePool:
+    """
+    Reusable output buffers for the convert stage, so a recording does not allocate
+    a fresh full-size frame for every conversion.
+    Buffers are reference counted: the same frame can sit in the ring several times
+    (unchanged screens) and be held as the encoder's "previous frame" for duplication.
+    The pool grows on demand if every buffer is in flight, and never shrinks.
+    """
+
+    def __init__(self, shape, size: int = 4):
+        self.shape = shape
+        self.allocated = size
+        self._free = collections.deque(np.empty(shape, dtype=np.uint8) for _ in range(size))
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Return a free buffer holding one reference."""
+        with self._lock:
+            buf = self._free.popleft() if self._free else None
+            if buf is None:
+                buf = np.empty(self.shape, dtype=np.uint8)
+                self.allocated += 1
+            self._refs[id(buf)] = 1
+        return buf
+
+    def retain(self, buf):
+        with self._lock:
+            if id(buf) in self._refs:
+                self._refs[id(buf)] += 1
+
+    def release(self, buf):
+        """Drop one reference; the buffer returns to the pool when none are left. Non-pool arrays are ignored."""
+        with self._lock:
+            refs = self._refs.get(id(buf))
+            if refs is None:
+                return
+            if refs > 1:
+                self._refs[id(buf)] = refs - 1
+            else:
+                del self._refs[id(buf)]
+                self._free.append(buf)
+
+
+class FrameScheduler:
+    """
+    Paces captures to a fixed frame rate against a monotonic clock.
+    wait() returns the (frame_index, seconds_since_start) of the tick to capture.
+    If a grab overran one or more ticks, the missed ticks are skipped rather than
+    captured late, so no CPU is spent on frames that would be thrown away.
+    Schedulers given the same `start` (a time.monotonic() value) share one clock, so
+    streams at different rates stay aligned; otherwise the clock starts at the first wait.
+    While paused, the clock stands still and wait() holds; resume() moves `start` on by
+    the pause, so timestamps carry on without a gap.
+    """
+
+    def __init__(self, fps: float = DEFAULT_FPS, start: float = None):
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self.start = start
+        self.next_index = 0
+        self.skipped = 0
+        self._waited = False
+        self._paused_at = None
+
+    def elapsed(self) -> float:
+        if self.start is None:
+            return 0.0
+        now = self._paused_at if self._paused_at is not None else time.monotonic()
+        return now - self.start
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def pause(self, now: float = None):
+        """Stop the clock at now (a time.monotonic() value; default: now) until resume()."""
+        if self._paused_at is None:
+            self._paused_at = time.monotonic() if now is None else now
+
+    def resume(self, now: float = None):
+        """Restart the clock where pause() stopped it."""
+        if self._paused_at is None:
+            return
+        now = time.monotonic() if now is None else now
+        if self.start is not None:
+            self.start += now - self._paused_at
+        self._paused_at = None
+
+    def current_index(self) -> int:
+        """Index of the tick the clock is currently in."""
+        return int(self.elapsed() * self.fps)
+
+    def wait(self, stop_event: threading.Event):
+        """Sleep until the next tick. Returns None if stop_event was set meanwhile."""
+        while self._paused_at is not None:
+            if stop_event.wait(0.05):
+                return None
+        if self.start is None:
+            self.start = time.monotonic()
+        if not self._waited:
+            # A shared clock may have started a little earlier; that is not a missed tick
+            self._waited = True
+            self.next_index = self.current_index()
+        delay = self.start + self.next_index * self.interval - time.monotonic()
+        if delay > 0 and stop_event.wait(delay):
+            return None
+        index = max(self.next_index, self.current_index())
+        self.skipped += index - self.next_index
+        self.next_index = index + 1
+        return index, self.elapsed()
+
+
+class FrameChangeDetector:
+    """
+    Tells whether a grabbed frame differs from the last frame that was converted.
+    Every precheck_rows-th row is compared first (a max-abs-difference, cv2.norm
+    NORM_INF), which catches nearly every real change for a small fraction of the cost;
+    only when those rows match is the whole frame compared, so the answer stays exact.
+    That full compare costs about as much as a BGRA->BGR conversion (more at 4K), so on
+    a still screen skipping the conversion roughly breaks even and the saving is in the
+    frames not handed down the pipeline again. It only pays where there is a real
+    conversion to skip: leave it off when convert is a free view (bgra_view).
+    The reference only advances on change, so slow drifts accumulate until they count.
+    """
+
+    def __init__(self, threshold: int = 0, precheck_rows: int = 16):
+        self.threshold = threshold
+        self.precheck_rows = precheck_rows
+        self._reference = None
+
+    def changed(self, raw) -> bool:
+        reference = self._reference
+        # Keep a reference to the grabbed buffer; mss allocates a new one per grab
+        self._reference = raw
+        if reference is None or reference.shape != raw.shape:
+            return True
+        step = self.precheck_rows
+        if cv2.norm(raw[step // 2::step], reference[step // 2::step], cv2.NORM_INF) > self.threshold:
+            return True
+        if cv2.norm(raw, reference, cv2.NORM_INF) > self.threshold:
+            return True
+        self._reference = reference
+        return False
+
+
+class AdaptiveQualityController:
+    """
+    Feedback loop that keeps the encoder ahead of capture on a loaded machine, so a
+    recording gets coarser instead of dropping frames and drifting from the audio.
+
+    The encode stage reports how long every out.write took and how deep the ring in
+    front of it is. Once per `interval`, quality steps down a level if the writer was
+    busy for more than `high` of the wall time, frames were dropped or ticks missed, or
+    the ring is half full. After `recover_seconds` below `low` with an empty ring it
+    steps back up.
+
+    Levels, best first: each of `scales` (output resolution, see `interpolation`) at the
+    full rate, then the smallest scale at 1/2, 1/3, ... of the capture rate
+    (`rate_divisors`; skipped ticks repeat the previous frame, so the video keeps its
+    nominal fps). Changes are kept in `changes` and can be written as a subtitle track.
+    """
+
+    def __init__(self, fps: float, scales=(1.0, 0.75, 0.5), rate_divisors=(1, 2, 3), interval: float = 1.0,
+                 recover_seconds: float = 5.0, high: float = 0.85, low: float = 0.4):
+        self.fps = fps
+        self.levels = [(scale, 1) for scale in scales] + [(scales[-1], divisor) for divisor in rate_divisors[1:]]
+        self.level = 0
+        self.scale, self.rate_divisor = self.levels[0]
+        self.interval = interval
+        self.recover_seconds = recover_seconds
+        self.high = high
+        self.low = low
+        # (video time, scale, rate divisor, reason) of every level change
+        self.changes = []
+        self._busy = 0.0
+        self._window_start = None
+        self._dropped = 0
+        self._last_change = 0.0
+        self._calm_since = None
+
+    def describe(self, scale: float = None, rate_divisor: int = None) -> str:
+        scale = self.scale if scale is None else scale
+        rate_divisor = self.rate_divisor if rate_divisor is None else rate_divisor
+        return f"{scale:.0%} resolution, {self.fps / rate_divisor:.3g} fps"
+
+    @property
+    def interpolation(self) -> int:
+        """
+        INTER_AREA for whole-number factors (0.5), where it is as cheap as it is sharp;
+        INTER_LINEAR otherwise, as INTER_AREA at 0.75 costs ~5x more and would itself
+        become the bottleneck the controller is trying to relieve.
+        """
+        return cv2.INTER_AREA if (1 / self.scale).is_integer() else cv2.INTER_LINEAR
+
+    def scaled_size(self, width: int, height: int):
+        """Output size of a width x height grab at the current level (even, as yuv420p wants)."""
+        if self.scale == 1.0:
+            return (width, height)
+        return (max(2, int(width * self.scale) // 2 * 2), max(2, int(height * self.scale) // 2 * 2))
+
+    def observe(self, write_seconds: float):
+        """Account one out.write call."""
+        self._busy += write_seconds
+
+    def update(self, video_time: float, queue_depth: int, queue_capacity: int, dropped: int) -> bool:
+        """Re-evaluate the level once per interval; returns True if it changed."""
+        now = time.monotonic()
+        if self._window_start is None:
+            self._window_start, self._last_change, self._dropped = now, now, dropped
+            return False
+        window = now - self._window_start
+        if window < self.interval:
+            return False
+        load = self._busy / window
+        new_drops = dropped - self._dropped
+        self._busy, self._window_start, self._dropped = 0.0, now, dropped
+
+        if load > self.high or new_drops or queue_depth * 2 >= queue_capacity:
+            self._calm_since = None
+            # Give the last step time to drain the ring before taking another
+            if self.level + 1 < len(self.levels) and now - self._last_change >= 2 * self.interval:
+                reason = f"encoder busy {load:.0%}, queue {queue_depth}/{queue_capacity}, {new_drops} frames lost"
+                return self._set(self.level + 1, now, video_time, reason)
+        elif load < self.low and queue_depth <= 1:
+            if self._calm_since is None:
+                self._calm_since = now
+            if self.level > 0 and now - max(self._calm_since, self._last_change) >= self.recover_seconds:
+                self._calm_since = now
+                return self._set(self.level - 1, now, video_time, f"headroom, encoder busy {load:.0%}")
+        else:
+            self._calm_since = None
+        return False
+
+    def _set(self, level: int, now: float, video_time: float, reason: str) -> bool:
+        self.level = level
+        self.scale, self.rate_divisor = self.levels[level]
+        self._last_change = now
+        self.changes.append((video_time, self.scale, self.rate_divisor, reason))
+        print(f"Adaptive quality: {self.describe()} from {video_time:.1f} s ({reason})")
+        return True
+
+    def write_srt(self, path: str, duration: float) -> bool:
+        """Write the level history as SubRip cues (muxed as a text track later). False if nothing changed."""
+        if not self.changes:
+            return False
+
+        def stamp(seconds):
+            ms = int(round(seconds * 1000))
+            return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+        cues = [(0.0, *self.levels[0], "start")] + self.changes
+        with open(path, "w", encoding="utf-8") as f:
+            for number, (start, scale, divisor, reason) in enumerate(cues, 1):
+                end = cues[number][0] if number < len(cues) else duration
+                if end <= start:
+                    continue
+                f.write(f"{number}\n{stamp(start)} --> {stamp(end)}\n{self.describe(scale, divisor)} ({reason})\n\n")
+        return True
+
+
+def _grab_size(shot):
+    """(width, height) of an mss screenshot, PIL image or ndarray grab."""
+    shape = getattr(shot, "shape", None)
+    if shape is not None:
+        return (shape[1], shape[0])
+    return (shot.width, shot.height)
+
+
+class CapturePipeline:
+    """
+    Capture -> convert -> encode, each stage on its own thread, joined by FrameRings.
+
+    grabber: zero-arg callable returning a context manager that yields a grab() function.
+             It is entered on the capture thread.
+    convert: convert(shot, dst) turns a grabbed screenshot into the frame format the
+             writer expects, writing into dst when it is not None.
+    write:   consumes frames (e.g. cv2.VideoWriter.write).
+
+    Converted frames go into buffers from a FramePool sized from the first frame,
+    unless pool_frames is False (e.g. when convert returns a view of the grab itself).
+    If the grabs themselves come from a FramePool (grab_pool, see FrameSource.grab_pool),
+    each goes back to it once converted, or, when convert returns the grab as it is,
+    once the encoder is done with that frame.
+
+    With detect_changes, a FrameChangeDetector sits in front of the colour conversion:
+    grabs identical to the last converted frame skip conversion and reuse that frame.
+    Pass detect_changes=False when convert is free (bgra_view): there is nothing to skip.
+
+    Grabs are paced by a FrameScheduler at `fps`. The encoder writes exactly one
+    frame per tick: ticks lost to a slow grab or a full ring are filled by repeating
+    the previous frame, so the video keeps its nominal rate and stays in sync with
+    the audio. If timestamps_path is given, a CSV sidecar records, for every written
+    frame, the capture time of the image it shows.
+
+    A slow encoder only fills the rings and drops frames; it never stalls capture.
+    With an AdaptiveQualityController, the encoder's load steers the capture rate and
+    the size of the frames handed to write (which then has to accept size changes).
+    Pipelines given the same clock_start share their FrameScheduler clock.
+    on_first_frame, if given, is called on the encode thread once the first frame is written.
+    Each of taps is called there as tap(frame, seconds) with every newly captured frame
+    once it is written (seconds: its position in the video); it may only borrow the frame
+    for the call and should return quickly, or it holds up the encoder.
+    With a Tracer, every grab, change check, conversion, write and tap run is recorded
+    as a span, and each stage thread is profiled (see Tracer.profiled).
+    """
+
+    def __init__(self, grabber, convert, write, stop_event: threading.Event, queue_size: int = 8,
+                 fps: float = DEFAULT_FPS, timestamps_path: str = None, detect_changes: bool = True,
+                 pool_frames: bool = True, controller: AdaptiveQualityController = None,
+                 clock_start: float = None, on_first_frame=None, taps=(), tracer=None,
+                 grab_pool: FramePool = None):
+        self.grabber = grabber
+        self.convert = convert
+        self.write = write
+        self.stop_event = stop_event
+        self.scheduler = FrameScheduler(fps, clock_start)
+        self.timestamps_path = timestamps_path
+        self.raw_ring = FrameRing(queue_size, "capture→convert")
+        self.frame_ring = FrameRing(queue_size, "convert→encode")
+        self.capture_stats = StageStats("capture")
+        self.convert_stats = StageStats("convert")
+        self.encode_stats = StageStats("encode")
+        self.pool_frames = pool_frames
+        # One FramePool per frame shape (the controller can change the size)
+        self.pools = {}
+        self.grab_pool = grab_pool
+        self.controller = controller
+        self.detector = FrameChangeDetector() if detect_changes else None
+        self.unchanged = 0
+        self.detect_time = 0.0
+        self.duplicated = 0
+        self.final_index = None
+        self.on_first_frame = on_first_frame
+        self.taps = list(taps)
+        self.tracer = tracer
+        self._threads = []
+        self._error = None
+
+    def _run_stage(self, stats, body):
+        stats.started = time.monotonic()
+        try:
+            with profiled(self.tracer):
+                body()
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+            self.stop_event.set()
+        finally:
+            stats.finished = time.monotonic()
+
+    def _capture(self):
+        try:
+            with self.grabber() as grab:
+                while True:
+                    tick = self.scheduler.wait(self.stop_event)
+                    if tick is None:
+                        break
+                    if self.controller is not None and tick[0] % self.controller.rate_divisor:
+                        # Reduced capture rate: the encoder repeats the previous frame for this tick
+                        continue
+                    t0 = time.perf_counter()
+                    shot = grab()
+                    t1 = time.perf_counter()
+                    self.capture_stats.add(t1 - t0)
+                    if self.tracer is not None:
+                        self.tracer.add("grab", t0, t1, "capture")
+                    dropped = self.raw_ring.put((tick[0], tick[1], shot))
+                    if dropped is not None:
+                        self._release(dropped[2])
+        finally:
+            # The recording lasts until now; the encoder pads up to this tick
+            self.final_index = self.scheduler.current_index()
+            self.raw_ring.close()
+
+    def _retain(self, frame):
+        pool = self.pools.get(frame.shape)
+        if pool is not None:
+            pool.retain(frame)
+        if self.grab_pool is not None:
+            self.grab_pool.retain(frame)
+
+    def _release(self, frame):
+        # Pools ignore arrays that are not theirs, so a frame can be offered to both
+        pool = self.pools.get(frame.shape)
+        if pool is not None:
+            pool.release(frame)
+        if self.grab_pool is not None:
+            self.grab_pool.release(frame)
+
+    def _pool_for(self, size):
+        for shape, pool in self.pools.items():
+            if (shape[1], shape[0]) == size:
+                return pool
+        return None
+
+    def _put_frame(self, item):
+        dropped = self.frame_ring.put(item)
+        if dropped is not None:
+            self._release(dropped[2])
+
+    def _convert(self):
+        last_frame = None
+        reference = None
+        try:
+            while not self.raw_ring.drained:
+                item = self.raw_ring.get()
+                if item is None:
+                    continue
+                index, timestamp, shot = item
+                grabbed = shot
+                width, height = _grab_size(shot)
+                size = self.controller.scaled_size(width, height) if self.controller is not None else (width, height)
+                if self.detector is not None:
+                    t0 = time.perf_counter()
+                    changed = self.detector.changed(np.asarray(shot))
+                    t1 = time.perf_counter()
+                    self.detect_time += t1 - t0
+                    if self.tracer is not None:
+                        self.tracer.add("detect change", t0, t1, "convert")
+                    if changed:
+                        # The detector compares the next grabs with this one: keep it out of the grab pool
+                        self._retain(grabbed)
+                        if reference is not None:
+                            self._release(reference)
+                        reference = grabbed
+                    if not changed and last_frame is not None and (last_frame.shape[1], last_frame.shape[0]) == size:
+                        # Static screen: hand the previous frame on again
+                        self.unchanged += 1
+                        self._release(grabbed)
+                        self._retain(last_frame)
+                        self._put_frame((index, timestamp, last_frame))
+                        continue
+                t0 = time.perf_counter()
+                if size != (width, height):
+                    shot = cv2.resize(np.asarray(shot), size, interpolation=self.controller.interpolation)
+                pool = self._pool_for(size)
+                frame = self.convert(shot, pool.acquire() if pool is not None else None)
+                t1 = time.perf_counter()
+                self.convert_stats.add(t1 - t0)
+                if self.tracer is not None:
+                    self.tracer.add("convert", t0, t1, "convert")
+                if pool is None and self.pool_frames:
+                    self.pools[frame.shape] = FramePool(frame.shape)
+                if frame is not grabbed:
+                    self._release(grabbed)
+                # One reference travels with the ring item, one stays here as last_frame
+                self._retain(frame)
+                if last_frame is not None:
+                    self._release(last_frame)
+                last_frame = frame
+                self._put_frame((index, timestamp, frame))
+        finally:
+            if last_frame is not None:
+                self._release(last_frame)
+            if reference is not None:
+                self._release(reference)
+            self.frame_ring.close()
+
+    def _encode(self):
+        timestamps_file = open(self.timestamps_path, "w", newline="") if self.timestamps_path else None
+        writer = csv.writer(timestamps_file) if timestamps_file else None
+        if writer:
+            writer.writerow(["frame", "capture_time", "duplicate"])
+        next_index = 0
+        last = None
+
+        def emit(frame, timestamp, duplicate):
+            nonlocal next_index
+            t0 = time.perf_counter()
+            self.write(frame)
+            t1 = time.perf_counter()
+            seconds = t1 - t0
+            self.encode_stats.add(seconds)
+            if self.tracer is not None:
+                self.tracer.add("write repeat" if duplicate else "write", t0, t1, "encode")
+            if self.controller is not None:
+                self.controller.observe(seconds)
+            if writer:
+                writer.writerow([next_index, f"{timestamp:.4f}", int(duplicate)])
+            if duplicate:
+                self.duplicated += 1
+            elif self.taps:
+                t0 = time.perf_counter()
+                for tap in self.taps:
+                    tap(frame, next_index / self.scheduler.fps)
+                if self.tracer is not None:
+                    self.tracer.add("taps", t0, time.perf_counter(), "encode")
+            if next_index == 0 and self.on_first_frame is not None:
+                self.on_first_frame()
+            next_index += 1
+
+        try:
+            while not self.frame_ring.drained:
+                item = self.frame_ring.get()
+                if item is None:
+                    continue
+                index, timestamp, frame = item
+                # Fill ticks that never made it here with the previous image
+                while next_index < index:
+                    emit(*(last or (frame, timestamp)), duplicate=True)
+                emit(frame, timestamp, duplicate=False)
+                if self.controller is not None:
+                    lost = self.raw_ring.dropped + self.frame_ring.dropped + self.scheduler.skipped
+                    self.controller.update(next_index / self.scheduler.fps, len(self.frame_ring),
+                                           self.frame_ring.capacity, lost)
+                # The ring item's reference now belongs to `last`
+                if last is not None:
+                    self._release(last[0])
+                last = (frame, timestamp)
+            if last is not None and self.final_index is not None:
+                while next_index < self.final_index:
+                    emit(*last, duplicate=True)
+        finally:
+            if last is not None:
+                self._release(last[0])
+            if timestamps_file:
+                timestamps_file.close()
+
+    def start(self):
+        load_recording_modules()
+        stages = [
+            (self.capture_stats, self._capture),
+            (self.convert_stats, self._convert),
+            (self.encode_stats, self._encode),
+        ]
+        for stats, body in stages:
+            thread = threading.Thread(target=self._run_stage, args=(stats, body), name=f"pipeline-{stats.name}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def pause(self, now: float = None):
+        """Hold capture (see FrameScheduler.pause); frames already grabbed are still written."""
+        self.scheduler.pause(now)
+
+    def resume(self, now: float = None):
+        self.scheduler.resume(now)
+
+    def join(self):
+        """Wait for all stages to drain. Re-raises the first stage error, if any."""
+        for thread in self._threads:
+            # Join in short slices so Ctrl+C still reaches the main thread
+            while thread.is_alive():
+                thread.join(0.2)
+        if self._error is not None:
+            raise self._error
+
+    def run(self):
+        self.start()
+        self.join()
+
+    def summary(self) -> str:
+        lines = [str(self.capture_stats), str(self.convert_stats), str(self.encode_stats)]
+        for ring in (self.raw_ring, self.frame_ring):
+            lines.append(f"{ring.name}: {ring.dropped} dropped, max depth {ring.max_depth}/{ring.capacity}")
+        lines.append(
+            f"scheduler: {self.scheduler.fps:g} fps target, {self.scheduler.skipped} ticks missed, "
+            f"{self.duplicated} frames duplicated"
+        )
+        for pool in self.pools.values():
+            lines.append(f"frame pool: {pool.allocated} buffers of {pool.shape}")
+        if self.controller is not None:
+            lines.append(f"adaptive quality: {len(self.controller.changes)} changes, ended at {self.controller.describe()}")
+        if self.detector is not None:
+            saved = self.unchanged * self.convert_stats.ms_per_frame / 1000.0 - self.detect_time
+            lines.append(
+                f"change detection: {self.unchanged} unchanged frames not converted, "
+                f"~{max(saved, 0.0):.1f} s of conversion saved"
+            )
+        return "\n".join(lines)
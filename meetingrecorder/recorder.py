@@ -0,0 +1,598 @@
+"""The Recorder: one recording from start() to stop(), and record_screen_region built on it."""
+import datetime
+import os
+import threading
+import time
+
+from .backends import audio_available, find_ffmpeg, load_recording_modules, MOVIEPY_AVAILABLE
+from .paths import (audio_track_paths, ensure_output_dir, profile_folder_for, slides_folder_for,
+                    text_index_path_for, timestamps_path_for, trace_path_for, voice_index_path_for)
+from .audio import AudioStats, record_audio
+from .pipeline import AdaptiveQualityController, CapturePipeline, DEFAULT_FPS
+from .sources import CompositeFrameSource, FrameSource, WindowFrameSource, bgra_view, select_frame_source
+from .encoding import AdaptiveVideoWriter, encoder_profile, open_video_writer
+from .segments import RecordingManifest, SegmentedVideoWriter
+from .finalize import finalize_recording
+from .slides import SlideExtractor
+from .ocr import ScreenTextIndexer, tesseract_available, tesseract_text
+from .tracing import Tracer, span
+
+
+def _finish_recording(job: dict, sink=None, status_callback=None, progress=None):
+    """Hand job to sink, or finalize it here, reporting through status_callback (and progress(fraction))."""
+    if sink is not None:
+        try:
+            submitted = sink.submit(job)
+        except Exception as e:
+            # The capture files are intact; only the merge could not be queued
+            if status_callback:
+                status_callback(f"✗ Failed to start finalizing: {str(e)}")
+            return None
+        if status_callback:
+            job_id = getattr(submitted, "id", None)
+            suffix = f" (job {job_id})" if job_id is not None else ""
+            status_callback(f"Recording stopped. Finalizing in background{suffix}...")
+        return submitted
+    try:
+        final_mp4_path = finalize_recording(job, progress)
+        if status_callback:
+            status_callback(f"✓ Success! MP4 saved: {os.path.basename(job['final_mp4_path'])}")
+        return final_mp4_path
+    except Exception as e:
+        if status_callback:
+            status_callback(f"✗ Failed to create MP4: {str(e)}")
+
+
+class _Track:
+    """One video stream of a recording: its source, writer and pipeline."""
+
+    def __init__(self, source: FrameSource, fps: float):
+        self.source = source
+        self.fps = fps
+        self.writer = None
+        self.encoded_path = None
+        self.finalize_mode = None
+        self.pipeline = None
+        self.slides = None
+        self.text = None
+
+
+class RecorderStats:
+    """A snapshot of a Recorder's progress, see Recorder.stats."""
+
+    def __init__(self, recorder):
+        pipelines = [track.pipeline for track in recorder.tracks if track.pipeline is not None]
+        self.state = recorder.state
+        self.seconds = max((p.encode_stats.frames / p.scheduler.fps for p in pipelines), default=0.0)
+        self.frames_captured = sum(p.capture_stats.frames for p in pipelines)
+        self.frames_encoded = sum(p.encode_stats.frames for p in pipelines)
+        self.frames_dropped = sum(p.raw_ring.dropped + p.frame_ring.dropped + p.scheduler.skipped for p in pipelines)
+        self.frames_duplicated = sum(p.duplicated for p in pipelines)
+        audio = recorder.audio_stats
+        self.audio_seconds = audio.frames_written / audio.samplerate if audio.samplerate else 0.0
+        self.audio_overflows = audio.input_overflows
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __str__(self):
+        return (
+            f"{self.state}: {self.seconds:.1f} s of video ({self.frames_encoded} frames, "
+            f"{self.frames_duplicated} repeated, {self.frames_dropped} dropped), {self.audio_seconds:.1f} s of audio"
+        )
+
+
+class Recorder:
+    """
+    One recording, from start() to stop(): frames from a source go through a CapturePipeline
+    into an encoder while audio is recorded alongside, and the finished files go to a sink.
+
+        recorder = Recorder("talk.mp4")
+        recorder.start()
+        ...
+        recorder.stop()
+        print(recorder.stats)
+
+    Each stage can be swapped:
+    - source:  a FrameSource; a backend name for select_frame_source(region, source); or a
+               list of FrameSources, recorded on one clock as separate video tracks of one
+               MP4 (needs ffmpeg; rates gives each its frame rate)
+    - encoder: "auto", "ffmpeg" or "opencv" (see open_video_writer), configured by profile;
+               or a callable taking open_video_writer's arguments and returning
+               (writer, encoded_path, finalize_mode)
+    - sink:    where stop() sends the finalize job: a FinalizeQueue, or anything with
+               submit(job), takes it in the background; with None, stop() finalizes itself
+
+    pause() / resume() suspend capture and audio while the writers stay open, so the
+    recording carries on without a gap in its timestamps.
+
+    final_mp4_path defaults to a dated name in the recordings folder, with the intermediate
+    files next to it (video_path / audio_path override those). fps defaults to the profile's.
+    audio_sources / audio_mode are passed to record_audio. With voice_index, the audio
+    also goes through a VoiceActivityDetector that writes a speech/silence index next to
+    the final MP4 (see voice_index_path_for). With slides, a SlideExtractor saves each
+    distinct screen as a PNG, from the frames being written (see slides_folder_for).
+    With ocr (implies slides), the text of each slide is read on a process pool into a
+    full-text index (see ScreenTextIndexer, text_index_path_for); True uses tesseract,
+    or pass an engine function. Slides still being read at stop() are finished on
+    text_thread after the files are handed off. With a MetricsRegistry as metrics, the recording reports
+    into it (see collect_metrics) from start() until its files are handed to the sink.
+    With trace, every grab, conversion, frame write, audio write and finalize step is
+    recorded as a span in a Chrome trace / Perfetto file (see Tracer, trace_path_for);
+    cprofile (implies trace) also saves cProfile stats (profile_folder_for): per thread, or
+    for the whole process on Python 3.12+ (see Tracer).
+    With segment_seconds (needs
+    ffmpeg, and one video track), video and audio roll into chunks of that length that
+    are finalized while recording continues. With adaptive, an AdaptiveQualityController lowers resolution and
+    then capture rate while the encoder cannot keep up. status_callback(message) receives
+    progress messages; on_first_frame() is called once the first frame is written.
+    """
+
+    def __init__(self, final_mp4_path: str = None, source="auto", region=None, fps: float = None, profile=None,
+                 encoder="auto", finalize: str = "auto", audio_sources=None, audio_mode: str = "mix",
+                 segment_seconds: float = None, adaptive: bool = True, sink=None, status_callback=None,
+                 rates=None, stop_event: threading.Event = None, video_path: str = None, audio_path: str = None,
+                 on_first_frame=None, voice_index: bool = True, slides: bool = False, ocr=False,
+                 metrics=None, trace: bool = False, cprofile: bool = False):
+        if final_mp4_path is None:
+            base_name = datetime.datetime.now().strftime("Video_%Y-%m-%d_%H-%M-%S")
+            final_mp4_path = os.path.join(ensure_output_dir(), f"{base_name}.mp4")
+        stem = os.path.splitext(final_mp4_path)[0]
+        self.final_mp4_path = final_mp4_path
+        self.video_path = video_path or stem + ".avi"
+        self.audio_path = audio_path or stem + ".wav"
+        self.source = source
+        self.region = region
+        self.profile = encoder_profile(profile)
+        self.fps = fps or self.profile.fps
+        self.rates = rates
+        self.encoder = encoder
+        self.finalize = finalize
+        self.audio_sources = audio_sources
+        self.audio_mode = audio_mode
+        self.segment_seconds = segment_seconds
+        self.adaptive = adaptive
+        self.sink = sink
+        self.status_callback = status_callback
+        self.on_first_frame = on_first_frame
+        self.voice_index_path = voice_index_path_for(final_mp4_path) if voice_index else None
+        # Text is read from the slides, so ocr turns them on even without an engine
+        self.slides = bool(slides or ocr)
+        if ocr is True:
+            if tesseract_available():
+                ocr = tesseract_text
+            else:
+                print("Warning: Screen text search needs pytesseract and tesseract; saving slides without it.")
+                ocr = None
+        self.ocr = ocr or None
+        self.metrics = metrics
+        self.trace_path = trace_path_for(final_mp4_path) if trace or cprofile else None
+        self.profile_folder = profile_folder_for(final_mp4_path) if cprofile else None
+        self.tracer = None
+        self.finalize_progress = None
+        self.stop_event = stop_event or threading.Event()
+        self.state = "idle"
+        self.tracks = []
+        self.audio_paths = [self.audio_path]
+        self.audio_stats = AudioStats()
+        self.audio_thread = None
+        self.text_thread = None
+        self.controller = None
+        self.manifest = None
+        self.job = None
+        self.result = None
+        self._audio_paused = threading.Event()
+
+    @property
+    def records_audio(self) -> bool:
+        """Whether audio is recorded: sounddevice works, or every source is a NullInputStream."""
+        if self.audio_sources and all(source.is_null for source in self.audio_sources):
+            return True
+        return audio_available()
+
+    @property
+    def stats(self) -> RecorderStats:
+        return RecorderStats(self)
+
+    def _status(self, message: str):
+        if self.status_callback:
+            self.status_callback(message)
+
+    def _open_writer(self, video_path, fps, frame_size, accept_bgra, finalize):
+        if callable(self.encoder):
+            return self.encoder(video_path, fps, frame_size, finalize=finalize, accept_bgra=accept_bgra,
+                                profile=self.profile)
+        return open_video_writer(video_path, fps, frame_size, self.encoder, finalize, accept_bgra=accept_bgra,
+                                 profile=self.profile)
+
+    def _open_tracks(self):
+        if isinstance(self.source, (list, tuple)):
+            # Separate video tracks on one clock; always remuxed, so ffmpeg writers only
+            if self.segment_seconds:
+                print("Warning: Separate video tracks are not recorded in chunks; recording whole files instead.")
+                self.segment_seconds = None
+            rates = list(self.rates or [self.fps] * len(self.source))
+            self.tracks = [_Track(source, rate) for source, rate in zip(self.source, rates)]
+            stem = os.path.splitext(self.video_path)[0]
+            for index, track in enumerate(self.tracks, start=1):
+                track.writer, track.encoded_path, track.finalize_mode = self._open_writer(
+                    f"{stem}.screen{index}.avi", track.fps, track.source.frame_size, track.source.bgra, "fast")
+            return
+
+        source = self.source
+        if not isinstance(source, FrameSource):
+            # Capture backend: the fastest available one unless source names one
+            source = select_frame_source(self.region, source)
+        track = _Track(source, self.fps)
+        self.tracks = [track]
+        if self.segment_seconds and find_ffmpeg() is None:
+            print("Warning: Segmented recording needs ffmpeg; recording a single file instead.")
+            self.segment_seconds = None
+        # Resolution changes need parts that ffmpeg can join: ffmpeg-encoded ones only
+        scalable = (self.adaptive and not self.segment_seconds and self.finalize != "transcode"
+                    and self.encoder != "opencv" and not callable(self.encoder) and find_ffmpeg() is not None)
+        if self.segment_seconds:
+            self.manifest = RecordingManifest(self.final_mp4_path, self.fps, self.segment_seconds,
+                                              len(self.audio_paths) if self.records_audio else 0)
+            track.writer = SegmentedVideoWriter(self.video_path, self.fps, source.frame_size, self.manifest,
+                                                self.encoder, accept_bgra=source.bgra, profile=self.profile)
+            track.finalize_mode = "segments"
+        elif scalable:
+            try:
+                track.writer = AdaptiveVideoWriter(self.video_path, self.fps, source.frame_size, self.encoder,
+                                                   accept_bgra=source.bgra, profile=self.profile)
+                track.encoded_path = os.path.splitext(self.video_path)[0] + ".video.mp4"
+                track.finalize_mode = "remux"
+            except RuntimeError as e:
+                print(f"Warning: {e}; keeping the full resolution.")
+                scalable = False
+        if track.writer is None:
+            track.writer, track.encoded_path, track.finalize_mode = self._open_writer(
+                self.video_path, self.fps, source.frame_size, source.bgra, self.finalize)
+        if self.adaptive:
+            self.controller = (AdaptiveQualityController(self.fps) if scalable
+                               else AdaptiveQualityController(self.fps, scales=(1.0,)))
+
+    def start(self):
+        """Open the writers and start capture and audio; returns as soon as recording runs."""
+        if self.state != "idle":
+            raise RuntimeError(f"Recorder is already {self.state}")
+        load_recording_modules()
+        if self.audio_mode == "tracks" and self.audio_sources:
+            self.audio_paths = audio_track_paths(self.audio_path, len(self.audio_sources))
+        self._open_tracks()
+        self._status("Recording started...")
+        if self.trace_path is not None:
+            if os.path.exists(self.trace_path):
+                # Spans are appended; do not mix in an earlier recording's
+                os.remove(self.trace_path)
+            self.tracer = Tracer(self.trace_path, self.profile_folder)
+            self.tracer.start()
+
+        if self.records_audio:
+            self.audio_thread = threading.Thread(
+                target=record_audio,
+                args=(self.stop_event, self.audio_path),
+                kwargs={
+                    "sources": self.audio_sources,
+                    "mode": self.audio_mode,
+                    # Audio is only chunked alongside segmented video, into the same manifest
+                    "segment_seconds": self.segment_seconds if self.manifest else None,
+                    "on_segment": self.manifest.audio_closed if self.manifest else None,
+                    "stats": self.audio_stats,
+                    "paused": self._audio_paused,
+                    "voice_index_path": self.voice_index_path,
+                    "tracer": self.tracer,
+                },
+                daemon=True,
+            )
+            self.audio_thread.start()
+
+        # All tracks tick on one clock, so separate video tracks stay in sync
+        clock_start = time.monotonic()
+        stem = os.path.splitext(self.final_mp4_path)[0]
+        for index, track in enumerate(self.tracks, start=1):
+            # Sources that grab on threads of their own (several monitors) tick with the pipelines
+            track.source.use_clock(clock_start)
+            # ffmpeg can take a BGRA grab directly; otherwise convert into pooled buffers
+            passthrough = getattr(track.writer, "pixel_format", None) == "bgra"
+            if len(self.tracks) == 1:
+                timestamps_path = timestamps_path_for(self.final_mp4_path)
+            else:
+                timestamps_path = f"{stem}.screen{index}.timestamps.csv"
+            taps = []
+            if self.slides:
+                if self.ocr is not None:
+                    track.text = ScreenTextIndexer(text_index_path_for(self.final_mp4_path) if len(self.tracks) == 1
+                                                   else f"{stem}.screen{index}.text.sqlite", engine=self.ocr)
+                track.slides = SlideExtractor(slides_folder_for(self.final_mp4_path) if len(self.tracks) == 1
+                                              else f"{stem}.screen{index}.slides",
+                                              on_slide=track.text.submit if track.text is not None else None)
+                track.slides.start()
+                taps.append(track.slides.tap)
+            track.pipeline = CapturePipeline(track.source.grabber, bgra_view if passthrough else track.source.convert,
+                                             track.writer.write, self.stop_event, fps=track.fps,
+                                             timestamps_path=timestamps_path, pool_frames=not passthrough,
+                                             detect_changes=not passthrough,
+                                             controller=self.controller, clock_start=clock_start,
+                                             on_first_frame=self.on_first_frame if index == 1 else None,
+                                             taps=taps, tracer=self.tracer, grab_pool=track.source.grab_pool)
+        for track in self.tracks:
+            track.pipeline.start()
+        self.state = "recording"
+        if self.metrics is not None:
+            self.metrics.add_collector(self.collect_metrics)
+
+    def pause(self):
+        """Suspend capture and audio until resume(); the writers stay open."""
+        if self.state != "recording":
+            return
+        now = time.monotonic()
+        for track in self.tracks:
+            track.pipeline.pause(now)
+            track.source.pause(now)
+        self._audio_paused.set()
+        self.state = "paused"
+        self._status("Paused")
+
+    def resume(self):
+        """Carry on after pause(), continuing the timestamps where they stopped."""
+        if self.state != "paused":
+            return
+        now = time.monotonic()
+        for track in self.tracks:
+            track.source.resume(now)
+            track.pipeline.resume(now)
+        self._audio_paused.clear()
+        self.state = "recording"
+        self._status("Recording resumed...")
+
+    def wait(self):
+        """Block until stop_event is set (by another thread, or by a failing stage), then stop()."""
+        while not self.stop_event.wait(0.2):
+            # Short slices, so Ctrl+C still reaches the main thread
+            pass
+        return self.stop()
+
+    def stop(self):
+        """
+        Stop capture and audio, close the writers and hand the files to the sink (or finalize
+        them here). Returns what the sink's submit() returned, or the final path. Re-raises
+        the error of a failed capture stage once the files are closed.
+        """
+        if self.state == "idle":
+            raise RuntimeError("Recorder was not started")
+        if self.state == "stopped":
+            return self.result
+        self.stop_event.set()
+        self.state = "stopping"
+        try:
+            for track in self.tracks:
+                track.pipeline.join()
+        finally:
+            for index, track in enumerate(self.tracks, start=1):
+                if len(self.tracks) > 1:
+                    print(f"Screen {index}:")
+                print(track.pipeline.summary())
+                if hasattr(track.source, "summary"):
+                    print(track.source.summary())
+                if track.slides is not None:
+                    track.slides.close()
+                    print(track.slides.summary())
+            if self.audio_thread is not None:
+                self.audio_thread.join(timeout=2.0)
+
+            encoder_error = None
+            for track in self.tracks:
+                try:
+                    with span(self.tracer, "release writer", "encode"):
+                        track.writer.release()
+                except RuntimeError as e:
+                    encoder_error = e
+            if self.tracer is not None:
+                # Closed before the finalize appends its own spans to the file
+                self.tracer.close()
+                print(self.tracer.summary())
+
+            self._status("Processing video...")
+            self.state = "stopped"
+            self.job = self._job(encoder_error)
+            if self.job is not None and self.trace_path is not None:
+                self.job.update(trace_path=self.trace_path, profile_folder=self.profile_folder)
+            try:
+                if self.job is not None:
+                    self.result = _finish_recording(self.job, self.sink, self.status_callback, self._finalizing)
+            finally:
+                if self.metrics is not None:
+                    self.metrics.remove_collector(self.collect_metrics)
+                self._close_text_indexers()
+        return self.result
+
+    def _close_text_indexers(self):
+        """
+        Finish reading the last slides on text_thread, so OCR does not hold up the finalize.
+        Not a daemon: the process waits for the text index before it exits.
+        """
+        indexers = [track.text for track in self.tracks if track.text is not None]
+        if not indexers:
+            return
+        if any(text.submitted > text.indexed + text.failed for text in indexers):
+            print("Reading the text of the slides in the background...")
+
+        def close():
+            for text in indexers:
+                text.close()
+                print(text.summary())
+
+        self.text_thread = threading.Thread(target=close, name="ocr-close")
+        self.text_thread.start()
+
+    def _finalizing(self, fraction: float):
+        self.finalize_progress = fraction
+
+    def _bytes_written(self) -> int:
+        """Size on disk of the files named after this recording so far."""
+        folder = os.path.dirname(os.path.abspath(self.final_mp4_path))
+        prefix = os.path.splitext(os.path.basename(self.final_mp4_path))[0]
+        total = 0
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix):
+                    try:
+                        if entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        # Renamed or removed meanwhile (a finished chunk, a temp file)
+                        pass
+        return total
+
+    def collect_metrics(self):
+        """Samples for a MetricsRegistry (names in metrics.METRICS), per track and for the audio."""
+        stats = self.stats
+        samples = [
+            ("meetingrecorder_recording", {}, int(self.state in ("recording", "paused"))),
+            ("meetingrecorder_paused", {}, int(self.state == "paused")),
+            ("meetingrecorder_recorded_seconds", {}, round(stats.seconds, 2)),
+            ("meetingrecorder_audio_seconds", {}, round(stats.audio_seconds, 2)),
+            ("meetingrecorder_audio_input_overflows_total", {}, self.audio_stats.input_overflows),
+            ("meetingrecorder_audio_input_underflows_total", {}, self.audio_stats.input_underflows),
+            ("meetingrecorder_audio_lost_frames_total", {}, self.audio_stats.overflowed_frames),
+            ("meetingrecorder_bytes_written", {}, self._bytes_written()),
+        ]
+        for index, track in enumerate(self.tracks, start=1):
+            pipeline = track.pipeline
+            if pipeline is None:
+                continue
+            labels = {"track": str(index)}
+            for stage in (pipeline.capture_stats, pipeline.convert_stats, pipeline.encode_stats):
+                stage_labels = dict(labels, stage=stage.name)
+                samples.append(("meetingrecorder_frames_total", stage_labels, stage.frames))
+                samples.append(("meetingrecorder_stage_fps", stage_labels, round(stage.fps, 2)))
+                for q in (50, 90, 99):
+                    samples.append(("meetingrecorder_stage_latency_ms", dict(stage_labels, quantile=f"{q / 100:g}"),
+                                    round(stage.recent_percentile(q), 2)))
+            for ring in (pipeline.raw_ring, pipeline.frame_ring):
+                ring_labels = dict(labels, queue=ring.name.replace("→", "-"))
+                samples.append(("meetingrecorder_queue_depth", ring_labels, len(ring)))
+                samples.append(("meetingrecorder_queue_capacity", ring_labels, ring.capacity))
+            samples.append(("meetingrecorder_frames_dropped_total", dict(labels, reason="queue"),
+                            pipeline.raw_ring.dropped + pipeline.frame_ring.dropped))
+            samples.append(("meetingrecorder_frames_dropped_total", dict(labels, reason="missed_tick"),
+                            pipeline.scheduler.skipped))
+            samples.append(("meetingrecorder_frames_duplicated_total", labels, pipeline.duplicated))
+        if self.finalize_progress is not None:
+            samples.append(("meetingrecorder_finalize_progress", {"file": os.path.basename(self.final_mp4_path)},
+                            round(self.finalize_progress, 3)))
+        return samples
+
+    def _job(self, encoder_error):
+        """The finalize job for the files this recording left behind, or None (reported) if there is none."""
+        track = self.tracks[0]
+        duration = max(t.pipeline.encode_stats.frames / t.fps for t in self.tracks)
+        if encoder_error is not None:
+            self._status(f"✗ Failed to create MP4: {encoder_error}")
+            return None
+        if len(self.tracks) > 1:
+            return {"mode": "remux", "video_path": [t.encoded_path for t in self.tracks],
+                    "audio_paths": self.audio_paths, "final_mp4_path": self.final_mp4_path, "duration": duration}
+
+        # Resolution / frame rate changes go into a text track of the final MP4
+        metadata_path = os.path.splitext(self.final_mp4_path)[0] + ".quality.srt"
+        if self.controller is None or not self.controller.write_srt(metadata_path, duration):
+            metadata_path = None
+
+        if track.finalize_mode == "segments":
+            # Most chunks are already finalized; the rest are closed here and joined by the job
+            self.manifest.close()
+            return {"mode": "segments", "manifest_path": self.manifest.path, "final_mp4_path": self.final_mp4_path}
+        if track.finalize_mode == "remux":
+            # Video is already MP4-compatible; only the audio needs encoding
+            job = {"mode": "remux", "video_path": track.encoded_path, "audio_paths": self.audio_paths,
+                   "final_mp4_path": self.final_mp4_path, "duration": duration, "metadata_path": metadata_path}
+            if isinstance(track.writer, AdaptiveVideoWriter):
+                job.update(video_parts=track.writer.parts, frame_size=track.source.frame_size, fps=self.fps,
+                           profile=self.profile)
+            return job
+        # Combine video + audio into a single MP4 if moviepy is available
+        if not MOVIEPY_AVAILABLE:
+            self._status("Warning: moviepy not installed. Separate files saved.")
+        elif not os.path.exists(self.video_path):
+            self._status("Error: Video file not found.")
+        elif not os.path.exists(self.audio_path):
+            self._status("Warning: Audio file not found.")
+        else:
+            return {"mode": "transcode", "video_path": self.video_path, "audio_paths": [self.audio_path],
+                    "final_mp4_path": self.final_mp4_path, "profile": self.profile}
+        return None
+
+
+def source_for_region(region_info=None, frame_source="auto", fps: float = None):
+    """
+    The Recorder source for a region_info (see record_screen_region): a FrameSource, or a
+    list of them for separate monitor tracks. frame_source is a FrameSource to use as is
+    (for several monitors, one of its kind per monitor, see FrameSource.for_region), or a
+    backend name for select_frame_source.
+    """
+    if region_info and region_info.get('type') == 'monitors':
+        # Several monitors at once, each grabbed on its own thread by a source of its own
+        sources = [frame_source.for_region(monitor) if isinstance(frame_source, FrameSource)
+                   else select_frame_source(monitor, frame_source)
+                   for monitor in region_info['monitors']]
+        layout = region_info.get('layout', 'side-by-side')
+        if layout == 'tracks' and find_ffmpeg() is None:
+            print("Warning: Separate screen tracks need ffmpeg; recording them side by side instead.")
+            layout = 'side-by-side'
+        if layout == 'tracks':
+            return sources
+        return CompositeFrameSource(sources, region_info.get('rates') or [fps or DEFAULT_FPS] * len(sources))
+
+    if region_info and region_info.get('type') in ('window', 'custom', 'monitor'):
+        region = {
+            'left': region_info['left'],
+            'top': region_info['top'],
+            'width': region_info['width'],
+            'height': region_info['height']
+        }
+    else:
+        # Full screen fallback
+        region = None
+    if isinstance(frame_source, FrameSource):
+        return frame_source
+    source = select_frame_source(region, frame_source)
+    if region_info and region_info.get('type') == 'window' and region_info.get('window') is not None:
+        # Follow the window if it is moved or resized while recording
+        source = WindowFrameSource(region_info['window'], source)
+    return source
+
+
+def record_screen_region(stop_event, video_path, audio_path, final_mp4_path, region_info=None, status_callback=None,
+                         fps: float = None, encoder: str = "auto", finalize: str = "auto",
+                         audio_sources=None, audio_mode: str = "mix", segment_seconds: float = None,
+                         finalizer=None, frame_source="auto", profile=None, adaptive: bool = True,
+                         slides: bool = False, ocr=False, metrics=None, trace: bool = False,
+                         cprofile: bool = False):
+    """
+    Record a specific screen region, window, or custom area and the microphone until
+    stop_event is set, then finalize (a Recorder driven by stop_event; see Recorder for
+    the options). With a FinalizeQueue as finalizer, the final merge is queued on it and
+    this returns as soon as capture has stopped; otherwise it runs before returning.
+
+    region_info can be:
+    - None: Full screen
+    - dict with 'type': 'monitor', 'window', or 'custom' and corresponding coordinates
+      (a window's live 'window' handle, if present, is followed while it moves)
+    - dict with 'type': 'monitors', a 'monitors' list of such regions, optional per-monitor
+      'rates', and 'layout': 'side-by-side' (one composited frame) or 'tracks' (one video
+      track per monitor)
+    """
+    ensure_output_dir()
+    profile = encoder_profile(profile)
+    fps = fps or profile.fps
+    recorder = Recorder(final_mp4_path, source=source_for_region(region_info, frame_source, fps), fps=fps,
+                        profile=profile, encoder=encoder, finalize=finalize, audio_sources=audio_sources,
+                        audio_mode=audio_mode, segment_seconds=segment_seconds, adaptive=adaptive, sink=finalizer,
+                        status_callback=status_callback, rates=(region_info or {}).get('rates'),
+                        stop_event=stop_event, video_path=video_path, audio_path=audio_path, slides=slides, ocr=ocr,
+                        metrics=metrics, trace=trace, cprofile=cprofile)
+    recorder.start()
+    return recorder.wait()
@@ -0,0 +1,253 @@
+"""Segmented recording: fixed-length chunks finalized while recording continues."""
+import json
+import os
+import queue
+import threading
+
+from .paths import audio_track_paths, segment_path
+from .encoding import concat_mp4_parts, EncoderProfile, mux_audio_video, open_video_writer
+
+
+class RecordingManifest:
+    """
+    Bookkeeping for a segmented recording, persisted to <name>.manifest.json.
+
+    As soon as both the video chunk and its audio chunk(s) are closed, a background
+    thread muxes them into a playable <name>.partNNN.mp4 (video stream copied) and
+    records it in the manifest. If the recorder crashes, every finished chunk is
+    already a usable file and the manifest says how to join them (see finish()).
+    """
+
+    def __init__(self, final_mp4_path: str, fps: float, segment_seconds: float, audio_tracks: int):
+        self.final_mp4_path = final_mp4_path
+        self.path = os.path.splitext(final_mp4_path)[0] + ".manifest.json"
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self.audio_tracks = audio_tracks
+        self.segments = {}
+        self.complete = False
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name="segment-finalizer", daemon=True)
+        self._worker.start()
+        self.save()
+
+    def _segment(self, index):
+        return self.segments.setdefault(index, {
+            "index": index,
+            "start": index * self.segment_seconds,
+            "video": None,
+            "frames": 0,
+            "audio": [None] * self.audio_tracks,
+            "mp4": None,
+            "status": "recording",
+        })
+
+    def save(self):
+        with self._lock:
+            data = {
+                "final": os.path.basename(self.final_mp4_path),
+                "fps": self.fps,
+                "segment_seconds": self.segment_seconds,
+                "complete": self.complete,
+                "segments": [self.segments[i] for i in sorted(self.segments)],
+            }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def video_closed(self, index: int, writer, path: str, frames: int):
+        """Called by SegmentedVideoWriter; the writer is released on the background thread."""
+        self._jobs.put(("video", index, writer, path, frames))
+
+    def audio_closed(self, track: int, index: int, path: str):
+        """Called by record_audio's on_segment hook."""
+        self._jobs.put(("audio", index, track, path))
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            try:
+                if job[0] == "video":
+                    _, index, writer, path, frames = job
+                    with self._lock:
+                        segment = self._segment(index)
+                        segment["video"], segment["frames"] = path, frames
+                    try:
+                        writer.release()
+                    except RuntimeError as e:
+                        segment["status"] = f"failed: {e}"
+                        self.save()
+                else:
+                    _, index, track, path = job
+                    with self._lock:
+                        self._segment(index)["audio"][track] = path
+                self._finalize_ready(final=False)
+            except Exception as e:
+                print(f"Warning: Could not finalize segment: {e}")
+
+    def _finalize_ready(self, final: bool):
+        with self._lock:
+            ready = [
+                seg for seg in self.segments.values()
+                if seg["status"] == "recording" and seg["video"]
+                and (final or all(seg["audio"]))
+            ]
+        for seg in ready:
+            mp4_path = segment_path(self.final_mp4_path, seg["index"])
+            try:
+                mux_audio_video(seg["video"], seg["audio"], mp4_path, duration=seg["frames"] / self.fps)
+                for path in [seg["video"], *seg["audio"]]:
+                    if path and os.path.exists(path):
+                        os.remove(path)
+                seg["mp4"], seg["status"] = mp4_path, "done"
+            except Exception as e:
+                seg["status"] = f"failed: {e}"
+            self.save()
+
+    def close(self):
+        """
+        Wait for outstanding chunks to be finalized. Chunks whose audio never arrived
+        are finalized with what exists. join_segments() does the rest.
+        """
+        self._jobs.put(None)
+        self._worker.join()
+        self._finalize_ready(final=True)
+
+    def finish(self):
+        """close(), then concatenate the chunks into the final MP4. Returns the final path."""
+        self.close()
+        return join_segments(self.path)
+
+
+def _save_manifest(manifest_path: str, data: dict):
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def join_segments(manifest_path: str, progress=None, skip_failed: bool = False) -> str:
+    """
+    Concatenate the finalized chunks listed in a manifest into the final MP4 and mark
+    the manifest complete. Works from the file alone, so it can run in another process
+    or on the leftovers of a crashed recording (see recover_segments).
+    Raises RuntimeError if any chunk failed (unless skip_failed: those are left out and
+    stay on disk) or none exist.
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        data = json.load(f)
+    final_mp4_path = os.path.join(os.path.dirname(manifest_path), data["final"])
+    parts = [seg for seg in data["segments"] if seg["video"]]
+    failed = [seg for seg in parts if seg["status"] != "done"]
+    if failed and not skip_failed:
+        raise RuntimeError(f"{len(failed)} segment(s) could not be finalized; see {manifest_path}")
+    if failed:
+        print(f"Warning: Leaving out {len(failed)} segment(s) that could not be finalized; see {manifest_path}")
+        parts = [seg for seg in parts if seg["status"] == "done"]
+    if not parts:
+        raise RuntimeError("No video segments were recorded")
+    duration = sum(seg["frames"] for seg in parts) / data["fps"]
+    concat_mp4_parts([seg["mp4"] for seg in parts], final_mp4_path, duration or None, progress)
+    for seg in parts:
+        os.remove(seg["mp4"])
+    data["complete"] = True
+    _save_manifest(manifest_path, data)
+    return final_mp4_path
+
+
+def recover_segments(manifest_path: str, progress=None) -> str:
+    """
+    Finish a segmented recording that never got to join_segments (the recorder crashed
+    or was killed). Chunks that were closed but not yet muxed are muxed now. The chunk
+    being written at the time is picked up from disk as well: ffmpeg closes its file
+    when its input pipe goes away. Chunks that cannot be read are reported and left
+    out. Returns the final path.
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data["complete"]:
+        raise RuntimeError(f"{data['final']} was already joined")
+    folder = os.path.dirname(manifest_path)
+    stem = os.path.splitext(os.path.join(folder, data["final"]))[0]
+    segments = {seg["index"]: seg for seg in data["segments"]}
+    tracks = max((len(seg["audio"]) for seg in segments.values()), default=1)
+
+    def video_chunk(index):
+        # Where SegmentedVideoWriter's open_video_writer put chunk `index`
+        return os.path.splitext(segment_path(stem + ".avi", index))[0] + ".video.mp4"
+
+    index = 0
+    while index in segments or os.path.exists(video_chunk(index)):
+        seg = segments.setdefault(index, {"index": index, "start": index * data["segment_seconds"], "video": None,
+                                          "frames": 0, "audio": [None] * tracks, "mp4": None,
+                                          "status": "recording"})
+        index += 1
+        if seg["status"] != "recording":
+            continue
+        video = seg["video"] or video_chunk(seg["index"])
+        audio = [path or segment_path(track_path, seg["index"])
+                 for path, track_path in zip(seg["audio"], audio_track_paths(stem + ".wav", tracks))]
+        audio = [path for path in audio if os.path.exists(path)]
+        mp4_path = segment_path(os.path.join(folder, data["final"]), seg["index"])
+        seg["video"] = video
+        try:
+            mux_audio_video(video, audio, mp4_path, duration=seg["frames"] / data["fps"] if seg["frames"] else None)
+            for path in [video, *audio]:
+                os.remove(path)
+            seg["mp4"], seg["status"] = mp4_path, "done"
+        except Exception as e:
+            seg["status"] = f"failed: {e}"
+            print(f"Warning: Could not recover segment {seg['index']}: {e}")
+    data["segments"] = [segments[i] for i in sorted(segments)]
+    _save_manifest(manifest_path, data)
+    return join_segments(manifest_path, progress, skip_failed=True)
+
+
+class SegmentedVideoWriter:
+    """
+    Writer that rolls over to a new chunk every segment_seconds of video.
+    Chunks are opened with open_video_writer() so they can be stream-copied; the
+    closed writer is handed to the manifest, which releases and finalizes it off the
+    encoder thread.
+    """
+
+    def __init__(self, video_path: str, fps: float, frame_size, manifest: RecordingManifest,
+                 encoder: str = "auto", accept_bgra: bool = False, profile: EncoderProfile = None):
+        self.video_path = video_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.manifest = manifest
+        self.encoder = encoder
+        self.profile = profile
+        self.accept_bgra = accept_bgra
+        self.segment_frames = max(1, int(round(manifest.segment_seconds * fps)))
+        self.index = 0
+        self._frames = 0
+        self._writer, self._path = self._open(0)
+        self.pixel_format = getattr(self._writer, "pixel_format", "bgr24")
+
+    def _open(self, index):
+        writer, path, mode = open_video_writer(segment_path(self.video_path, index), self.fps, self.frame_size,
+                                               self.encoder, "fast", self.accept_bgra, self.profile)
+        if mode != "remux":
+            writer.release()
+            raise RuntimeError("Segmented recording needs ffmpeg to join the chunks")
+        return writer, path
+
+    def write(self, frame):
+        if self._frames >= self.segment_frames:
+            self.manifest.video_closed(self.index, self._writer, self._path, self._frames)
+            self.index += 1
+            self._writer, self._path = self._open(self.index)
+            self._frames = 0
+        self._writer.write(frame)
+        self._frames += 1
+
+    def release(self):
+        if self._writer is not None:
+            self.manifest.video_closed(self.index, self._writer, self._path, self._frames)
+            self._writer = None
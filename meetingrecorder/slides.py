@@ -0,0 +1,158 @@
+"""Slide extraction: one PNG per distinct screen of a presentation, taken from the frames being recorded."""
+import csv
+import os
+import queue
+import threading
+
+from .backends import cv2, np
+
+
+def perceptual_hash(gray) -> int:
+    """64-bit DCT hash of a grayscale image; similar images differ in few bits (see hash_distance)."""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()[1:]
+    bits = low > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class Slide:
+    """A distinct screen: its number, PNG path, perceptual hash, thumbnail and when it first appeared (seconds of video)."""
+
+    def __init__(self, number: int, path: str, phash: int, thumb, seconds: float):
+        self.number = number
+        self.path = path
+        self.phash = phash
+        self.thumb = thumb
+        self.seconds = seconds
+
+
+class SlideExtractor:
+    """
+    Saves one PNG per distinct slide as a recording runs, from frames the pipeline already
+    has in memory (pass tap to CapturePipeline), so nothing is decoded afterwards.
+
+    Every interval seconds of video, tap shrinks the frame to a grayscale thumbnail
+    (thumb_size) and compares it with the previous one: more than change_fraction of its
+    pixels moving by over pixel_threshold levels is a change. Once the screen has then
+    held still for settle seconds (so transitions and scrolling are not captured
+    half-way) it is a slide, unless it matches one already saved, in which case it is
+    recorded as that slide coming back. A match is a perceptual hash within max_distance
+    bits (a quick filter; slides sharing a layout hash alike) whose thumbnail does not
+    count as a change either.
+
+    Slides go to folder as slide_001.png, ... and every appearance to folder/slides.csv
+    (time, slide, file). PNGs are written on a thread of their own; on_slide(slide) is
+    called there once each new one is on disk.
+    """
+
+    def __init__(self, folder: str, interval: float = 0.5, settle: float = 1.0, thumb_size=(160, 90),
+                 pixel_threshold: int = 24, change_fraction: float = 0.002, max_distance: int = 6, on_slide=None):
+        self.folder = folder
+        self.interval = interval
+        self.settle = settle
+        self.thumb_size = thumb_size
+        self.pixel_threshold = pixel_threshold
+        self.change_fraction = change_fraction
+        self.max_distance = max_distance
+        self.on_slide = on_slide
+        self.slides = []
+        self.appearances = 0
+        self.changes = 0
+        self._next_sample = 0.0
+        self._reference = None
+        self._stable_since = 0.0
+        self._pending = False
+        self._current = None
+        self._index_file = None
+        self._index = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.folder, "slides.csv")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._write_slides, name="slides", daemon=True)
+        self._thread.start()
+
+    def tap(self, frame, seconds: float):
+        """Look at a frame written at `seconds` of video. The frame is only borrowed for the call."""
+        if seconds < self._next_sample:
+            return
+        self._next_sample = seconds + self.interval
+        thumb = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGRA2GRAY if thumb.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        if self._reference is None or self._changed(gray, self._reference):
+            # On screen since about now; saved once it stops changing
+            self._reference = gray
+            self._stable_since = seconds
+            self._pending = True
+            self.changes += 1
+            return
+        if self._pending and seconds - self._stable_since >= self.settle:
+            self._pending = False
+            self._found(frame, gray, self._stable_since)
+
+    def _changed(self, gray, reference) -> bool:
+        moved = np.count_nonzero(cv2.absdiff(gray, reference) > self.pixel_threshold)
+        return moved > self.change_fraction * gray.size
+
+    def _found(self, frame, gray, seconds: float):
+        phash = perceptual_hash(gray)
+        slide = next((s for s in self.slides
+                      if hash_distance(s.phash, phash) <= self.max_distance and not self._changed(gray, s.thumb)), None)
+        if slide is None:
+            slide = Slide(len(self.slides) + 1, os.path.join(self.folder, f"slide_{len(self.slides) + 1:03d}.png"),
+                          phash, gray, seconds)
+            self.slides.append(slide)
+            # The pipeline reuses its frame buffers: keep a copy (without alpha) for the writer
+            self._queue.put((slide, np.ascontiguousarray(frame[:, :, :3])))
+        elif slide is self._current:
+            # Back to the same slide after something moved over it
+            return
+        self._current = slide
+        self.appearances += 1
+        if self._index is None:
+            os.makedirs(self.folder, exist_ok=True)
+            self._index_file = open(self.index_path, "w", newline="")
+            self._index = csv.writer(self._index_file)
+            self._index.writerow(["time", "slide", "file"])
+        self._index.writerow([f"{seconds:.2f}", slide.number, os.path.basename(slide.path)])
+        self._index_file.flush()
+
+    def _write_slides(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            slide, image = item
+            os.makedirs(self.folder, exist_ok=True)
+            if not cv2.imwrite(slide.path, image):
+                print(f"Could not save {slide.path}")
+                continue
+            if self.on_slide is not None:
+                try:
+                    self.on_slide(slide)
+                except Exception as e:
+                    print(f"Slide {slide.number}: {e}")
+
+    def close(self):
+        """Write the slides still queued and close the index."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def summary(self) -> str:
+        if not self.slides:
+            return "slides: none found"
+        return (f"slides: {len(self.slides)} distinct, shown {self.appearances} times "
+                f"({self.changes} screen changes), saved in {self.folder}")
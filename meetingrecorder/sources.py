@@ -0,0 +1,564 @@
+"""Frame sources: the screen capture backends (and synthetic / file stand-ins) CapturePipeline grabs from."""
+import contextlib
+import sys
+import threading
+import time
+
+from .backends import cv2, mss, MSS_AVAILABLE, np, pyautogui, pyautogui_available
+from .pipeline import DEFAULT_FPS, FramePool, FrameScheduler, StageStats, _grab_size
+
+
+@contextlib.contextmanager
+def mss_grabber(region, **options):
+    """
+    Yield a grab function for region. mss handles are per-thread, so open this in the capture thread.
+    options are passed to mss.mss() (e.g. backend= on Linux).
+    """
+    with mss.mss(**options) as sct:
+        yield lambda: sct.grab(region)
+
+
+@contextlib.contextmanager
+def pyautogui_grabber(region=None):
+    """Yield a grab function backed by pyautogui, for region (full screen if None)."""
+    if region is None:
+        yield pyautogui.screenshot
+    else:
+        box = (region['left'], region['top'], region['width'], region['height'])
+        yield lambda: pyautogui.screenshot(region=box)
+
+
+def bgra_view(screenshot, dst=None):
+    """Wrap an mss screenshot's raw BGRA buffer as an (h, w, 4) array without copying."""
+    if isinstance(screenshot, np.ndarray):
+        return screenshot
+    return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+
+def convert_bgra_frame(screenshot, dst=None):
+    """Convert an mss screenshot (BGRA) to a BGR frame for OpenCV, into dst if given."""
+    return cv2.cvtColor(bgra_view(screenshot), cv2.COLOR_BGRA2BGR, dst=dst)
+
+
+def convert_rgb_image(img, dst=None):
+    """Convert a PIL image (RGB) to a BGR frame for OpenCV, into dst if given."""
+    return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR, dst=dst)
+
+
+class FrameSource:
+    """
+    A way of grabbing the screen, or a region of it, for CapturePipeline.
+
+    grabber() is a context manager yielding a grab function; CapturePipeline enters it in
+    the capture thread, since handles like mss's are per-thread. convert(grab, dst=None)
+    turns a grab into a BGR frame. Grabs of sources with bgra = True can be handed to an
+    ffmpeg writer as they are (see bgra_view). A source whose grabs are buffers of a
+    FramePool sets grab_pool, and CapturePipeline hands each grab back when done with it.
+    """
+
+    name = None
+    bgra = True
+    grab_pool = None
+
+    def __init__(self, region=None):
+        self.region = region
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    @property
+    def frame_size(self):
+        return (self.region['width'], self.region['height'])
+
+    def grabber(self):
+        raise NotImplementedError
+
+    def region_grabber(self):
+        """Like grabber(), but the grab function takes the region to grab (for WindowFrameSource)."""
+        raise NotImplementedError
+
+    def convert(self, grab, dst=None):
+        return convert_bgra_frame(grab, dst)
+
+    def for_region(self, region) -> "FrameSource":
+        """A new source of the same kind for another region (one per monitor of a multi-monitor recording)."""
+        return type(self)(region)
+
+    def use_clock(self, start: float):
+        """
+        Called before grabber() with the time.monotonic() the recording's ticks count from;
+        sources that grab on threads of their own pace them on it.
+        """
+
+    def pause(self, now: float = None):
+        """Called as the recording pauses (now: its time.monotonic()); sources that grab on threads of their own hold them."""
+
+    def resume(self, now: float = None):
+        pass
+
+
+class MssFrameSource(FrameSource):
+    """mss screenshots (GDI BitBlt on Windows). Without a region, the primary monitor."""
+
+    name = "mss"
+    options = {}
+
+    def __init__(self, region=None):
+        if region is None:
+            with mss.mss() as sct:
+                region = dict(sct.monitors[1])
+        super().__init__(region)
+
+    @classmethod
+    def available(cls) -> bool:
+        return MSS_AVAILABLE
+
+    def grabber(self):
+        return mss_grabber(self.region, **self.options)
+
+    @contextlib.contextmanager
+    def region_grabber(self):
+        with mss.mss(**self.options) as sct:
+            yield sct.grab
+
+
+class X11ShmFrameSource(MssFrameSource):
+    """
+    X11 capture through MIT-SHM (XShmGetImage): the server writes into shared memory
+    instead of sending every frame over the socket. Uses the mss backend of that name.
+
+    Every tick grabs the whole region, changed or not; XDamage could skip those grabs
+    but is not used. Nothing else skips them either on the default path: BGRA grabs
+    go to ffmpeg as they are (no FrameChangeDetector there), and x264 codes a repeated
+    frame as skip blocks, cheaper than a changed one but not free. The detector only
+    saves the colour conversion on the BGR (OpenCV) path.
+    """
+
+    name = "x11-shm"
+    options = {"backend": "xshmgetimage"}
+
+    @classmethod
+    def available(cls) -> bool:
+        if not MSS_AVAILABLE or not sys.platform.startswith("linux"):
+            return False
+        try:
+            import mss.linux
+        except ImportError:
+            return False
+        return "xshmgetimage" in getattr(mss.linux, "BACKENDS", ())
+
+
+class PyAutoGUIFrameSource(FrameSource):
+    """pyautogui screenshots (PIL images in RGB). Slow, but needs nothing else."""
+
+    name = "pyautogui"
+    bgra = False
+
+    @classmethod
+    def available(cls) -> bool:
+        return pyautogui_available()
+
+    @property
+    def frame_size(self):
+        if self.region is None:
+            size = pyautogui.size()
+            return (size.width, size.height)
+        return super().frame_size
+
+    def grabber(self):
+        return pyautogui_grabber(self.region)
+
+    @contextlib.contextmanager
+    def region_grabber(self):
+        yield lambda r: pyautogui.screenshot(region=(r['left'], r['top'], r['width'], r['height']))
+
+    def convert(self, grab, dst=None):
+        return convert_rgb_image(grab, dst)
+
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Generated BGRA frames shaped like an mss grab, for tests and benchmarks without a display.
+    content is one of CONTENT_TYPES:
+    - static: the same slide on every grab
+    - scrolling: a page of text-like lines moving up scroll_rows rows per grab
+    - video: a textured picture drifting diagonally, so every pixel changes
+
+    Each grab copies into a new array, as a real grab does.
+    """
+
+    name = "synthetic"
+    CONTENT_TYPES = ("static", "scrolling", "video")
+
+    def __init__(self, region=None, content: str = "static", scroll_rows: int = 8):
+        if content not in self.CONTENT_TYPES:
+            raise ValueError(f"Unknown content type: {content}")
+        super().__init__(region or {'left': 0, 'top': 0, 'width': 1920, 'height': 1080})
+        self.width, self.height = self.frame_size
+        self.content = content
+        self.scroll_rows = scroll_rows
+        self.index = 0
+        width, height = self.width, self.height
+        rng = np.random.default_rng(0)
+        if content == "video":
+            # Smooth noise (upscaled from a coarse grid) with room to drift
+            coarse = rng.integers(0, 256, ((height + 64) // 16 + 1, (width + 64) // 16 + 1, 4), np.uint8)
+            self.canvas = cv2.resize(coarse, ((width + 64) // 16 * 16 + 16, (height + 64) // 16 * 16 + 16),
+                                     interpolation=cv2.INTER_CUBIC)
+        else:
+            # A white page of grey "text" lines, three screens tall when scrolling
+            rows = height * 3 if content == "scrolling" else height
+            self.canvas = np.full((rows, width, 4), 255, np.uint8)
+            for top in range(40, rows - 20, 24):
+                line_width = int(width * rng.uniform(0.3, 0.8))
+                self.canvas[top:top + 12, 60:60 + line_width, :3] = 60
+        self.canvas[..., 3] = 255
+
+    def for_region(self, region) -> "SyntheticFrameSource":
+        return SyntheticFrameSource(region, self.content, self.scroll_rows)
+
+    def grab(self) -> "np.ndarray":
+        i = self.index
+        self.index += 1
+        if self.content == "static":
+            view = self.canvas
+        elif self.content == "scrolling":
+            top = (i * self.scroll_rows) % (self.canvas.shape[0] - self.height)
+            view = self.canvas[top:top + self.height]
+        else:
+            dy, dx = (i * 3) % 64, (i * 5) % 64
+            view = self.canvas[dy:dy + self.height, dx:dx + self.width]
+        frame = np.empty((self.height, self.width, 4), np.uint8)
+        np.copyto(frame, view)
+        return frame
+
+    @contextlib.contextmanager
+    def grabber(self):
+        yield self.grab
+
+
+class FileFrameSource(FrameSource):
+    """Frames of a video file, looped, as BGRA grabs. Replays a known recording through the pipeline."""
+
+    name = "file"
+
+    def __init__(self, path: str, region=None):
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise RuntimeError(f"Could not open video file: {path}")
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        capture.release()
+        super().__init__(region or {'left': 0, 'top': 0, 'width': width, 'height': height})
+        self.path = path
+
+    def for_region(self, region) -> "FileFrameSource":
+        return FileFrameSource(self.path, region)
+
+    @contextlib.contextmanager
+    def grabber(self):
+        capture = cv2.VideoCapture(self.path)
+        r = self.region
+
+        def grab():
+            ok, frame = capture.read()
+            if not ok:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = capture.read()
+                if not ok:
+                    raise RuntimeError(f"Could not read a frame from {self.path}")
+            frame = frame[r['top']:r['top'] + r['height'], r['left']:r['left'] + r['width']]
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+
+        try:
+            yield grab
+        finally:
+            capture.release()
+
+
+def letterbox(frame, size):
+    """Scale frame (h, w, channels) to fit size (width, height), keeping its aspect ratio, centred on black."""
+    width, height = size
+    h, w = frame.shape[:2]
+    scale = min(width / w, height / h)
+    fit_w, fit_h = min(width, max(1, round(w * scale))), min(height, max(1, round(h * scale)))
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    out = np.zeros((height, width, frame.shape[2]), np.uint8)
+    left, top = (width - fit_w) // 2, (height - fit_h) // 2
+    out[top:top + fit_h, left:left + fit_w] = cv2.resize(frame, (fit_w, fit_h), interpolation=interpolation)
+    return out
+
+
+class WindowTracker:
+    """
+    Re-reads a window's geometry every interval seconds on a background thread.
+    region is the latest usable rect, clipped to bounds (the virtual screen) if given;
+    while the window is minimized, closed or off screen it keeps the last one.
+    """
+
+    def __init__(self, window, region, interval: float = 0.5, bounds=None):
+        self.window = window
+        self.region = dict(region)
+        self.interval = interval
+        self.bounds = bounds
+        self.changes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def query(self):
+        """The window's current rect, or None if it cannot be grabbed right now."""
+        window = self.window
+        if getattr(window, "isMinimized", False):
+            return None
+        left, top, right, bottom = window.left, window.top, window.left + window.width, window.top + window.height
+        if self.bounds is not None:
+            b = self.bounds
+            left, top = max(left, b['left']), max(top, b['top'])
+            right, bottom = min(right, b['left'] + b['width']), min(bottom, b['top'] + b['height'])
+        if right - left <= 0 or bottom - top <= 0:
+            return None
+        return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                region = self.query()
+            except Exception:
+                # The window was closed
+                region = None
+            if region is not None and region != self.region:
+                # Replaced, not updated in place, so a grab never sees half a rect
+                self.region = region
+                self.changes += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+
+class WindowFrameSource(FrameSource):
+    """
+    A window followed while it moves or resizes, grabbed through backend (a live FrameSource).
+    A WindowTracker re-reads the geometry a few times a second off the capture thread, so a
+    grab only adds one attribute lookup. Frames keep the window's starting size: after a
+    resize the grab is scaled to fit and letterboxed.
+    """
+
+    def __init__(self, window, backend: FrameSource, interval: float = 0.5):
+        super().__init__(dict(backend.region))
+        self.window = window
+        self.backend = backend
+        self.interval = interval
+        self.name = f"{backend.name} (window)"
+        self.bgra = backend.bgra
+        self.tracker = None
+
+    def convert(self, grab, dst=None):
+        return self.backend.convert(grab, dst)
+
+    def for_region(self, region) -> FrameSource:
+        # A window belongs to one place: another region gets the plain backend
+        return self.backend.for_region(region)
+
+    @contextlib.contextmanager
+    def grabber(self):
+        bounds = None
+        if MSS_AVAILABLE:
+            try:
+                with mss.mss() as sct:
+                    bounds = dict(sct.monitors[0])
+            except Exception:
+                pass
+        self.tracker = tracker = WindowTracker(self.window, self.region, self.interval, bounds)
+        size = self.frame_size
+
+        with self.backend.region_grabber() as grab_region:
+            def grab():
+                shot = grab_region(tracker.region)
+                if _grab_size(shot) == size:
+                    return shot
+                pixels = bgra_view(shot) if self.bgra else np.asarray(shot)
+                return letterbox(pixels, size)
+
+            tracker.start()
+            try:
+                yield grab
+            finally:
+                tracker.stop()
+
+    def summary(self) -> str:
+        changes = self.tracker.changes if self.tracker is not None else 0
+        return f"window tracking: {changes} moves/resizes followed"
+
+
+class MonitorWorker:
+    """
+    Grabs one FrameSource on its own thread at its own rate and keeps the latest grab as a
+    BGRA array. Workers given the same clock_start tick on one shared clock.
+    """
+
+    def __init__(self, source: FrameSource, fps: float = DEFAULT_FPS, clock_start: float = None):
+        self.source = source
+        self.scheduler = FrameScheduler(fps, clock_start)
+        self.stats = StageStats(f"grab {source.name} {source.frame_size[0]}x{source.frame_size[1]}")
+        self.latest = None
+        self.error = None
+        self.ready = threading.Event()
+        self.thread = None
+
+    def start(self, stop_event: threading.Event):
+        self.thread = threading.Thread(target=self._run, args=(stop_event,), daemon=True)
+        self.thread.start()
+
+    def _run(self, stop_event):
+        self.stats.started = time.monotonic()
+        try:
+            with self.source.grabber() as grab:
+                while True:
+                    tick = self.scheduler.wait(stop_event)
+                    if tick is None:
+                        break
+                    started = time.perf_counter()
+                    shot = grab()
+                    if self.source.bgra:
+                        self.latest = bgra_view(shot)
+                    else:
+                        self.latest = cv2.cvtColor(np.asarray(shot), cv2.COLOR_RGB2BGRA)
+                    self.stats.add(time.perf_counter() - started)
+                    self.ready.set()
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+        finally:
+            self.stats.finished = time.monotonic()
+
+
+class CompositeFrameSource(FrameSource):
+    """
+    Several monitors side by side in one frame. Each monitor is grabbed by a MonitorWorker
+    at its own rate (rates, default DEFAULT_FPS) on a shared clock: clock_start, or the
+    recording's (see use_clock), or else the moment grabber() is entered. Every grab tiles their
+    latest frames into a canvas from grab_pool, one slice assignment per monitor, top-aligned.
+    """
+
+    name = "composite"
+
+    def __init__(self, sources, rates=None, clock_start: float = None):
+        self.sources = list(sources)
+        self.rates = list(rates or [DEFAULT_FPS] * len(self.sources))
+        self.clock_start = clock_start
+        self.offsets = []
+        width = 0
+        for source in self.sources:
+            self.offsets.append(width)
+            width += source.frame_size[0]
+        height = max(source.frame_size[1] for source in self.sources)
+        super().__init__({'left': 0, 'top': 0, 'width': width, 'height': height})
+        self.grab_pool = FramePool((height, width, 4))
+        self.workers = []
+
+    @contextlib.contextmanager
+    def grabber(self):
+        stop_event = threading.Event()
+        clock_start = self.clock_start if self.clock_start is not None else time.monotonic()
+        self.workers = [MonitorWorker(source, rate, clock_start) for source, rate in zip(self.sources, self.rates)]
+        width, height = self.frame_size
+
+        def grab():
+            canvas = self.grab_pool.acquire()
+            for worker, left in zip(self.workers, self.offsets):
+                if worker.error is not None:
+                    raise RuntimeError(f"Capture of {worker.source.name} failed: {worker.error}")
+                tile = worker.latest
+                right = left + tile.shape[1]
+                canvas[:tile.shape[0], left:right] = tile
+                # A reused canvas still holds an old picture below a shorter monitor
+                canvas[tile.shape[0]:, left:right] = 0
+            return canvas
+
+        for worker in self.workers:
+            worker.start(stop_event)
+        try:
+            for worker in self.workers:
+                if not worker.ready.wait(5.0):
+                    raise RuntimeError(f"No frame from {worker.source.name} after 5 s")
+            yield grab
+        finally:
+            stop_event.set()
+            for worker in self.workers:
+                worker.thread.join(timeout=2.0)
+
+    def use_clock(self, start: float):
+        self.clock_start = start
+
+    def pause(self, now: float = None):
+        for worker in self.workers:
+            worker.scheduler.pause(now)
+
+    def resume(self, now: float = None):
+        for worker in self.workers:
+            worker.scheduler.resume(now)
+
+    def summary(self) -> str:
+        return "\n".join(f"  {worker.stats}" for worker in self.workers)
+
+
+# Live screen backends considered by select_frame_source("auto"), preferred first on a tie
+FRAME_SOURCES = [MssFrameSource, X11ShmFrameSource, PyAutoGUIFrameSource]
+
+
+_probe_cache = {}
+
+
+def probe_frame_source(source: FrameSource, seconds: float = 0.25, max_grabs: int = 10) -> float:
+    """Grab-and-convert rate (frames per second) source sustains, or 0.0 if it does not work."""
+    try:
+        with source.grabber() as grab:
+            # The first grab pays for setup (shared memory, buffers)
+            source.convert(grab())
+            grabs = 0
+            start = time.perf_counter()
+            while grabs < max_grabs and time.perf_counter() - start < seconds:
+                source.convert(grab())
+                grabs += 1
+            return grabs / (time.perf_counter() - start)
+    except Exception as e:
+        print(f"Frame source {source.name} is not usable: {e}")
+        return 0.0
+
+
+def select_frame_source(region=None, backend: str = "auto") -> FrameSource:
+    """
+    A FrameSource for region (full screen if None). backend is a FRAME_SOURCES name, or
+    "auto" to probe every available backend once and use the fastest one. The ranking
+    is cached per region size, so later recordings start without probing.
+    """
+    classes = [cls for cls in FRAME_SOURCES if cls.available()]
+    if backend != "auto":
+        for cls in classes:
+            if cls.name == backend:
+                return cls(region)
+        raise ValueError(f"Frame source not available: {backend}")
+    if not classes:
+        raise RuntimeError("No screen capture backend available (install mss or pyautogui)")
+
+    key = (region['width'], region['height']) if region else None
+    if key not in _probe_cache:
+        rates = {}
+        for cls in classes:
+            try:
+                rates[cls.name] = probe_frame_source(cls(region))
+            except Exception as e:
+                print(f"Frame source {cls.name} is not usable: {e}")
+                rates[cls.name] = 0.0
+        print("Frame sources: " + ", ".join(f"{name} {rate:.0f} fps" for name, rate in rates.items()))
+        if not any(rates.values()):
+            raise RuntimeError("No screen capture backend could grab the screen")
+        _probe_cache[key] = sorted(classes, key=lambda cls: -rates[cls.name])
+    return _probe_cache[key][0](region)
@@ -0,0 +1,162 @@
+"""
+Profiling mode: per-stage timing spans in a Chrome trace / Perfetto JSON file, and
+optional cProfile stats per thread, so a choppy recording can be pinned on a stage.
+"""
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+# From Python 3.12 cProfile runs on sys.monitoring: one profiler per process, seeing every thread
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+
+class Tracer:
+    """
+    Collects timing spans from any thread and appends them to path as Chrome trace
+    events (JSON Array Format), which ui.perfetto.dev and chrome://tracing open. The
+    array is left open, as the format allows, so the finalize (maybe in another
+    process) can append its spans to the same file; timestamps are wall-clock
+    microseconds, so both line up.
+
+    add(name, start, end) takes time.perf_counter() values the caller already has, so
+    a span costs one tuple on the hot path; a writer thread turns them into JSON every
+    flush_interval seconds. With profile_folder, cProfile stats are saved there too, for
+    pstats or snakeviz: one <thread>-<id>.prof per thread that runs under profiled(), or,
+    on Python 3.12+ where a profiler cannot be limited to one thread, a single
+    <profile_name>-<pid>.prof covering all threads from start() to close(). Tracers
+    sharing a folder in one process (capture, then an inline finalize) need their own
+    profile_name, or the later dump replaces the earlier.
+    """
+
+    def __init__(self, path: str, profile_folder: str = None, flush_interval: float = 1.0,
+                 profile_name: str = "process"):
+        self.path = path
+        self.profile_folder = profile_folder
+        self.profile_name = profile_name
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.spans = 0
+        # Wall-clock seconds at perf_counter() == 0
+        self._epoch = time.time() - time.perf_counter()
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._profiling_failed = False
+        self._process_profile = None
+
+    def start(self):
+        self._metadata("process_name", None, "meetingrecorder")
+        if self.profile_folder is not None and PROCESS_WIDE_PROFILER:
+            self._process_profile = self._enable_profile()
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def _metadata(self, kind: str, tid, name: str):
+        event = {"name": kind, "ph": "M", "pid": self.pid, "args": {"name": name}}
+        if tid is not None:
+            event["tid"] = tid
+        self._events.append(event)
+
+    def add(self, name: str, start: float, end: float, category: str = ""):
+        """A span from start to end (time.perf_counter() seconds) on the calling thread."""
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+                self._metadata("thread_name", tid, self._threads[tid])
+            self._events.append((name, category, start, end, tid))
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), category)
+
+    def _enable_profile(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+: another profiler (another Tracer, a debugger) is already running
+            if not self._profiling_failed:
+                self._profiling_failed = True
+                print(f"Warning: Could not start the profiler: {e}")
+            return None
+        return profile
+
+    def _dump_profile(self, profile, name: str):
+        profile.disable()
+        os.makedirs(self.profile_folder, exist_ok=True)
+        profile.dump_stats(os.path.join(self.profile_folder, name))
+
+    @contextlib.contextmanager
+    def profiled(self):
+        """
+        Run cProfile on the calling thread for the duration, if there is a profile_folder
+        (a no-op on Python 3.12+, where start() profiles the whole process instead).
+        """
+        if self.profile_folder is None or PROCESS_WIDE_PROFILER:
+            yield
+            return
+        profile = self._enable_profile()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                self._dump_profile(profile, f"{threading.current_thread().name}-{threading.get_ident()}.prof")
+
+    def _event(self, item) -> dict:
+        if isinstance(item, dict):
+            return item
+        name, category, start, end, tid = item
+        return {"name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": tid,
+                "ts": round((self._epoch + start) * 1e6, 1), "dur": round((end - start) * 1e6, 1)}
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+        self.spans += sum(1 for item in events if not isinstance(item, dict))
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a") as f:
+            if new_file:
+                f.write("[\n")
+            f.writelines(json.dumps(self._event(item)) + ",\n" for item in events)
+
+    def close(self):
+        if self._process_profile is not None:
+            self._dump_profile(self._process_profile, f"{self.profile_name}-{self.pid}.prof")
+            self._process_profile = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def summary(self) -> str:
+        kind = "process profile" if PROCESS_WIDE_PROFILER else "thread profiles"
+        profiles = f", {kind} in {self.profile_folder}" if self.profile_folder else ""
+        return f"profiling: {self.spans} spans saved in {self.path} (open in ui.perfetto.dev){profiles}"
+
+
+def span(tracer: Tracer, name: str, category: str = ""):
+    """tracer.span(name, category), or a no-op without a tracer."""
+    return tracer.span(name, category) if tracer is not None else contextlib.nullcontext()
+
+
+def profiled(tracer: Tracer):
+    """tracer.profiled(), or a no-op without a tracer."""
+    return tracer.profiled() if tracer is not None else contextlib.nullcontext()
@@ -0,0 +1,161 @@
+"""Voice activity detection on the audio as it is recorded, and the speech/silence index it writes."""
+import csv
+
+from .backends import np
+
+
+class VoiceActivityDetector:
+    """
+    Splits an audio stream into speech and silence as it is fed, without a second pass.
+
+    feed(block) takes the int16-scaled samples written to the WAV, (frames, channels),
+    in whatever batch sizes they come. Each frame_seconds window gets two features,
+    computed for a whole batch at once: its energy (dBFS) and its zero-crossing rate.
+    A window counts as speech when its energy is margin_db above the noise floor (the
+    10th percentile of recent energies, rising by at most floor_rise_db per second, so
+    it follows a room getting noisier) and its zero-crossing rate is below max_zcr:
+    voiced speech crosses zero far less often than hiss, fans or keyboard clatter.
+    The floor starts no higher than initial_floor_db, so a recording that starts
+    mid-sentence does not take the voice for the room's noise; it drops at once to
+    any quieter batch.
+    Runs of speech shorter than min_speech are ignored, pauses shorter than
+    min_silence (which also covers unvoiced consonants) stay inside the speech segment,
+    and a speech segment is extended by hangover into the silence after it.
+
+    Closed segments go to path as CSV rows start,end,kind (seconds of audio, "speech" /
+    "silence"), so the index is complete up to the last pause even if the recording is
+    cut short; close() writes the last one.
+    """
+
+    def __init__(self, samplerate: int, path: str = None, frame_seconds: float = 0.02, margin_db: float = 12.0,
+                 min_db: float = -60.0, max_zcr: float = 0.35, floor_rise_db: float = 0.5,
+                 min_speech: float = 0.15, min_silence: float = 0.6, hangover: float = 0.2,
+                 initial_floor_db: float = -50.0):
+        self.samplerate = samplerate
+        self.path = path
+        self.frame_length = max(1, int(round(samplerate * frame_seconds)))
+        self.frame_seconds = self.frame_length / samplerate
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.max_zcr = max_zcr
+        self.floor_rise_db = floor_rise_db
+        self.initial_floor_db = initial_floor_db
+        self.min_speech = min_speech
+        self.min_silence = min_silence
+        self.hangover = hangover
+        self.noise_floor = None
+        self.segments = []
+        self._pending = np.empty(0, np.float32)
+        self._frames = 0
+        # The run of equal labels still open at the end of the last batch
+        self._run_speech = None
+        self._run_start = 0
+        # The segment being built
+        self._speaking = False
+        self._segment_start = 0.0
+        self._last_speech = 0.0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def feed(self, block):
+        """Add the next samples (frames, channels) or (frames,)."""
+        block = np.asarray(block)
+        mono = block.mean(axis=1, dtype=np.float32) if block.ndim == 2 else block.astype(np.float32)
+        samples = np.concatenate((self._pending, mono)) if len(self._pending) else mono
+        count = len(samples) // self.frame_length
+        self._pending = samples[count * self.frame_length:].copy()
+        if count == 0:
+            return
+        windows = samples[:count * self.frame_length].reshape(count, self.frame_length) / 32768.0
+        energy = 10.0 * np.log10(np.einsum("ij,ij->i", windows, windows) / self.frame_length + 1e-10)
+        zcr = np.count_nonzero(np.diff(np.signbit(windows), axis=1), axis=1) / self.frame_length
+
+        floor = float(np.percentile(energy, 10))
+        if self.noise_floor is None:
+            self.noise_floor = min(floor, self.initial_floor_db)
+        else:
+            self.noise_floor = min(self.noise_floor + self.floor_rise_db * count * self.frame_seconds, floor)
+        threshold = max(self.noise_floor + self.margin_db, self.min_db)
+        speech = (energy > threshold) & (zcr < self.max_zcr)
+        self._add_labels(speech)
+
+    def _add_labels(self, speech):
+        """Turn per-window labels into runs; every run but the still-open last one is settled."""
+        first = self._frames
+        self._frames += len(speech)
+        changes = np.flatnonzero(speech[1:] != speech[:-1]) + 1
+        # Plain ints, so the segment times are plain floats
+        starts = [0, *changes.tolist()]
+        for start in starts:
+            label = bool(speech[start])
+            if self._run_speech is None:
+                self._run_speech, self._run_start = label, first + start
+            elif label != self._run_speech:
+                self._settle_run(self._run_speech, self._run_start, first + start)
+                self._run_speech, self._run_start = label, first + start
+
+    def _settle_run(self, is_speech: bool, start_frame: int, end_frame: int):
+        start, end = start_frame * self.frame_seconds, end_frame * self.frame_seconds
+        if is_speech:
+            if end - start < self.min_speech and not self._speaking:
+                return
+            if not self._speaking:
+                self._emit(self._segment_start, start, "silence")
+                self._segment_start = start
+                self._speaking = True
+            self._last_speech = end
+        elif self._speaking and end - start >= self.min_silence:
+            speech_end = min(self._last_speech + self.hangover, end)
+            self._emit(self._segment_start, speech_end, "speech")
+            self._segment_start = speech_end
+            self._speaking = False
+
+    def _emit(self, start: float, end: float, kind: str):
+        if end <= start:
+            return
+        self.segments.append((start, end, kind))
+        if self.path is None:
+            return
+        if self._file is None:
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["start", "end", "kind"])
+        self._writer.writerow([f"{start:.2f}", f"{end:.2f}", kind])
+        self._file.flush()
+
+    def close(self):
+        """Settle what is left and write the final segment."""
+        if self._run_speech is not None:
+            self._settle_run(self._run_speech, self._run_start, self._frames)
+            self._run_speech = None
+        end = self._frames * self.frame_seconds
+        if self._speaking:
+            self._emit(self._segment_start, min(self._last_speech + self.hangover, end), "speech")
+            self._segment_start = min(self._last_speech + self.hangover, end)
+            self._speaking = False
+        self._emit(self._segment_start, end, "silence")
+        self._segment_start = end
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end, kind in self.segments if kind == "speech")
+
+    def __str__(self):
+        count = sum(1 for segment in self.segments if segment[2] == "speech")
+        total = self._frames * self.frame_seconds
+        return f"voice activity: {self.speech_seconds:.1f} of {total:.1f} s speech in {count} segments"
+
+
+def load_voice_index(path: str):
+    """The segments of a speech index as (start, end, kind) tuples, e.g. to skip or trim the silences."""
+    with open(path, newline="") as f:
+        return [(float(row["start"]), float(row["end"]), row["kind"]) for row in csv.DictReader(f)]
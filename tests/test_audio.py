@@ -0,0 +1,141 @@
+import threading
+import time
+import types
+import wave
+
+import numpy as np
+import pytest
+
+from meetingrecorder import audio
+from meetingrecorder.audio import AudioRingBuffer, AudioSource, AudioStats, record_audio
+from meetingrecorder.paths import audio_track_paths
+
+
+def frames(start, count, channels=2):
+    """count frames whose samples are their own running number, to check order after wrapping."""
+    return np.repeat(np.arange(start, start + count, dtype=np.int16)[:, None], channels, axis=1)
+
+
+def test_ring_wraps_around_in_order():
+    ring = AudioRingBuffer(8, 2)
+    out = np.empty((8, 2), dtype=np.int16)
+    ring.write(frames(0, 6))
+    assert ring.read_into(out[:5]) == 5
+    # 1 left at index 5; the next 6 wrap past the end of the buffer
+    ring.write(frames(6, 6))
+    assert ring.available() == 7
+    assert ring.read_into(out) == 7
+    assert out[:7, 0].tolist() == list(range(5, 12))
+    assert ring.overflowed_frames == 0
+
+
+def test_ring_drops_what_does_not_fit_and_counts_it():
+    ring = AudioRingBuffer(8, 1)
+    ring.write(frames(0, 5, 1))
+    ring.write(frames(5, 5, 1))
+    assert ring.available() == 8
+    assert ring.overflowed_frames == 2
+    ring.write(frames(10, 3, 1))
+    assert ring.overflowed_frames == 5
+    out = np.empty((8, 1), dtype=np.int16)
+    ring.read_into(out)
+    # The oldest audio is kept, the newest is lost
+    assert out[:, 0].tolist() == list(range(8))
+
+
+def test_ring_read_and_skip_stop_at_what_is_available():
+    ring = AudioRingBuffer(4, 1)
+    out = np.full((4, 1), -1, dtype=np.int16)
+    assert ring.read_into(out) == 0
+    ring.write(frames(0, 3, 1))
+    assert ring.skip(2) == 2
+    assert ring.skip(5) == 1
+    assert ring.available() == 0
+
+
+class FakeStream:
+    """
+    Stands in for NullInputStream: calls back in real time with a constant value, from
+    delay seconds after opening, with its clock speed times too fast. Each stream opened
+    takes the next (value, delay, speed) from configs, in the order of the sources.
+    """
+
+    configs = []
+
+    def __init__(self, samplerate, channels, dtype="int16", callback=None, **kwargs):
+        self.value, self.delay, self.speed = FakeStream.configs.pop(0)
+        self.samplerate = samplerate
+        self.blocksize = samplerate // 50
+        self.block = np.full((self.blocksize, channels), self.value, dtype=np.int16)
+        self.callback = callback
+        self._stop = threading.Event()
+
+    def _run(self):
+        status = types.SimpleNamespace(input_overflow=False, input_underflow=False)
+        period = self.blocksize / self.samplerate / self.speed
+        start = time.monotonic() + self.delay
+        blocks = 0
+        while not self._stop.wait(max(0.0, start + (blocks + 1) * period - time.monotonic())):
+            due = start + (blocks + 1) * period
+            self.callback(self.block, self.blocksize,
+                          types.SimpleNamespace(inputBufferAdcTime=due - period, currentTime=time.monotonic()), status)
+            blocks += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def record(monkeypatch, tmp_path, configs, seconds=1.0, gains=None, **options):
+    """Run record_audio on fake sources for `seconds`; returns the WAV samples per path and the stats."""
+    monkeypatch.setattr(audio, "NullInputStream", FakeStream)
+    FakeStream.configs = list(configs)
+    gains = gains or [1.0] * len(configs)
+    sources = [AudioSource("null", gain=gain) for gain in gains]
+    stats = AudioStats()
+    stop_event = threading.Event()
+    timer = threading.Timer(seconds, stop_event.set)
+    timer.start()
+    path = str(tmp_path / "talk.wav")
+    record_audio(stop_event, path, samplerate=8000, sources=sources, stats=stats, flush_seconds=0.1, **options)
+    paths = audio_track_paths(path, len(configs)) if options.get("mode") == "tracks" else [path]
+    samples = []
+    for wav_path in paths:
+        with wave.open(wav_path) as f:
+            samples.append(np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16))
+    return samples, stats
+
+
+def test_sources_are_mixed_with_their_gains(monkeypatch, tmp_path, capsys):
+    (mixed,), stats = record(monkeypatch, tmp_path, [(1000, 0, 1.0), (500, 0, 1.0)], gains=[1.0, 2.0])
+    assert len(mixed) >= 6000
+    # The edges may hold only one source: the streams open a moment apart
+    assert set(mixed[80:-80].tolist()) == {2000}
+    assert stats.clipped_samples == 0
+
+
+def test_mix_clips_instead_of_wrapping(monkeypatch, tmp_path, capsys):
+    (mixed,), stats = record(monkeypatch, tmp_path, [(30000, 0, 1.0), (30000, 0, 1.0)])
+    assert mixed.max() == 32767 and mixed.min() >= 0
+    assert stats.clipped_samples > 0
+
+
+def test_late_source_gets_leading_silence(monkeypatch, tmp_path, capsys):
+    (early, late), stats = record(monkeypatch, tmp_path, [(1000, 0, 1.0), (1000, 0.3, 1.0)], mode="tracks")
+    assert early[0] == 1000
+    lead = int(np.argmax(late != 0))
+    assert lead == pytest.approx(0.3 * 8000, abs=0.03 * 8000)
+    assert abs(len(early) - len(late)) <= 0.05 * 8000
+
+
+def test_fast_clock_is_trimmed_to_the_slow_one(monkeypatch, tmp_path, capsys):
+    # 10% fast: 0.15 s ahead after 1.5 s, three times the allowed skew
+    (steady, fast), stats = record(monkeypatch, tmp_path, [(1000, 0, 1.0), (1000, 0, 1.1)], seconds=1.5,
+                                   mode="tracks", max_skew_seconds=0.05)
+    assert stats.drift_frames >= 0.05 * 8000
+    assert abs(len(steady) - len(fast)) <= 0.06 * 8000
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from meetingrecorder.backends import find_ffmpeg
+from meetingrecorder.encoding import AdaptiveVideoWriter, ENCODER_PROFILES, EncoderProfile, encoder_profile
+
+needs_ffmpeg = pytest.mark.skipif(find_ffmpeg() is None, reason="needs ffmpeg")
+
+
+def test_adaptive_writer_refuses_opencv_parts(tmp_path, capsys):
+    with pytest.raises(RuntimeError, match="ffmpeg encoder"):
+        AdaptiveVideoWriter(str(tmp_path / "talk.avi"), 10, (64, 48), encoder="opencv")
+    assert os.listdir(tmp_path) == []
+
+
+def test_x264_profile_args():
+    args = ENCODER_PROFILES["slides-low-cpu"].ffmpeg_args()
+    assert args == ["-c:v", "libx264", "-preset", "ultrafast", "-threads", "2", "-tune", "stillimage",
+                    "-crf", "28", "-g", "100", "-pix_fmt", "yuv420p"]
+
+
+def test_keyframe_interval_follows_the_capture_rate():
+    profile = encoder_profile("demo-smooth")
+    # Every 2 s: 60 frames at the profile's 30 fps, 10 when capturing at 5 fps
+    default, slow = profile.quality_args(), profile.quality_args(fps=5)
+    assert default[default.index("-g") + 1] == "60"
+    assert slow[slow.index("-g") + 1] == "10"
+
+
+def test_bitrate_replaces_crf():
+    args = encoder_profile(bitrate="2M").ffmpeg_args()
+    assert "-crf" not in args
+    assert args[args.index("-b:v") + 1] == "2M"
+
+
+def test_hardware_codec_gets_its_own_quality_option_and_no_preset_or_tune():
+    args = EncoderProfile(codec="h264_nvenc", crf=21, tune="stillimage").ffmpeg_args()
+    assert args == ["-c:v", "h264_nvenc", "-cq", "21", "-pix_fmt", "yuv420p"]
+
+
+def test_encoder_profile_overrides():
+    profile = encoder_profile("slides-low-cpu", crf=30, fps=None)
+    assert (profile.crf, profile.fps, profile.preset) == (30, 10, "ultrafast")
+    assert ENCODER_PROFILES["slides-low-cpu"].crf == 28
+    assert encoder_profile() is ENCODER_PROFILES["default"]
+    with pytest.raises(ValueError, match="Unknown encoder profile"):
+        encoder_profile("fastest")
@@ -0,0 +1,52 @@
+import os
+import signal
+import time
+
+import pytest
+
+from meetingrecorder.finalize import FinalizeJob, FinalizeQueue
+
+
+def wait_for(job, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, f"{job} did not finish"
+        time.sleep(0.05)
+
+
+def failing_spec(tmp_path, name):
+    """A job that fails fast in the worker: its manifest does not exist."""
+    return {"mode": "segments", "manifest_path": str(tmp_path / f"{name}.manifest.json"),
+            "final_mp4_path": str(tmp_path / f"{name}.mp4")}
+
+
+def test_job_description_without_an_error_message():
+    job = FinalizeJob(1, {"final_mp4_path": "recordings/talk.mp4"})
+    job.state, job.error = "failed", ""
+    assert str(job) == "talk.mp4: failed (unknown error)"
+    job.error = "ffmpeg failed: first line\nInvalid data found\n"
+    assert str(job) == "talk.mp4: failed (Invalid data found)"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_queue_starts_a_new_pool_after_a_worker_dies(tmp_path, capsys):
+    finalizer = FinalizeQueue(max_workers=1)
+    try:
+        first = finalizer.submit(failing_spec(tmp_path, "first"))
+        wait_for(first)
+        assert first.state == "failed" and "first.manifest.json" in first.error
+
+        for process in list(finalizer._pool._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        deadline = time.monotonic() + 10.0
+        while not finalizer._pool._broken:
+            assert time.monotonic() < deadline, "the pool did not notice the dead worker"
+            time.sleep(0.05)
+
+        second = finalizer.submit(failing_spec(tmp_path, "second"))
+        wait_for(second)
+        # Reported by a worker of the new pool, not by the broken one
+        assert second.state == "failed" and "second.manifest.json" in second.error
+        assert "restarting the finalize processes" in capsys.readouterr().out
+    finally:
+        finalizer.shutdown()
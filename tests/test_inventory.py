@@ -0,0 +1,46 @@
+import queue
+
+from meetingrecorder import inventory
+from meetingrecorder.inventory import InventoryService
+
+
+def monitor(index, left, width=1920, height=1080):
+    return {'index': index, 'left': left, 'top': 0, 'width': width, 'height': height}
+
+
+def test_refresh_lists_a_monitor_plugged_in_meanwhile(monkeypatch):
+    monitors = [monitor(0, 0)]
+    monkeypatch.setattr(inventory, "get_available_monitors", lambda: list(monitors))
+    changes = queue.Queue()
+    # Long interval: only refresh() can bring the next pass
+    service = InventoryService(on_change=lambda kind, items: changes.put((kind, items)), interval=60.0,
+                               windows=False)
+    service.start()
+    try:
+        assert changes.get(timeout=5.0) == ("monitors", [monitor(0, 0)])
+        monitors.append(monitor(1, 1920, 2560, 1440))
+        service.refresh()
+        assert changes.get(timeout=5.0) == ("monitors", [monitor(0, 0), monitor(1, 1920, 2560, 1440)])
+        assert service.monitors == monitors
+    finally:
+        service.stop()
+
+
+def test_unchanged_lists_are_not_reported(monkeypatch):
+    monkeypatch.setattr(inventory, "get_available_monitors", lambda: [monitor(0, 0)])
+    windows = [[{'title': "Slides", 'left': 0, 'top': 0, 'width': 800, 'height': 600}]]
+    monkeypatch.setattr(inventory, "get_available_windows", lambda: list(windows[0]))
+    changes = queue.Queue()
+    service = InventoryService(on_change=lambda kind, items: changes.put(kind), interval=60.0)
+    service.start()
+    try:
+        assert sorted([changes.get(timeout=5.0), changes.get(timeout=5.0)]) == ["monitors", "windows"]
+        service.refresh()
+        windows[0] = [{'title': "Slides", 'left': 100, 'top': 0, 'width': 800, 'height': 600}]
+        service.refresh()
+        # Only the moved window is news
+        assert changes.get(timeout=5.0) == "windows"
+        service.stop()
+        assert changes.empty()
+    finally:
+        service.stop()
@@ -0,0 +1,69 @@
+import json
+import urllib.request
+
+from meetingrecorder.metrics import MetricsFileWriter, MetricsRegistry, MetricsServer, _escape
+
+
+def test_escape_label_values():
+    assert _escape('C:\\talks\\"q3"\nfinal') == 'C:\\\\talks\\\\\\"q3\\"\\nfinal'
+    assert _escape(2) == "2"
+
+
+def test_prometheus_text_groups_samples_under_one_header():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [
+        ("meetingrecorder_frames_total", {"stage": "capture"}, 120),
+        ("meetingrecorder_recording", {}, 1),
+        ("meetingrecorder_frames_total", {"stage": "encode", "track": "0"}, 118.5),
+    ])
+    registry.add_collector(lambda: [("custom_metric", {"file": 'a "b"'}, 3)])
+    assert registry.prometheus_text() == (
+        "# HELP meetingrecorder_frames_total Frames handled by a pipeline stage\n"
+        "# TYPE meetingrecorder_frames_total counter\n"
+        'meetingrecorder_frames_total{stage="capture"} 120\n'
+        'meetingrecorder_frames_total{stage="encode",track="0"} 118.5\n'
+        "# HELP meetingrecorder_recording 1 while a recording is running or paused\n"
+        "# TYPE meetingrecorder_recording gauge\n"
+        "meetingrecorder_recording 1\n"
+        "# HELP custom_metric \n"
+        "# TYPE custom_metric untyped\n"
+        'custom_metric{file="a \\"b\\""} 3\n'
+    )
+
+
+def test_failing_collector_is_skipped(capsys):
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: 1 / 0)
+    registry.add_collector(lambda: [("meetingrecorder_paused", {}, 0)])
+    assert registry.collect() == [("meetingrecorder_paused", {}, 0)]
+    assert "Metrics collector failed" in capsys.readouterr().out
+
+
+def test_file_writer_reports_counter_rates(tmp_path):
+    frames = [100]
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [("meetingrecorder_frames_total", {"stage": "capture"}, frames[0]),
+                                    ("meetingrecorder_queue_depth", {}, 4)])
+    path = str(tmp_path / "metrics.json")
+    writer = MetricsFileWriter(registry, path)
+    writer.write()
+    frames[0] = 130
+    writer.write()
+    with open(path) as f:
+        report = json.load(f)
+    assert report["metrics"] == {'meetingrecorder_frames_total{stage="capture"}': 130, "meetingrecorder_queue_depth": 4}
+    assert list(report["rates"]) == ['meetingrecorder_frames_total{stage="capture"}']
+    assert report["rates"]['meetingrecorder_frames_total{stage="capture"}'] > 0
+
+
+def test_server_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [("meetingrecorder_recording", {}, 1)])
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+    finally:
+        server.stop()
+    assert "meetingrecorder_recording 1\n" in body
@@ -0,0 +1,34 @@
+from meetingrecorder.ocr import TextIndex, search_text
+
+
+def build(path):
+    index = TextIndex(path)
+    index.add(1, 0.0, "slide_001.png", "Agenda: quarterly results and hiring plan")
+    index.add(2, 12.5, "slide_002.png", "Quarterly results: revenue up, costs down, results ahead of plan")
+    index.add(3, 40.0, "slide_003.png", "Questions?")
+    return index
+
+
+def test_search_finds_matching_slides_best_first(tmp_path):
+    index = build(str(tmp_path / "text.sqlite"))
+    hits = index.search("results")
+    index.close()
+    # Slide 2 mentions results twice
+    assert [(time, slide, file) for time, slide, file, snippet in hits] == [
+        (12.5, 2, "slide_002.png"), (0.0, 1, "slide_001.png")]
+    assert "[results]" in hits[0][3].lower()
+
+
+def test_search_takes_fts5_queries_and_a_limit(tmp_path):
+    index = build(str(tmp_path / "text.sqlite"))
+    assert [hit[1] for hit in index.search("hir*")] == [1]
+    assert [hit[1] for hit in index.search("revenue AND costs")] == [2]
+    assert len(index.search("results", limit=1)) == 1
+    assert index.search("budget") == []
+    index.close()
+
+
+def test_index_is_searchable_after_the_recording(tmp_path):
+    path = str(tmp_path / "text.sqlite")
+    build(path).close()
+    assert [hit[1] for hit in search_text(path, "questions")] == [3]
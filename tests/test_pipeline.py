@@ -0,0 +1,196 @@
+import types
+
+import numpy as np
+import pytest
+
+from meetingrecorder import pipeline
+from meetingrecorder.pipeline import AdaptiveQualityController, FramePool, FrameRing, FrameScheduler
+
+
+class FakeClock:
+    """Stands in for the time module and a stop Event: waiting just moves the clock on."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.now += seconds
+        return False
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pipeline, "time", types.SimpleNamespace(monotonic=clock.monotonic,
+                                                                 perf_counter=clock.monotonic))
+    return clock
+
+
+def test_ring_drops_oldest_when_full():
+    ring = FrameRing(capacity=2)
+    assert ring.put(1) is None
+    assert ring.put(2) is None
+    assert ring.put(3) == 1
+    assert ring.dropped == 1 and ring.max_depth == 2
+    ring.close()
+    assert not ring.drained
+    assert [ring.get(0), ring.get(0)] == [2, 3]
+    assert ring.drained
+
+
+def test_scheduler_ticks_on_time(clock):
+    scheduler = FrameScheduler(fps=10)
+    ticks = [scheduler.wait(clock)[0] for _ in range(3)]
+    assert ticks == [0, 1, 2]
+    assert scheduler.skipped == 0
+
+
+def test_scheduler_skips_ticks_missed_by_a_slow_grab(clock):
+    scheduler = FrameScheduler(fps=10)
+    assert scheduler.wait(clock)[0] == 0
+    # A grab that took 0.35 s overran ticks 1 to 3
+    clock.now += 0.35
+    assert scheduler.wait(clock)[0] == 3
+    assert scheduler.skipped == 2
+    assert scheduler.wait(clock)[0] == 4
+
+
+def test_scheduler_pause_leaves_no_gap(clock):
+    scheduler = FrameScheduler(fps=10)
+    scheduler.wait(clock)
+    scheduler.wait(clock)
+    scheduler.pause()
+    clock.now += 5.0
+    assert scheduler.elapsed() == pytest.approx(0.1)
+    scheduler.resume()
+    index, seconds = scheduler.wait(clock)
+    assert index == 2 and seconds == pytest.approx(0.2)
+    assert scheduler.skipped == 0
+
+
+def test_scheduler_wait_returns_none_when_stopped_while_paused():
+    scheduler = FrameScheduler(fps=10)
+    scheduler.pause()
+    stop = types.SimpleNamespace(wait=lambda seconds: True)
+    assert scheduler.wait(stop) is None
+
+
+def test_pool_reuses_released_buffers():
+    pool = FramePool((2, 2, 3), size=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert pool.allocated == 2
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.allocated == 2
+    pool.release(second)
+
+
+def test_pool_keeps_retained_buffers_until_last_release():
+    pool = FramePool((2, 2, 3), size=1)
+    frame = pool.acquire()
+    pool.retain(frame)
+    pool.release(frame)
+    # Still referenced once: a new acquire must not hand it out
+    assert pool.acquire() is not frame
+    pool.release(frame)
+    assert pool.acquire() is frame
+
+
+def test_pool_ignores_foreign_arrays():
+    pool = FramePool((2, 2, 3), size=1)
+    pool.release(np.zeros((2, 2, 3), dtype=np.uint8))
+    pool.acquire()
+    assert pool.allocated == 1
+
+
+def run_controller(controller, clock, seconds, busy, depth=0, drops=0):
+    """
+    Feed the controller one update per 0.5 s with the encoder busy for `busy` of the
+    time and `drops` more frames dropped each time.
+    """
+    changes = 0
+    dropped = 0
+    for _ in range(int(seconds / 0.5)):
+        clock.now += 0.5
+        dropped += drops
+        controller.observe(0.5 * busy)
+        changes += controller.update(clock.now, depth, 8, dropped)
+    return changes
+
+
+def test_controller_steps_down_under_load_with_a_pause_between_steps(clock, capsys):
+    controller = AdaptiveQualityController(20, interval=1.0)
+    controller.update(0.0, 0, 8, 0)
+    # Busy 95%: one step, then at least 2 intervals before the next
+    assert run_controller(controller, clock, 2.0, busy=0.95) == 1
+    assert (controller.scale, controller.rate_divisor) == (0.75, 1)
+    assert run_controller(controller, clock, 1.0, busy=0.95) == 0
+    run_controller(controller, clock, 10.0, busy=0.95)
+    # Bottom level: half resolution at a third of the rate
+    assert (controller.scale, controller.rate_divisor) == (0.5, 3)
+    assert run_controller(controller, clock, 4.0, busy=0.95) == 0
+
+
+def test_controller_steps_down_on_dropped_frames_and_a_full_queue(clock, capsys):
+    controller = AdaptiveQualityController(20, interval=1.0)
+    controller.update(0.0, 0, 8, 0)
+    assert run_controller(controller, clock, 2.0, busy=0.1, drops=3) == 1
+    controller = AdaptiveQualityController(20, interval=1.0)
+    controller.update(0.0, 0, 8, 0)
+    assert run_controller(controller, clock, 2.0, busy=0.1, depth=4) == 1
+
+
+def test_controller_steps_up_only_after_recover_seconds_of_headroom(clock, capsys):
+    controller = AdaptiveQualityController(20, interval=1.0, recover_seconds=5.0)
+    controller.update(0.0, 0, 8, 0)
+    run_controller(controller, clock, 2.0, busy=0.95)
+    assert controller.level == 1
+    # Between low and high: neither way
+    assert run_controller(controller, clock, 10.0, busy=0.6) == 0
+    assert run_controller(controller, clock, 4.0, busy=0.1) == 0
+    assert run_controller(controller, clock, 2.0, busy=0.1) == 1
+    assert controller.level == 0
+    assert [change[1:3] for change in controller.changes] == [(0.75, 1), (1.0, 1)]
+
+
+def record_composite(frames, passthrough):
+    """Run a two-screen CompositeFrameSource (64x48 next to 32x24) through a CapturePipeline."""
+    import threading
+
+    from meetingrecorder.pipeline import CapturePipeline
+    from meetingrecorder.sources import CompositeFrameSource, SyntheticFrameSource, bgra_view
+
+    screens = [SyntheticFrameSource({'left': 0, 'top': 0, 'width': 64, 'height': 48}, content="video"),
+               SyntheticFrameSource({'left': 0, 'top': 0, 'width': 32, 'height': 24}, content="scrolling")]
+    source = CompositeFrameSource(screens, rates=[100, 100])
+    written = []
+    stop_event = threading.Event()
+
+    def write(frame):
+        written.append(frame.copy())
+        if len(written) == frames:
+            stop_event.set()
+
+    pipeline = CapturePipeline(source.grabber, bgra_view if passthrough else source.convert, write, stop_event,
+                               fps=100, pool_frames=not passthrough, detect_changes=not passthrough,
+                               grab_pool=source.grab_pool)
+    pipeline.start()
+    pipeline.join()
+    return source, written
+
+
+@pytest.mark.parametrize("passthrough", [True, False])
+def test_composite_reuses_its_canvases(passthrough):
+    source, written = record_composite(60, passthrough)
+    assert len(written) >= 60
+    # Canvases go back to the pool: at most one per ring slot and stage is ever in flight
+    assert source.grab_pool.allocated <= 2 * 8 + 4
+    for frame in written:
+        assert frame.shape[:2] == (48, 96)
+        # Below the shorter screen stays black on every reused canvas
+        assert not frame[24:, 64:].any()
+        assert frame[:24, 64:].any()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+from meetingrecorder import Recorder, parse_audio_source
+from meetingrecorder.backends import find_ffmpeg
+from meetingrecorder.sources import SyntheticFrameSource
+
+pytestmark = pytest.mark.skipif(find_ffmpeg() is None, reason="needs ffmpeg")
+
+
+def streams(path):
+    """The kinds of stream in a media file ("Video", "Audio"), from ffmpeg's description of it."""
+    info = subprocess.run([find_ffmpeg(), "-hide_banner", "-i", path], capture_output=True, text=True).stderr
+    return [line.split(": ")[1] for line in info.splitlines() if line.strip().startswith("Stream #")]
+
+
+def screen(width=160, height=120):
+    return SyntheticFrameSource({'left': 0, 'top': 0, 'width': width, 'height': height})
+
+
+def test_separate_tracks_are_not_segmented_and_keep_their_audio(tmp_path):
+    final = str(tmp_path / "talk.mp4")
+    recorder = Recorder(final, source=[screen(), screen()], audio_sources=[parse_audio_source("null")],
+                        segment_seconds=1.0, voice_index=False)
+    recorder.start()
+    time.sleep(1.5)
+    assert recorder.stop() == final
+    assert recorder.segment_seconds is None
+    assert streams(final) == ["Video", "Video", "Audio"]
+    assert not [name for name in os.listdir(tmp_path) if ".part" in name]
+
+
+def test_opencv_encoder_keeps_full_resolution(tmp_path):
+    final = str(tmp_path / "talk.mp4")
+    recorder = Recorder(final, source=screen(), encoder="opencv", audio_sources=[parse_audio_source("null")],
+                        voice_index=False)
+    recorder.start()
+    time.sleep(1.0)
+    assert recorder.stop() == final
+    # Scaled parts could not be joined with mp4v ones: only the capture rate adapts
+    assert {scale for scale, divisor in recorder.controller.levels} == {1.0}
+    assert streams(final) == ["Video", "Audio"]
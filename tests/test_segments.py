@@ -0,0 +1,36 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from meetingrecorder.backends import find_ffmpeg
+from meetingrecorder.encoding import FFmpegPipeWriter
+from meetingrecorder.segments import RecordingManifest
+
+pytestmark = pytest.mark.skipif(find_ffmpeg() is None, reason="needs ffmpeg")
+
+
+def write_chunk(path, frames, size=(64, 48)):
+    writer = FFmpegPipeWriter(path, 10, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 10, dtype=np.uint8))
+    return writer
+
+
+def test_manifest_round_trip(tmp_path):
+    final = str(tmp_path / "talk.mp4")
+    manifest = RecordingManifest(final, fps=10, segment_seconds=1.0, audio_tracks=0)
+    for index, frames in enumerate((10, 10, 4)):
+        path = str(tmp_path / f"talk.part{index:03d}.video.mp4")
+        manifest.video_closed(index, write_chunk(path, frames), path, frames)
+
+    assert manifest.finish() == final
+    assert os.path.getsize(final) > 0
+    with open(manifest.path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["complete"] is True
+    assert [seg["frames"] for seg in data["segments"]] == [10, 10, 4]
+    assert [seg["status"] for seg in data["segments"]] == ["done"] * 3
+    # Chunks and their muxed parts are gone; only the result and the manifest remain
+    assert sorted(os.listdir(tmp_path)) == ["talk.manifest.json", "talk.mp4"]
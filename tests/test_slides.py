@@ -0,0 +1,59 @@
+import csv
+import os
+
+import cv2
+import numpy as np
+
+from meetingrecorder.slides import SlideExtractor, hash_distance, perceptual_hash
+
+
+def slide(title: str, boxes: int):
+    frame = np.full((360, 640, 3), 255, np.uint8)
+    cv2.putText(frame, title, (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (0, 0, 0), 4)
+    for i in range(boxes):
+        cv2.rectangle(frame, (40 + 150 * i, 160), (160 + 150 * i, 320), (200, 80, 0), -1)
+    return frame
+
+
+def gray(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def play(extractor, screens, fps: float = 10):
+    """Tap every frame of screens, a list of (frame, seconds on screen)."""
+    index = 0
+    for frame, duration in screens:
+        for _ in range(int(round(duration * fps))):
+            extractor.tap(frame, index / fps)
+            index += 1
+
+
+def test_hash_survives_noise_but_not_another_slide():
+    first = slide("Results", 2)
+    noisy = np.clip(first.astype(np.int16) + np.random.default_rng(1).integers(-8, 9, first.shape), 0, 255)
+    assert hash_distance(perceptual_hash(gray(first)), perceptual_hash(gray(noisy.astype(np.uint8)))) <= 6
+    assert hash_distance(perceptual_hash(gray(first)), perceptual_hash(gray(slide("Agenda", 4)))) > 6
+
+
+def test_returning_slide_is_not_saved_twice(tmp_path):
+    first, second = slide("Agenda", 1), slide("Results", 3)
+    extractor = SlideExtractor(str(tmp_path))
+    extractor.start()
+    play(extractor, [(first, 2), (second, 2), (first, 2)])
+    extractor.close()
+    assert len(extractor.slides) == 2
+    assert extractor.appearances == 3
+    assert sorted(os.listdir(tmp_path)) == ["slide_001.png", "slide_002.png", "slides.csv"]
+    with open(extractor.index_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["slide"] for row in rows] == ["1", "2", "1"]
+    assert [float(row["time"]) for row in rows] == [0.0, 2.0, 4.0]
+
+
+def test_screen_that_does_not_settle_is_not_a_slide(tmp_path):
+    first, second = slide("Agenda", 1), slide("Results", 3)
+    extractor = SlideExtractor(str(tmp_path), settle=1.0)
+    play(extractor, [(first, 2), (second, 0.5), (first, 2)])
+    extractor.close()
+    assert len(extractor.slides) == 1
+    assert extractor.appearances == 1
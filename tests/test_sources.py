@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+
+from meetingrecorder import Recorder, parse_audio_source
+from meetingrecorder.recorder import source_for_region
+from meetingrecorder.sources import CompositeFrameSource, SyntheticFrameSource, letterbox
+
+MONITORS = [{'left': 0, 'top': 0, 'width': 160, 'height': 120},
+            {'left': 160, 'top': 0, 'width': 80, 'height': 60}]
+
+
+def test_every_monitor_gets_a_source_of_its_own():
+    source = source_for_region({'type': 'monitors', 'monitors': MONITORS, 'layout': 'side-by-side'},
+                               SyntheticFrameSource(content="scrolling"))
+    assert isinstance(source, CompositeFrameSource)
+    first, second = source.sources
+    assert first is not second
+    assert [screen.frame_size for screen in source.sources] == [(160, 120), (80, 60)]
+    assert all(screen.content == "scrolling" for screen in source.sources)
+    assert source.frame_size == (240, 120)
+
+
+def test_composite_ticks_on_the_recording_clock(tmp_path):
+    screens = [SyntheticFrameSource(monitor) for monitor in MONITORS]
+    recorder = Recorder(str(tmp_path / "talk.mp4"), source=CompositeFrameSource(screens), encoder="opencv",
+                        audio_sources=[parse_audio_source("null")], voice_index=False)
+    recorder.start()
+    try:
+        track = recorder.tracks[0]
+        deadline = time.monotonic() + 5.0
+        while len(track.source.workers) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        starts = {worker.scheduler.start for worker in track.source.workers}
+        assert starts == {track.pipeline.scheduler.start}
+    finally:
+        recorder.stop()
+
+
+def test_letterbox_keeps_the_aspect_ratio_on_black_bars():
+    frame = np.full((100, 200, 3), 255, np.uint8)
+    out = letterbox(frame, (160, 120))
+    assert out.shape == (120, 160, 3)
+    # 200x100 scaled to 160x80, centred: 20 black rows above and below
+    assert out[:20].max() == 0 and out[100:].max() == 0
+    assert out[20:100].min() == 255
+
+
+def test_letterbox_upscales_a_tall_frame_with_side_bars():
+    frame = np.full((30, 10, 3), 200, np.uint8)
+    out = letterbox(frame, (90, 60))
+    assert out.shape == (60, 90, 3)
+    assert out[:, :35].max() == 0 and out[:, 55:].max() == 0
+    assert out[:, 35:55].min() == 200
+
+
+def test_letterbox_fills_an_odd_size_without_going_out_of_bounds():
+    out = letterbox(np.full((7, 1000, 3), 255, np.uint8), (33, 17))
+    assert out.shape == (17, 33, 3)
+    assert out[8, :].min() == 255
@@ -0,0 +1,47 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from meetingrecorder import tracing
+from meetingrecorder.backends import find_ffmpeg
+from meetingrecorder.encoding import FFmpegPipeWriter
+from meetingrecorder.finalize import finalize_recording
+from meetingrecorder.tracing import Tracer
+
+
+def test_spans_are_saved_as_chrome_trace_events(tmp_path):
+    path = str(tmp_path / "talk.trace.json")
+    tracer = Tracer(path)
+    tracer.start()
+    with tracer.span("grab", "capture"):
+        pass
+    tracer.close()
+    with open(path) as f:
+        # The array is left open for the finalize to append to
+        events = json.loads(f.read().rstrip(",\n") + "]")
+    spans = [event for event in events if event["ph"] == "X"]
+    assert [(span["name"], span["cat"]) for span in spans] == [("grab", "capture")]
+    assert tracer.spans == 1
+
+
+@pytest.mark.skipif(find_ffmpeg() is None, reason="needs ffmpeg")
+def test_inline_finalize_keeps_the_capture_profile(tmp_path, monkeypatch, capsys):
+    # As on Python 3.12+: one profile per Tracer, for the whole process
+    monkeypatch.setattr(tracing, "PROCESS_WIDE_PROFILER", True)
+    trace_path, profiles = str(tmp_path / "talk.trace.json"), str(tmp_path / "talk.profile")
+    capture = Tracer(trace_path, profiles)
+    capture.start()
+    video_path = str(tmp_path / "talk.video.mp4")
+    writer = FFmpegPipeWriter(video_path, 10, (64, 48))
+    for _ in range(10):
+        writer.write(np.zeros((48, 64, 3), np.uint8))
+    writer.release()
+    capture.close()
+
+    finalize_recording({"mode": "remux", "video_path": video_path, "audio_paths": [],
+                        "final_mp4_path": str(tmp_path / "talk.mp4"),
+                        "trace_path": trace_path, "profile_folder": profiles})
+    pid = os.getpid()
+    assert sorted(os.listdir(profiles)) == [f"finalize-{pid}.prof", f"process-{pid}.prof"]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from meetingrecorder.vad import VoiceActivityDetector, load_voice_index
+
+RATE = 16000
+
+
+def voice(seconds, level=0.3):
+    """A low-pitched tone: loud, and crossing zero rarely, as voiced speech does."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    return level * np.sin(2 * np.pi * 150 * t)
+
+
+def noise(seconds, level=0.003, seed=0):
+    return level * np.random.default_rng(seed).standard_normal(int(seconds * RATE))
+
+
+def detect(*parts, block=RATE // 50, **options):
+    """Segments for the parts played one after another, fed block by block as recorded."""
+    samples = (np.concatenate(parts) * 32767).astype(np.int16)[:, None]
+    vad = VoiceActivityDetector(RATE, **options)
+    for start in range(0, len(samples), block or len(samples)):
+        vad.feed(samples[start:start + (block or len(samples))])
+    vad.close()
+    return vad.segments
+
+
+def kinds(segments):
+    return [kind for start, end, kind in segments]
+
+
+def test_speech_between_silences():
+    segments = detect(noise(1.0), voice(2.0), noise(1.5, seed=1))
+    assert kinds(segments) == ["silence", "speech", "silence"]
+    start, end, kind = segments[1]
+    assert start == pytest.approx(1.0, abs=0.05)
+    # Extended by the hangover into the pause
+    assert end == pytest.approx(3.2, abs=0.05)
+
+
+@pytest.mark.parametrize("block", [RATE // 50, 4096, None])
+def test_recording_that_starts_mid_speech(block):
+    segments = detect(voice(3.0), noise(2.0), block=block)
+    assert kinds(segments) == ["speech", "silence"]
+    assert segments[0][0] == 0.0
+    assert segments[0][1] == pytest.approx(3.2, abs=0.05)
+    assert segments[-1][1] == pytest.approx(5.0)
+
+
+def test_segments_are_plain_floats():
+    segments = detect(noise(0.5), voice(1.0), noise(1.0, seed=1))
+    assert all(type(start) is float and type(end) is float for start, end, kind in segments)
+
+
+def test_hiss_and_short_clicks_are_not_speech():
+    # Loud white noise crosses zero too often; a 60 ms tone is shorter than min_speech
+    segments = detect(noise(1.0), noise(1.0, level=0.2, seed=1), voice(0.06), noise(1.0, seed=2))
+    assert kinds(segments) == ["silence"]
+
+
+def test_short_pauses_stay_inside_speech():
+    segments = detect(noise(1.0), voice(1.0), noise(0.3, seed=1), voice(1.0), noise(1.0, seed=2))
+    assert kinds(segments) == ["silence", "speech", "silence"]
+
+
+def test_index_file_round_trip(tmp_path):
+    path = str(tmp_path / "talk.voice.csv")
+    segments = detect(noise(1.0), voice(2.0), noise(1.0, seed=1), path=path)
+    loaded = load_voice_index(path)
+    assert [kind for start, end, kind in loaded] == kinds(segments)
+    assert [start for start, end, kind in loaded] == pytest.approx([start for start, end, kind in segments], abs=0.01)